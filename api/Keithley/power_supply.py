@@ -1,9 +1,23 @@
+from typing import NamedTuple, Optional
+
 import settings
-from utils.classes import BaseInstrument
+from utils.classes import BaseInstrument, StatusQuery
+
+
+class PowerSupplyStatus(NamedTuple):
+    sour_voltage: float
+    voltage: float
+    sour_current: float
+    current: float
+    output: str  # 0 - off, 1 - on
 
 
 class PowerSupply(BaseInstrument):
     model = "2200-30-5"
+    status_query = StatusQuery(
+        PowerSupplyStatus,
+        ["SOUR:VOLT?", "MEAS:VOLT?", "SOUR:CURR?", "MEAS:CURR?", "OUTPUT?"],
+    )
 
     def __init__(
         self,
@@ -62,6 +76,10 @@ class PowerSupply(BaseInstrument):
         except ValueError:
             return None
 
+    def get_status(self) -> Optional[PowerSupplyStatus]:
+        """Set and measured voltage and current, output state in one query"""
+        return self.query_status(self.status_query)
+
     def set_current(self, current: float) -> None:
         self.write(f"SOUR:CURR {current}A")
 
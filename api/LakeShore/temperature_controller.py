@@ -1,8 +1,21 @@
-from typing import Dict
+import logging
+from typing import Dict, NamedTuple, Optional
 
 from settings import SOCKET
 from store.state import state
-from utils.classes import BaseInstrument
+from utils.classes import BaseInstrument, StatusQuery
+
+
+logger = logging.getLogger(__name__)
+
+
+class Temperatures(NamedTuple):
+    """Kelvin readings of inputs A, B, C, D"""
+
+    temp_a: float
+    temp_b: float
+    temp_c: float
+    temp_d: float
 
 
 class TemperatureController(BaseInstrument):
@@ -11,6 +24,11 @@ class TemperatureController(BaseInstrument):
     Default host 169.254.0.56
     """
 
+    temperatures_query = StatusQuery(Temperatures, ["KRDG? 0"])
+    inputs_query = StatusQuery(
+        Temperatures, ["KRDG? A", "KRDG? B", "KRDG? C", "KRDG? D"]
+    )
+
     def __init__(
         self,
         host: str = "169.254.0.56",
@@ -21,6 +39,8 @@ class TemperatureController(BaseInstrument):
         **kwargs,
     ):
         super().__init__(host, gpib, adapter, *args, delay=delay, **kwargs)
+        # `KRDG? 0` answers more than 4 values with extra input cards
+        self.all_inputs_supported = True
 
     def idn(self) -> str:
         return self.query("*IDN?")
@@ -46,6 +66,20 @@ class TemperatureController(BaseInstrument):
     def get_temperature_b(self) -> float:
         return float(self.query("KRDG? B"))
 
+    def get_temperatures(self) -> Optional[Temperatures]:
+        """All inputs in one query, inputs A-D are queried if `KRDG? 0` answer doesn't fit"""
+        if self.all_inputs_supported:
+            answer = self.query(self.temperatures_query.cmd)
+            temperatures = self.temperatures_query.parse([answer])
+            if temperatures is not None:
+                return temperatures
+            if answer.strip():
+                logger.info(
+                    f"[{self.__class__.__name__}.get_temperatures] KRDG? 0 answer '{answer}' doesn't fit, using per input queries"
+                )
+                self.all_inputs_supported = False
+        return self.query_status(self.inputs_query)
+
     def get_heater_output(self, output: int = 1):
         """Heater output in percent (%)"""
         return self.query(f"HTR? {output}")
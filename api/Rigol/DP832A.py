@@ -1,7 +1,16 @@
-from typing import List
+from typing import List, NamedTuple, Optional
 
 import settings
-from utils.classes import BaseInstrument
+from utils.classes import BaseInstrument, StatusQuery
+
+
+class ChannelStatus(NamedTuple):
+    voltage: float
+    current: float
+    power: float
+    voltage_sour: float
+    current_sour: float
+    output: str  # OFF or ON
 
 
 class PowerSupplyDP832A(BaseInstrument):
@@ -48,6 +57,25 @@ class PowerSupplyDP832A(BaseInstrument):
         response = self.query(f":MEAS:ALL? CH{channel}")
         return [float(i) for i in response.split(",")]
 
+    @staticmethod
+    def get_status_query(channel: int) -> StatusQuery:
+        return StatusQuery(
+            ChannelStatus,
+            [
+                f":MEAS:ALL? CH{channel}",
+                f":SOURce{channel}:VOLTage?",
+                f":SOURce{channel}:CURRent?",
+                f":OUTP? CH{channel}",
+            ],
+        )
+
+    def get_status(self, channels: List[int]) -> List[Optional[ChannelStatus]]:
+        """
+        Measured and set values and output state of `channels` in one query
+        :param channels: channel ids
+        """
+        return self.query_statuses([self.get_status_query(ch) for ch in channels])
+
     def measure_current(self, channel: int) -> float:
         return float(self.query(f":MEAS:CURR? CH{channel}"))
 
@@ -27,7 +27,12 @@ class NRXPowerMeter(BaseInstrument):
         :param kwargs:
         """
         kwargs["port"] = port
+        # READ? is answered when measurement is finished, no fixed read delay is needed
+        kwargs.setdefault("pipelined", True)
         super().__init__(host, gpib, adapter, *args, **kwargs)
+        self.filter_state = 0
+        self.filter_time = 0.05
+        self.aperture_time = aperture_time / 1e3
         self.set_filter_state(0)
         self.set_aperture_time(aperture_time)
 
@@ -48,11 +53,30 @@ class NRXPowerMeter(BaseInstrument):
         """Method to test power meter"""
         return self.query("*TST?")
 
+    @property
+    def measure_time(self) -> float:
+        """Time of one measurement, s"""
+        return self.filter_time if self.filter_state else self.aperture_time
+
     @exception
     def get_power(self):
-        """Main method to get power from power meter"""
+        """
+        Main method to get power from power meter,
+        measurements longer than adapter read timeout are awaited by `measure`
+        """
+        if self.measure_time >= getattr(self.adapter, "timeout", 2):
+            return self.measure(timeout=self.measure_time + 10)
         return float(self.query("READ?"))
 
+    @exception
+    def measure(self, timeout: float = 10):
+        """
+        Trigger measurement and fetch it when it is finished,
+        for aperture or filter times longer than adapter read timeout
+        """
+        self.sync("INIT:IMM", timeout=timeout)
+        return float(self.query("FETCH?"))
+
     @exception
     def get_conf(self):
         """Get current power meter config"""
@@ -77,6 +101,7 @@ class NRXPowerMeter(BaseInstrument):
     def set_filter_state(self, value: int = 0):
         """Filter state: On - 1, Off - 0"""
         self.write(f"CALC:CHAN:AVER:STAT {value}")
+        self.filter_state = value
 
     @exception
     def set_filter_time(self, time: float = 0.05):
@@ -86,6 +111,7 @@ class NRXPowerMeter(BaseInstrument):
         :return:
         """
         self.write(f"CALCulate:CHANnel:AVERage:COUNt:AUTO:MTIMe {time}")
+        self.filter_time = time
 
     @exception
     def set_aperture_time(self, time: float = 50):
@@ -95,6 +121,7 @@ class NRXPowerMeter(BaseInstrument):
         :return:
         """
         self.write(f"CALC:APER {time / 1e3}")
+        self.aperture_time = time / 1e3
 
     def set_power_units(self, value=Literal["DBM", "DBUV", "W"]):
         self.write(f"UNIT1:POWer {value}")
@@ -45,12 +45,15 @@ class SpectrumBlock(BaseInstrument):
         host: str,
         gpib: int = None,
         adapter: str = settings.PROLOGIX_ETHERNET,
+        sweep_timeout: float = 30,
         *args,
         **kwargs,
     ):
-        if not kwargs.get("delay"):
-            kwargs["delay"] = 0.2
+        # answers are read up to the terminator, sweeps are synchronized by `sweep`
+        kwargs.setdefault("pipelined", True)
         super().__init__(host, gpib, adapter, *args, **kwargs)
+        self.single_sweep = False
+        self.sweep_timeout = sweep_timeout
 
     def idn(self) -> str:
         return self.query("*IDN?")
@@ -77,9 +80,20 @@ class SpectrumBlock(BaseInstrument):
     def get_peak_power(self) -> float:
         return float(self.query(f"CALC:MARK:Y?"))
 
+    def set_single_sweep(self, value: bool) -> None:
+        """Single sweep mode, traces are measured by `sweep` on demand"""
+        self.write(f":INIT:CONT {'OFF' if value else 'ON'}")
+        self.single_sweep = value
+
+    def sweep(self) -> bool:
+        """Trigger single sweep and wait until it is finished"""
+        return self.sync(":INIT:IMM", timeout=self.sweep_timeout)
+
     def get_trace_data(
         self, trace: str = "TRACE1", start: float = None, stop: float = None
     ) -> Tuple[List[float], List[float]]:
+        if self.single_sweep:
+            self.sweep()
         response = self.query(f":TRAC:DATA? {trace}", delay=0)
         points_raw = response.split(",")
         if not start:
@@ -1,35 +1,84 @@
 import logging
 import time
-from typing import Dict
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 import numpy as np
 
 from settings import SOCKET
 from store.state import state
 
-from utils.classes import BaseInstrument
+from utils.classes import BaseInstrument, StatusQuery
 
 
 logger = logging.getLogger(__name__)
 
 
+DATA_FORMATS = {
+    "REAL,32": np.dtype("<f4"),
+    "REAL,64": np.dtype("<f8"),
+}
+
+
+class VnaSweep(NamedTuple):
+    """Sweep configuration needed to describe trace data"""
+
+    start: float
+    stop: float
+    points: int
+    parameter: str
+    power: float
+
+    @property
+    def frequencies(self) -> np.ndarray:
+        return np.linspace(self.start, self.stop, self.points)
+
+
 class VNABlock(BaseInstrument):
     """
     Default host 169.254.106.189
     Default port 5025
+    Traces are transferred as binary blocks in `data_format` ("REAL,32", "REAL,64"),
+    or as text if data_format="ASCII".
+    Sweep configuration is cached and updated by setters, `get_data` rereads it
+    by one compound query, so changes from the front panel are not missed.
+    Answers are read up to the terminator (pipelined socket) without fixed delays,
+    in single sweep mode traces are read right after *OPC? of the triggered sweep.
     """
 
+    # fields of VnaSweep in order, headers are from the root as they are joined
+    sweep_query = StatusQuery(
+        VnaSweep,
+        [
+            ":SENS:FREQ:STAR?",
+            ":SENS:FREQ:STOP?",
+            ":SWE:POIN?",
+            ":CALC:PAR:MEAS? 'Trc1'",
+            ":SOUR:POW?",
+        ],
+    )
+
     def __init__(
         self,
         host: str = "169.254.106.189",
         gpib: int = None,
         adapter: str = SOCKET,
         port: int = 5025,
+        data_format: str = "REAL,32",
+        sweep_timeout: float = 60,
         *args,
         **kwargs,
     ):
         kwargs["port"] = port
+        kwargs.setdefault("pipelined", True)
         super().__init__(host, gpib, adapter, *args, **kwargs)
+        self.data_format = data_format
+        self.single_sweep = False
+        self.sweep_timeout = sweep_timeout
+        self.instrument_format: Optional[str] = None
+        self.sweep_config: Dict = {}
+        self.traces: Dict[str, str] = {}
+        # traces of the user replaced by `set_traces`, {"Trc1": ("S11", "MLOG")}
+        self.saved_traces: Optional[Dict[str, Tuple[str, str]]] = None
 
     def idn(self) -> str:
         return self.query("*IDN?")
@@ -45,9 +94,10 @@ class VNABlock(BaseInstrument):
 
     def set_sweep(self, points: int = state.VNA_POINTS) -> None:
         self.write(f"SWE:POIN {points}")
+        self.sweep_config["points"] = int(points)
 
     def get_sweep(self) -> int:
-        return int(self.query(f"SWE:POIN?", delay=0.05))
+        return int(self.query(f"SWE:POIN?"))
 
     def set_average_status(self, value: bool, channel: int = 1) -> None:
         status = "ON" if value else "OFF"
@@ -60,78 +110,216 @@ class VNABlock(BaseInstrument):
         self.write(f"CALC:FORM {form}")
 
     def get_channel_format(self):
-        return self.query("CALC:FORM?", delay=0.05)
+        return self.query("CALC:FORM?")
 
     def set_power(self, power: float = state.VNA_POWER) -> None:
         self.write(f"SOUR:POW {power}")
+        self.sweep_config["power"] = float(power)
 
     def get_power(self):
-        return self.query("SOUR:POW?", delay=0.05)
+        return self.query("SOUR:POW?")
 
     def get_start_frequency(self) -> float:
-        return float(self.query("SENS:FREQ:STAR?", delay=0.05))
+        return float(self.query("SENS:FREQ:STAR?"))
 
     def get_stop_frequency(self) -> float:
-        return float(self.query("SENS:FREQ:STOP?", delay=0.05))
+        return float(self.query("SENS:FREQ:STOP?"))
 
     def set_start_frequency(self, freq: float) -> None:
         self.write(f"SENS:FREQ:STAR {freq}")
+        self.sweep_config["start"] = float(freq)
 
     def set_stop_frequency(self, freq: float) -> None:
         self.write(f"SENS:FREQ:STOP {freq}")
+        self.sweep_config["stop"] = float(freq)
 
     def set_parameter(
         self, parameter: str = "S11", trace: str = "Trc1", channel: int = 1
     ) -> None:
         self.write(f"CALCulate{channel}:PARameter:DEFine {trace},{parameter}")
+        self.traces = {}
+        if trace == "Trc1" and channel == 1:
+            self.sweep_config["parameter"] = parameter
 
     def get_parameter_catalog(self, channel: int = 1) -> Dict[str, str]:
         """Current catalog of parameters
         :returns
         Dict of Trace and Parameter map {"Trc1": "S11"}
         """
-        response = self.query(f"CALCulate{channel}:PARameter:CATalog?", delay=0.05)
+        response = self.query(f"CALCulate{channel}:PARameter:CATalog?")
         response = response.replace("'", "")
         lst = response.split(",")
         lst_traces = [_ for _ in lst[::2]]
         lst_params = [_ for _ in lst[1::2]]
         return dict(zip(lst_traces, lst_params))
 
+    def set_data_format(self, data_format: str = "REAL,32") -> None:
+        """Format of trace data transfer, binary data is little endian"""
+        if data_format in DATA_FORMATS:
+            self.write(f"FORM {data_format};:FORM:BORD SWAP")
+        else:
+            self.write("FORM ASC")
+        self.instrument_format = data_format
+
+    def get_sweep_descriptor(self, refresh: bool = False) -> VnaSweep:
+        """
+        Cached sweep configuration, missing values are queried once,
+        `refresh` rereads all of them by one compound query
+        """
+        if refresh:
+            self.sweep_config = {}
+        if len(self.sweep_config) < len(VnaSweep._fields):
+            sweep = self.query_status(self.sweep_query)
+            if sweep is not None:
+                self.sweep_config.update(
+                    {
+                        key: value
+                        for key, value in sweep._asdict().items()
+                        if value not in (None, "")
+                    }
+                )
+        if "start" not in self.sweep_config:
+            self.sweep_config["start"] = self.get_start_frequency()
+        if "stop" not in self.sweep_config:
+            self.sweep_config["stop"] = self.get_stop_frequency()
+        if "points" not in self.sweep_config:
+            self.sweep_config["points"] = self.get_sweep()
+        if "parameter" not in self.sweep_config:
+            self.sweep_config["parameter"] = self.get_parameter_catalog().get("Trc1")
+        if "power" not in self.sweep_config:
+            self.sweep_config["power"] = float(self.get_power())
+        return VnaSweep(**self.sweep_config)
+
+    def query_values(self, cmd: str) -> np.ndarray:
+        """Query real values in current data format"""
+        if self.instrument_format != self.data_format:
+            self.set_data_format(self.data_format)
+        dtype = DATA_FORMATS.get(self.data_format)
+        if dtype is None:
+            return np.array([float(i) for i in self.query(cmd).split(",")])
+        return np.frombuffer(self.query_block(cmd), dtype=dtype)
+
+    def get_trace(self) -> np.ndarray:
+        """Formatted trace data of Trc1 as complex array"""
+        values = self.query_values("CALC:DATA? FDAT")
+        if len(values) % 2:
+            raise ValueError(f"Odd number of trace values {len(values)}")
+        return values[::2] + 1j * values[1::2]
+
+    def set_traces(self, parameters: List[str], channel: int = 1) -> Dict[str, str]:
+        """
+        Replace traces of the channel with Trc1..TrcN measuring `parameters`
+        in complex format, all of them are measured in one sweep.
+        Traces of the user are recorded and set back by `restore_traces`.
+        :returns
+        Dict of Trace and Parameter map {"Trc1": "S11", "Trc2": "S21"}
+        """
+        if self.saved_traces is None:
+            self.saved_traces = self.get_trace_formats(channel)
+        self.write(f"CALCulate{channel}:PARameter:DELete:ALL")
+        traces = {f"Trc{i + 1}": parameter for i, parameter in enumerate(parameters)}
+        for trace, parameter in traces.items():
+            self.write(f"CALCulate{channel}:PARameter:SDEFine '{trace}','{parameter}'")
+            self.write(f"CALCulate{channel}:PARameter:SELect '{trace}'")
+            self.write(f"CALCulate{channel}:FORMat COMP")
+        self.sweep_config["parameter"] = traces.get("Trc1")
+        self.traces = traces
+        return traces
+
+    def get_trace_formats(self, channel: int = 1) -> Dict[str, Tuple[str, str]]:
+        """Parameter and format of every trace of the channel"""
+        traces = {}
+        for trace, parameter in self.get_parameter_catalog(channel).items():
+            self.write(f"CALCulate{channel}:PARameter:SELect '{trace}'")
+            traces[trace] = (parameter, self.query(f"CALCulate{channel}:FORMat?"))
+        return traces
+
+    def restore_traces(self, channel: int = 1) -> None:
+        """
+        Set back traces replaced by `set_traces`,
+        they are shown in the first window of the channel
+        """
+        if self.saved_traces is None:
+            return
+        self.write(f"CALCulate{channel}:PARameter:DELete:ALL")
+        for number, (trace, (parameter, trace_format)) in enumerate(
+            self.saved_traces.items(), 1
+        ):
+            self.write(f"CALCulate{channel}:PARameter:SDEFine '{trace}','{parameter}'")
+            self.write(f"CALCulate{channel}:PARameter:SELect '{trace}'")
+            if trace_format:
+                self.write(f"CALCulate{channel}:FORMat {trace_format}")
+            self.write(f"DISPlay:WINDow1:TRACe{number}:FEED '{trace}'")
+        self.saved_traces = None
+        self.traces = {}
+        self.sweep_config.pop("parameter", None)
+
+    def set_single_sweep(self, value: bool, count: int = 1, channel: int = 1) -> None:
+        """
+        Single sweep mode, every `sweep()` call measures `count` sweeps,
+        set `count` to averages count to get averaged traces.
+        """
+        if value:
+            self.write(f"INITiate{channel}:CONTinuous OFF")
+            self.write(f"SENSe{channel}:SWEep:COUNt {count}")
+        else:
+            self.write(f"INITiate{channel}:CONTinuous ON")
+        self.single_sweep = value
+
+    def sweep(self, channel: int = 1) -> bool:
+        """Restart averaging and trigger single sweep, returns when it is finished"""
+        return self.sync(
+            f"SENSe{channel}:AVERage:CLEar;:INITiate{channel}:IMMediate",
+            timeout=self.sweep_timeout,
+        )
+
+    def get_traces(self) -> Dict[str, np.ndarray]:
+        """
+        Formatted data of all traces set by `set_traces` read by one transfer,
+        returns complex array for every parameter
+        """
+        values = self.query_values("CALC:DATA:ALL? FDAT")
+        traces = self.traces or self.get_parameter_catalog()
+        if not len(values) or len(values) % (2 * len(traces)):
+            raise ValueError(
+                f"Unexpected number of values {len(values)} for {len(traces)} traces"
+            )
+        values = values.reshape(len(traces), -1)
+        return {
+            parameter: data[::2] + 1j * data[1::2]
+            for parameter, data in zip(traces.values(), values)
+        }
+
     def get_data(self) -> Dict:
         """
-        Method to get reflection level from VNA
+        Method to get reflection level from VNA.
+        In single sweep mode new sweep is measured before reading,
+        in continuous mode all-zero traces of not finished first sweep are retried.
         """
         attempts = 5
+        if self.single_sweep:
+            self.sweep()
+            attempts = 1
         attempt = 0
         while attempt < attempts:
-            time.sleep(0.05)
+            if attempt:
+                time.sleep(0.05)
             attempt += 1
-            response = self.query("CALC:DATA? FDAT").split(",")
             try:
-                resp = [float(i) for i in response]
-            except ValueError:
-                logger.error(f"[{self.__class__.__name__}.get_data] Value error!")
+                trace = self.get_trace()
+            except (ValueError, OSError) as e:
+                logger.error(f"[{self.__class__.__name__}.get_data] {e}")
                 continue
-            if np.sum(np.abs(resp)) > 0:
-                real = resp[::2]
-                imag = resp[1::2]
-                freq = list(
-                    np.linspace(
-                        self.get_start_frequency(),
-                        self.get_stop_frequency(),
-                        self.get_sweep(),
-                    )
-                )
-                s_param = self.get_parameter_catalog()["Trc1"]
-                power = self.get_power()
-
+            if np.sum(np.abs(trace)) > 0:
+                # start, stop, power or parameter may be changed on the front panel
+                sweep = self.get_sweep_descriptor(refresh=True)
                 return {
-                    "array": np.array([r + i * 1j for r, i in zip(real, imag)]),
-                    "real": real,
-                    "imag": imag,
-                    "freq": freq,
-                    "parameter": s_param,
-                    "power": power,
+                    "array": trace,
+                    "real": trace.real,
+                    "imag": trace.imag,
+                    "freq": sweep.frequencies,
+                    "parameter": sweep.parameter,
+                    "power": sweep.power,
                 }
         return {}
 
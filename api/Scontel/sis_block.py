@@ -1,21 +1,46 @@
-import socket
+import re
 import time
 import logging
-from typing import Union, Optional
+from typing import Union, Optional, NamedTuple
 
+import numpy as np
+
+from api.Scontel.sis_block_connection import SisBlockConnectionPool
 from store.state import state
-from utils.classes import BaseInstrumentInterface
+from utils.classes import (
+    AdaptiveSweep,
+    BaseInstrumentInterface,
+    Settler,
+    SettleResult,
+)
 from utils.decorators import exception
+from utils.exceptions import DeviceConnectionError
 
 
 logger = logging.getLogger(__name__)
 
+FLOAT_PATTERN = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+class BiasData(NamedTuple):
+    """Bias voltage [V] and current [A] measured in the same sample"""
+
+    voltage: float
+    current: float
+
 
 class SisBlock(BaseInstrumentInterface):
     """
     Scontel SIS block operation interface.
+    All instances with the same host and port share one pooled connection.
     """
 
+    # Positions of voltage and current values in `BIAS:DEVx:DATA?` answer
+    bias_data_voltage_index = 0
+    bias_data_current_index = 1
+    # Consecutive points with not parsable `DATA?` answer to stop using it until reconnect
+    bias_data_failures_max = 3
+
     def __init__(
         self,
         host: str = state.BLOCK_ADDRESS,
@@ -27,22 +52,45 @@ class SisBlock(BaseInstrumentInterface):
         self.port = port
         self.bias_dev = bias_dev
         self.ctrl_dev = ctrl_dev
-        self.s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.bias_data_supported = True
+        self.bias_data_failures = 0
+        self.connection = SisBlockConnectionPool.get(host=host, port=port)
 
     @exception
-    def connect(self):
-        self.s.settimeout(10)
+    def connect(self) -> bool:
+        """
+        Make sure the shared link is alive, reconnect if needed.
+        Unreachable block is logged, not raised; returns False then.
+        """
+        # probe `DATA?` again after reconnect
+        self.bias_data_supported = True
+        self.bias_data_failures = 0
         try:
-            self.s.connect((self.host, self.port))
-            logger.info(f"Connected to Block {self.host}:{self.port}")
-        except Exception as e:
+            self.connection.ensure_connected()
+        except DeviceConnectionError as e:
             logger.warning(f"Warning[Block.connect] {e}")
-        self.s.settimeout(2)
+            return False
+        return True
 
     @exception
     def disconnect(self):
-        self.s.close()
-        logger.info(f"Disconnected from Block {self.host}:{self.port}")
+        """
+        Release block. Shared link stays opened for other users,
+        use `SisBlockConnectionPool.close_all` to close it.
+        """
+        logger.debug(f"[Block.disconnect] Released Block {self.host}:{self.port}")
+
+    @property
+    def stats(self):
+        """Latency and error statistics of the shared block connection"""
+        return self.connection.stats
+
+    def session(self):
+        """
+        Context manager to run several commands without interleaving
+        with other threads.
+        """
+        return self.connection.session()
 
     def manipulate(self, cmd: str) -> str:
         """
@@ -56,25 +104,28 @@ class SisBlock(BaseInstrumentInterface):
         max_attempts = 3
         for attempt in range(1, max_attempts + 1):
             try:
-                self.s.send(cmd)
-                time.sleep(0.05)
-                data = self.s.recv(1024 * 1024)
+                data = self.connection.transaction(cmd)
                 result = data.decode("ISO-8859-1").rstrip()
                 logger.debug(
                     f"[Block.manipulate] Received result: {result}; attempt {attempt}"
                 )
                 if "ERROR" in result:
+                    self.connection.stats.add_error()
                     logger.error(
                         f"[Block.manipulate] Received Error result: {result}; attempt {attempt}"
                     )
                     continue
                 return result
+            except DeviceConnectionError as e:
+                # block is unreachable, retry won't help until the next call
+                logger.error(f"[Block.manipulate] {e}")
+                return ""
             except Exception as e:
                 logger.error(f"[Block.manipulate] Exception: {e}; attempt {attempt}")
                 continue
         return ""
 
-    def get_ctrl_short_status(self, s: socket.socket = None):
+    def get_ctrl_short_status(self):
         """
         Method to get Short status for CTRL.
         Shorted = 1
@@ -112,6 +163,95 @@ class SisBlock(BaseInstrumentInterface):
         """
         return self.manipulate(f"BIAS:{self.bias_dev}:DATA?")
 
+    def parse_bias_data(self, response: str) -> Optional[BiasData]:
+        values = [float(value) for value in FLOAT_PATTERN.findall(response)]
+        max_index = max(self.bias_data_voltage_index, self.bias_data_current_index)
+        if len(values) <= max_index:
+            return None
+        return BiasData(
+            voltage=values[self.bias_data_voltage_index],
+            current=values[self.bias_data_current_index],
+        )
+
+    def get_bias_point(self) -> Optional[BiasData]:
+        """
+        Method to get bias voltage and current in one query.
+        Falls back to separate voltage and current queries for the point
+        if `DATA?` answer can't be parsed. Empty answer (timeout) is transient,
+        `bias_data_failures_max` not parsable answers in a row disable `DATA?` until reconnect.
+        """
+        if self.bias_data_supported:
+            answer = self.get_bias_data()
+            bias_data = self.parse_bias_data(answer)
+            if bias_data is not None:
+                self.bias_data_failures = 0
+                return bias_data
+            if answer:
+                self.bias_data_failures += 1
+                logger.debug(
+                    f"[Block.get_bias_point] Unable to parse DATA answer '{answer}'"
+                )
+                if self.bias_data_failures >= self.bias_data_failures_max:
+                    logger.warning(
+                        "[Block.get_bias_point] DATA answer is not parsable, using separate queries"
+                    )
+                    self.bias_data_supported = False
+        with self.session():
+            voltage = self.get_bias_voltage()
+            current = self.get_bias_current()
+        if voltage is None or current is None:
+            return None
+        return BiasData(voltage=voltage, current=current)
+
+    @staticmethod
+    def get_bias_settler() -> Settler:
+        """Bias voltage settler configured from state, tolerance in V"""
+        return Settler(
+            tolerance=state.BLOCK_BIAS_SETTLE_TOLERANCE * 1e-3,
+            stable_reads=state.BLOCK_SETTLE_STABLE_READS,
+            timeout=state.BLOCK_SETTLE_TIMEOUT,
+        )
+
+    @staticmethod
+    def get_ctrl_settler() -> Settler:
+        """CTRL current settler configured from state, tolerance in A"""
+        return Settler(
+            tolerance=state.BLOCK_CTRL_SETTLE_TOLERANCE * 1e-3,
+            stable_reads=state.BLOCK_SETTLE_STABLE_READS,
+            timeout=state.BLOCK_SETTLE_TIMEOUT,
+        )
+
+    @staticmethod
+    def get_bias_range() -> Union[np.ndarray, AdaptiveSweep]:
+        """
+        Bias voltage scan points in V from state.
+        Adaptive sweep spends up to `BLOCK_BIAS_VOLT_POINTS` points
+        and needs measured responses to be added while iterating.
+        """
+        start = state.BLOCK_BIAS_VOLT_FROM * 1e-3
+        stop = state.BLOCK_BIAS_VOLT_TO * 1e-3
+        if not state.BLOCK_BIAS_SWEEP_ADAPTIVE:
+            return np.linspace(start, stop, state.BLOCK_BIAS_VOLT_POINTS)
+        return AdaptiveSweep(
+            start=start,
+            stop=stop,
+            coarse_points=state.BLOCK_BIAS_ADAPTIVE_COARSE_POINTS,
+            max_points=state.BLOCK_BIAS_VOLT_POINTS,
+            min_step=state.BLOCK_BIAS_ADAPTIVE_MIN_STEP * 1e-3,
+            tolerance=state.BLOCK_BIAS_ADAPTIVE_TOLERANCE,
+        )
+
+    def settle_bias_voltage(self, volt: float, settler: Settler) -> SettleResult:
+        """
+        Wait until bias voltage readback settles at `volt`.
+        Result value is the last `BiasData` reading, it may be used as the measured point.
+        """
+        return settler.wait(self.get_bias_point, volt, key=lambda bias: bias.voltage)
+
+    def settle_ctrl_current(self, curr: float, settler: Settler) -> SettleResult:
+        """Wait until CTRL current readback settles at `curr`"""
+        return settler.wait(self.get_ctrl_current, curr)
+
     def get_ctrl_data(self):
         """
         Method to get all data for CTRL.
@@ -0,0 +1,200 @@
+import logging
+import selectors
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+from utils.classes import TransactionStats
+from utils.exceptions import DeviceConnectionError
+
+
+logger = logging.getLogger(__name__)
+
+
+class SisBlockConnection:
+    """
+    Persistent TCP link to Scontel SIS block shared by all SisBlock instances
+    with the same host and port.
+    Every transaction is serialized by the connection lock,
+    broken or idle links are checked and reconnected before use.
+    Answers are read until the line terminator within the timeout deadline.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        connect_timeout: float = 10,
+        timeout: float = 2,
+        health_check_interval: float = 5,
+        terminator: bytes = b"\n",
+    ):
+        self.host = host
+        self.port = int(port)
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.terminator = terminator
+        self.socket = None
+        self.selector = None
+        self.buffer = b""
+        self.lock = threading.RLock()
+        self.last_used = 0
+        self.stats = TransactionStats()
+
+    @property
+    def connected(self) -> bool:
+        return self.socket is not None
+
+    def connect(self) -> None:
+        with self.lock:
+            self.close()
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(self.connect_timeout)
+            try:
+                sock.connect((self.host, self.port))
+            except OSError as e:
+                sock.close()
+                logger.warning(f"[{self.__class__.__name__}.connect] {e}")
+                raise DeviceConnectionError(
+                    f"Unable to connect Block {self.host}:{self.port}"
+                )
+            sock.settimeout(self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.socket = sock
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(sock, selectors.EVENT_READ)
+            self.buffer = b""
+            self.last_used = time.time()
+            logger.info(f"Connected to Block {self.host}:{self.port}")
+
+    def close(self) -> None:
+        with self.lock:
+            if self.socket is None:
+                return
+            try:
+                self.selector.close()
+                self.socket.close()
+            finally:
+                self.socket = None
+                self.selector = None
+                self.buffer = b""
+            logger.info(f"Disconnected from Block {self.host}:{self.port}")
+
+    def is_alive(self) -> bool:
+        """
+        Non-blocking peek: closed by peer socket is readable with zero bytes.
+        """
+        if self.socket is None:
+            return False
+        try:
+            self.socket.setblocking(False)
+            data = self.socket.recv(16, socket.MSG_PEEK)
+            if len(data) == 0:
+                return False
+            # Stale bytes from a timed out answer, drop them
+            self.socket.recv(1024 * 1024)
+            return True
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        finally:
+            if self.socket is not None:
+                self.socket.settimeout(self.timeout)
+
+    def ensure_connected(self) -> None:
+        with self.lock:
+            if self.socket is None:
+                self.connect()
+                return
+            if time.time() - self.last_used < self.health_check_interval:
+                return
+            if not self.is_alive():
+                logger.warning(
+                    f"[{self.__class__.__name__}.ensure_connected] Link to Block {self.host}:{self.port} is broken, reconnecting ..."
+                )
+                self.connect()
+
+    def _drain(self) -> None:
+        """Drop late answers of previous timed out transactions"""
+        self.buffer = b""
+        while self.selector.select(0):
+            if not self.socket.recv(1024 * 1024):
+                raise ConnectionResetError("Block closed connection")
+
+    def _read_answer(self, deadline: float) -> bytes:
+        while True:
+            index = self.buffer.find(self.terminator)
+            if index >= 0:
+                end = index + len(self.terminator)
+                data, self.buffer = self.buffer[:end], self.buffer[end:]
+                return data
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise socket.timeout("Block answer timed out")
+            if not self.selector.select(remaining):
+                continue
+            chunk = self.socket.recv(64 * 1024)
+            if not chunk:
+                raise ConnectionResetError("Block closed connection")
+            self.buffer += chunk
+
+    def transaction(self, cmd: bytes) -> bytes:
+        """
+        Send command and receive block answer holding connection lock.
+        Returns as soon as the terminated answer arrives; on timeout the
+        unterminated part (if any) is returned.
+        On socket error the link is closed to be reconnected on next transaction.
+        """
+        with self.lock:
+            self.ensure_connected()
+            start = time.perf_counter()
+            try:
+                self._drain()
+                self.socket.sendall(cmd)
+                data = self._read_answer(deadline=start + self.timeout)
+            except socket.timeout:
+                self.stats.add_timeout()
+                data, self.buffer = self.buffer, b""
+                if not data:
+                    raise
+            except OSError:
+                self.stats.add_error()
+                self.close()
+                raise
+            self.last_used = time.time()
+            self.stats.add(time.perf_counter() - start)
+            return data
+
+    @contextmanager
+    def session(self):
+        """Hold the link for a sequence of commands from one thread"""
+        with self.lock:
+            yield self
+
+
+class SisBlockConnectionPool:
+    """Process wide registry of SIS block connections by (host, port)"""
+
+    _connections: Dict[Tuple[str, int], SisBlockConnection] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, host: str, port: int) -> SisBlockConnection:
+        key = (host, int(port))
+        with cls._lock:
+            connection = cls._connections.get(key)
+            if connection is None:
+                connection = SisBlockConnection(host=host, port=port)
+                cls._connections[key] = connection
+            return connection
+
+    @classmethod
+    def close_all(cls) -> None:
+        with cls._lock:
+            for connection in cls._connections.values():
+                connection.close()
+            cls._connections.clear()
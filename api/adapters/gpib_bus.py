@@ -0,0 +1,139 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from utils.classes import TransactionStats
+
+
+class GpibBus:
+    """
+    Transaction scheduler of GPIB controller shared by several instruments.
+    Transactions are serialized per controller and served in arrival order (ticket lock),
+    so monitor threads polling different instruments can't interleave bytes on the bus.
+    Thread holding the bus may open nested transactions (query -> write, read).
+    `++addr` is sent only when addressed device is changed:
+        with bus.transaction(eq_addr=22):
+            adapter.write("MEAS:VOLT?")
+            ...
+    """
+
+    def __init__(self, name: str, select: Callable[[int], None]):
+        self.name = name
+        self._select = select
+        self._condition = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self._owner = None
+        self._depth = 0
+        self._acquired = 0.0
+        self.address: Optional[int] = None
+        self.wait_stats = TransactionStats()
+        self.busy_stats = TransactionStats()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.wait_stats.reset()
+        self.busy_stats.reset()
+        self.started = time.perf_counter()
+        self.selects = 0
+        self.selects_skipped = 0
+        self.max_queue = 0
+        self.transactions: Dict[int, int] = {}
+
+    @property
+    def queue(self) -> int:
+        """Number of threads waiting for the bus"""
+        return max(self._next_ticket - self._serving - 1, 0)
+
+    @property
+    def utilization(self) -> float:
+        """Part of time the bus was held by transactions since stats reset"""
+        elapsed = time.perf_counter() - self.started
+        if elapsed <= 0:
+            return 0.0
+        return min(self.busy_stats.total_time / elapsed, 1.0)
+
+    def acquire(self) -> bool:
+        """Wait for the bus, returns True for outer transaction of the thread"""
+        thread = threading.get_ident()
+        with self._condition:
+            if self._owner == thread:
+                self._depth += 1
+                return False
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self.max_queue = max(self.max_queue, self.queue)
+            start = time.perf_counter()
+            while self._serving != ticket:
+                self._condition.wait()
+            self._owner = thread
+            self._depth = 1
+            self._acquired = time.perf_counter()
+        self.wait_stats.add(self._acquired - start)
+        return True
+
+    def release(self) -> None:
+        with self._condition:
+            if self._owner != threading.get_ident():
+                raise RuntimeError(f"GPIB bus {self.name} is not held by the thread")
+            self._depth -= 1
+            if self._depth:
+                return
+            busy = time.perf_counter() - self._acquired
+            self._owner = None
+            self._serving += 1
+            self._condition.notify_all()
+        self.busy_stats.add(busy)
+
+    def select(self, eq_addr: int) -> None:
+        """Address device, must be called within transaction"""
+        eq_addr = int(eq_addr)
+        if eq_addr == self.address:
+            self.selects_skipped += 1
+            return
+        self._select(eq_addr)
+        self.address = eq_addr
+        self.selects += 1
+
+    def invalidate(self) -> None:
+        """Forget addressed device, next transaction sends `++addr`"""
+        self.address = None
+
+    @contextmanager
+    def transaction(self, eq_addr: int = None):
+        outer = self.acquire()
+        try:
+            if eq_addr:
+                self.select(eq_addr)
+            if outer:
+                key = self.address or 0
+                self.transactions[key] = self.transactions.get(key, 0) + 1
+            yield self
+        except Exception:
+            # Controller state is unknown after failed transfer
+            self.invalidate()
+            raise
+        finally:
+            self.release()
+
+    def dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "utilization": self.utilization,
+            "queue": self.queue,
+            "max_queue": self.max_queue,
+            "selects": self.selects,
+            "selects_skipped": self.selects_skipped,
+            "transactions": dict(self.transactions),
+            "wait": self.wait_stats.dict(),
+            "busy": self.busy_stats.dict(),
+        }
+
+    def __str__(self):
+        return (
+            f"GPIB bus {self.name}: utilization {self.utilization * 100:.1f} %; "
+            f"transactions {self.busy_stats.count}; "
+            f"mean wait {self.wait_stats.mean_time * 1e3:.2f} ms; "
+            f"++addr sent {self.selects}, skipped {self.selects_skipped}"
+        )
@@ -1,3 +1,6 @@
+from typing import List
+
+from api.adapters.gpib_bus import GpibBus
 from api.adapters.socket_adapter import SocketAdapter
 from utils.classes import PrologixMeta
 
@@ -14,10 +17,21 @@ class Prologix(SocketAdapter, metaclass=PrologixMeta):
         *args,
         **kwargs,
     ):
+        # GPIB answers are requested explicitly by `++read`
+        kwargs.pop("pipelined", None)
         super().__init__(host, port, timeout, delay, *args, **kwargs)
+        self.bus = GpibBus(
+            name=f"{host}:{port}",
+            select=lambda eq_addr: self._send("++addr %i" % eq_addr),
+        )
         self.setup()
 
     def setup(self):
+        with self.bus.transaction():
+            self._setup()
+            self.bus.invalidate()
+
+    def _setup(self):
         # set device to CONTROLLER mode
         self._send("++mode 1")
 
@@ -33,22 +47,34 @@ class Prologix(SocketAdapter, metaclass=PrologixMeta):
         self._send("++savecfg 0")
 
     def select(self, eq_addr):
-        self._send("++addr %i" % int(eq_addr))
+        with self.bus.transaction():
+            self.bus.select(eq_addr)
 
     def write(self, cmd, eq_addr: int = None):
-        if eq_addr:
-            self.select(eq_addr)
-        super().write(cmd)
+        with self.bus.transaction(eq_addr):
+            super().write(cmd)
 
     def read(self, eq_addr: int = None, num_bytes=1024):
-        if eq_addr:
-            self.select(eq_addr)
-        self._send("++read eoi")
-        return super().read(num_bytes)
+        with self.bus.transaction(eq_addr):
+            self._send("++read eoi")
+            return super().read(num_bytes)
 
     def query(self, cmd, eq_addr: int = None, buffer_size=1024 * 1024, **kwargs):
-        self.write(cmd, eq_addr)
-        return self.read(eq_addr, buffer_size)
+        with self.bus.transaction(eq_addr):
+            self.write(cmd)
+            return self.read(num_bytes=buffer_size)
+
+    def query_block(self, cmd: str, eq_addr: int = None, **kwargs) -> bytes:
+        with self.bus.transaction(eq_addr):
+            self.buffer = b""
+            self.write(cmd)
+            self._send("++read eoi")
+            return self.read_block()
+
+    def query_many(self, cmds: List[str], eq_addr: int = None, **kwargs) -> List[str]:
+        """Queries are done in one bus transaction, other threads can't interleave"""
+        with self.bus.transaction(eq_addr):
+            return [self.query(cmd, **kwargs) for cmd in cmds]
 
 
 if __name__ == "__main__":
@@ -1,5 +1,7 @@
 import time
+from typing import List, Optional
 
+from .gpib_bus import GpibBus
 from .serial_adapter import SerialAdapter
 from utils.classes import PrologixUsbMeta
 
@@ -14,9 +16,17 @@ class PrologixUsb(SerialAdapter, metaclass=PrologixUsbMeta):
         **kwargs,
     ):
         super().__init__(port, timeout, delay, *args, **kwargs)
+        self.bus = GpibBus(
+            name=port, select=lambda eq_addr: self._send("++addr %i" % eq_addr)
+        )
         self.setup()
 
     def setup(self):
+        with self.bus.transaction():
+            self._setup()
+            self.bus.invalidate()
+
+    def _setup(self):
         # set device to CONTROLLER mode
         self._send("++mode 1")
 
@@ -29,28 +39,47 @@ class PrologixUsb(SerialAdapter, metaclass=PrologixUsbMeta):
         # do not require CR or LF appended to GPIB data
         self._send("++eos 3")
 
+        # append terminator to answers on EOI, so answers of instruments
+        # without own LF are finished without waiting for timeout
+        self._send("++eot_enable 1")
+        self._send("++eot_char %i" % self.terminator[-1])
+
         self._send("++savecfg 0")
 
     def select(self, eq_addr):
-        self._send("++addr %i" % int(eq_addr))
+        with self.bus.transaction():
+            self.bus.select(eq_addr)
 
     def write(self, cmd, eq_addr: int = None):
-        if eq_addr:
-            self.select(eq_addr)
-        super().write(cmd)
+        with self.bus.transaction(eq_addr):
+            super().write(cmd)
 
-    def read(self, eq_addr: int = None, num_bytes=1024):
-        if eq_addr:
-            self.select(eq_addr)
-        self._send("++read eoi")
-        return super().read(num_bytes)
+    def read(self, eq_addr: int = None, num_bytes: Optional[int] = None):
+        with self.bus.transaction(eq_addr):
+            self._send("++read eoi")
+            return super().read(num_bytes)
 
     def query(
-        self, cmd, eq_addr: int = None, buffer_size=1024 * 1024, delay: float = 0
+        self,
+        cmd,
+        eq_addr: int = None,
+        buffer_size: Optional[int] = None,
+        delay: float = 0,
     ):
-        self.write(cmd, eq_addr)
-        if delay:
-            time.sleep(delay)
-        elif self.delay:
-            time.sleep(delay)
-        return self.read(eq_addr, buffer_size)
+        with self.bus.transaction(eq_addr):
+            start = time.perf_counter()
+            # Drop late answers and extra terminators of previous queries
+            self.serial.reset_input_buffer()
+            self.write(cmd)
+            if delay:
+                time.sleep(delay)
+            elif self.delay:
+                time.sleep(self.delay)
+            value = self.read(num_bytes=buffer_size)
+            self.stats.add(time.perf_counter() - start)
+            return value
+
+    def query_many(self, cmds: List[str], eq_addr: int = None, **kwargs) -> List[str]:
+        """Queries are done in one bus transaction, other threads can't interleave"""
+        with self.bus.transaction(eq_addr):
+            return [self.query(cmd, **kwargs) for cmd in cmds]
@@ -1,20 +1,34 @@
+import logging
 import serial
 import time
+from typing import Optional
 
-from utils.classes import InstrumentAdapterInterface
+from utils.classes import InstrumentAdapterInterface, TransactionStats
+
+logger = logging.getLogger(__name__)
 
 
 class SerialAdapter(InstrumentAdapterInterface):
+    """
+    Serial SCPI adapter.
+    Answers are read up to the `terminator` and returned as soon as it is received,
+    `timeout` bounds the whole answer, not a single byte.
+    Query latency and timeouts are counted in `stats`.
+    """
+
     def __init__(
         self,
         port: str,
         timeout: float = 2,
         delay: float = 0,
+        terminator: str = "\n",
         *args,
         **kwargs,
     ):
         self.timeout = timeout
         self.delay = delay
+        self.terminator = terminator.encode("ascii")
+        self.stats = TransactionStats()
         self.serial = serial.Serial(port=port, timeout=timeout)
 
     def _send(self, value: str) -> None:
@@ -25,14 +39,35 @@ class SerialAdapter(InstrumentAdapterInterface):
         value = self.serial.read(byte_num)
         return value.decode("ascii").rstrip("\n\x00")
 
-    def read(self, num_bytes=1024, **kwargs) -> str:
+    def _recv_line(self) -> str:
+        """Read answer up to the terminator, pyserial keeps `timeout` as a deadline"""
+        value = self.serial.read_until(self.terminator)
+        if not value.endswith(self.terminator):
+            self.stats.add_timeout()
+            logger.warning(
+                f"[{self.__class__.__name__}._recv_line] Answer terminator was not received within {self.timeout} s"
+            )
+        return value.decode("ascii", "replace").rstrip("\r\n\x00")
+
+    def read(self, num_bytes: Optional[int] = None, **kwargs) -> str:
+        """Read answer line, or exactly `num_bytes` bytes if given"""
+        if num_bytes is None:
+            return self._recv_line()
         return self._recv(num_bytes)
 
     def write(self, cmd: str) -> None:
         self._send(cmd)
 
-    def query(self, cmd: str, buffer_size=1024 * 1024, **kwargs) -> str:
+    def query(self, cmd: str, buffer_size: Optional[int] = None, **kwargs) -> str:
+        start = time.perf_counter()
+        # Drop late answers of previous timed out queries
+        self.serial.reset_input_buffer()
         self.write(cmd)
         if self.delay:
             time.sleep(self.delay)
-        return self.read(num_bytes=buffer_size)
+        value = self.read(num_bytes=buffer_size)
+        self.stats.add(time.perf_counter() - start)
+        return value
+
+    def close(self) -> None:
+        self.serial.close()
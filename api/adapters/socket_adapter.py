@@ -1,7 +1,7 @@
 import logging
 import socket
 import time
-from typing import Union
+from typing import Union, List
 
 from utils.classes import InstrumentAdapterInterface
 from utils.exceptions import DeviceConnectionError
@@ -10,12 +10,22 @@ logger = logging.getLogger(__name__)
 
 
 class SocketAdapter(InstrumentAdapterInterface):
+    """
+    Raw socket SCPI adapter.
+    By default query is write -> sleep(delay) -> single recv.
+    In pipelined mode answers are read from a buffer up to the terminator
+    without fixed delays, so several queries can be written back-to-back
+    and their answers matched in order (see `query_many`).
+    """
+
     def __init__(
         self,
         host: str,
         port: int,
         timeout: float = 2,
         delay: float = 0.4,
+        pipelined: bool = False,
+        terminator: str = "\n",
         *args,
         **kwargs,
     ):
@@ -24,6 +34,9 @@ class SocketAdapter(InstrumentAdapterInterface):
         self.port = int(port)
         self.timeout = 0
         self.delay = delay
+        self.pipelined = pipelined
+        self.terminator = terminator.encode("ascii")
+        self.buffer = b""
         self.init(timeout)
 
     def init(self, timeout: float = 2):
@@ -32,6 +45,8 @@ class SocketAdapter(InstrumentAdapterInterface):
             self.socket = socket.socket(
                 socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP
             )
+            # short commands are sent at once instead of waiting for ACK of previous ones
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         else:
             logger.info(
                 f"[{self.__class__.__name__}.init]Socket is already existed, connecting ..."
@@ -87,16 +102,62 @@ class SocketAdapter(InstrumentAdapterInterface):
         self._send(cmd)
 
     def read(self, num_bytes=1024, **kwargs):
+        if self.pipelined:
+            return self._recv_line()
         return self._recv(num_bytes)
 
     def query(self, cmd: str, buffer_size=1024 * 1024, delay: float = 0, **kwargs):
+        if self.pipelined:
+            self._drain()
         self.write(cmd, **kwargs)
         if delay:
             time.sleep(delay)
-        elif self.delay:
+        elif self.delay and not self.pipelined:
             time.sleep(self.delay)
         return self.read(num_bytes=buffer_size)
 
+    @staticmethod
+    def join_commands(cmds: List[str]) -> str:
+        """
+        Join SCPI commands into one program message.
+        Each command after the first is started from the root of command tree.
+        """
+        joined = cmds[0]
+        for cmd in cmds[1:]:
+            if cmd.startswith(("*", ":")):
+                joined += f";{cmd}"
+            else:
+                joined += f";:{cmd}"
+        return joined
+
+    def query_many(self, cmds: List[str], join: bool = False, **kwargs) -> List[str]:
+        """
+        Query several commands at once.
+        Pipelined mode:
+            join=False - all commands are written back-to-back,
+                answers are read in the same order;
+            join=True - commands are sent as one `;` joined message,
+                instrument answers with one `;` separated line.
+        Otherwise commands are queried one by one.
+        """
+        if not cmds:
+            return []
+        if not self.pipelined:
+            return [self.query(cmd, **kwargs) for cmd in cmds]
+        self._drain()
+        if join:
+            self._send(self.join_commands(cmds))
+            return self._recv_line().split(";")
+        encoded = b"".join(cmd.encode("ascii") + self.terminator for cmd in cmds)
+        self.socket.sendall(encoded)
+        return [self._recv_line() for _ in cmds]
+
+    def query_block(self, cmd: str, **kwargs) -> bytes:
+        """Query IEEE 488.2 binary block, returns block data without header"""
+        self._drain()
+        self.write(cmd, **kwargs)
+        return self.read_block()
+
     def set_timeout(self, timeout):
         if timeout < 1e-3 or timeout > 3:
             raise ValueError("Timeout must be >= 1e-3 (1ms) and <= 3 (3s)")
@@ -105,13 +166,93 @@ class SocketAdapter(InstrumentAdapterInterface):
         self.socket.settimeout(self.timeout)
 
     def _send(self, value):
-        encoded_value = ("%s\n" % value).encode("ascii")
+        encoded_value = ("%s" % value).encode("ascii") + self.terminator
         self.socket.sendall(encoded_value)
 
+    def _drain(self) -> None:
+        """Drop buffered and late answers of previous timed out queries"""
+        self.buffer = b""
+        self.socket.setblocking(False)
+        try:
+            while True:
+                if not self.socket.recv(64 * 1024):
+                    raise ConnectionResetError("Socket closed by instrument")
+        except BlockingIOError:
+            pass
+        finally:
+            self.socket.settimeout(self.timeout)
+
     def _recv(self, byte_num):
         value = self.socket.recv(byte_num)
         return value.decode("ascii").rstrip()
 
+    def _recv_line(self) -> str:
+        """Read buffered answer up to the terminator within timeout"""
+        deadline = time.perf_counter() + self.timeout
+        try:
+            while True:
+                index = self.buffer.find(self.terminator)
+                if index >= 0:
+                    value = self.buffer[:index]
+                    self.buffer = self.buffer[index + len(self.terminator) :]
+                    return value.decode("ascii").rstrip()
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise socket.timeout("Answer terminator was not received")
+                self.socket.settimeout(remaining)
+                chunk = self.socket.recv(64 * 1024)
+                if not chunk:
+                    raise ConnectionResetError("Socket closed by instrument")
+                self.buffer += chunk
+        finally:
+            self.socket.settimeout(self.timeout)
+
+    def _fill_buffer(self, size: int, deadline: float) -> None:
+        """Receive data until buffer has at least `size` bytes or deadline"""
+        while len(self.buffer) < size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise socket.timeout("Binary block was not received")
+            self.socket.settimeout(remaining)
+            chunk = self.socket.recv(max(size - len(self.buffer), 64 * 1024))
+            if not chunk:
+                raise ConnectionResetError("Socket closed by instrument")
+            self.buffer += chunk
+
+    def _recv_bytes(self, size: int, deadline: float) -> bytes:
+        self._fill_buffer(size, deadline)
+        value = self.buffer[:size]
+        self.buffer = self.buffer[size:]
+        return value
+
+    def read_block(self) -> bytes:
+        """
+        Read IEEE 488.2 definite length block `#<n><length><data>` within timeout,
+        the terminator after the block is dropped.
+        Indefinite length blocks `#0<data>` are read up to the terminator.
+        """
+        deadline = time.perf_counter() + self.timeout
+        try:
+            if self._recv_bytes(1, deadline) != b"#":
+                raise ValueError("Binary block header '#' was expected")
+            digits = int(self._recv_bytes(1, deadline))
+            if not digits:
+                index = self.buffer.find(self.terminator)
+                while index < 0:
+                    self._fill_buffer(len(self.buffer) + 1, deadline)
+                    index = self.buffer.find(self.terminator)
+                value = self.buffer[:index]
+                self.buffer = self.buffer[index + len(self.terminator) :]
+                return value
+            length = int(self._recv_bytes(digits, deadline))
+            value = self._recv_bytes(length, deadline)
+            self._fill_buffer(len(self.terminator), deadline)
+            if self.buffer.startswith(self.terminator):
+                self.buffer = self.buffer[len(self.terminator) :]
+            return value
+        finally:
+            self.socket.settimeout(self.timeout)
+
     def __del__(self):
         self.close()
 
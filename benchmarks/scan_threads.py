@@ -0,0 +1,304 @@
+"""
+Headless throughput benchmark of measurement threads.
+Every thread is run synchronously against local simulated instruments,
+scan duration, points per second, per phase timings (set, settle, read, emit, store)
+and numbers of emitted signals are written to JSON and CSV reports, so adapter or scheduling changes
+can be compared by measured numbers.
+
+Run from the project root:
+    python -m benchmarks.scan_threads --points 50 --latency 0.002 --output scan_report
+    python -m benchmarks.scan_threads --cases block_bias_scan bias_power
+    python -m benchmarks.scan_threads --adaptive-settle --settle-time 0.02
+    python -m benchmarks.scan_threads --adaptive-sweep --points 200
+    python -m benchmarks.scan_threads --cases bias_reflection --vna-parameters S11 S21 --single-sweep
+"""
+import argparse
+import csv
+import json
+import logging
+import platform
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from PySide6.QtCore import Signal
+
+import settings
+from api.Scontel.sis_block_connection import SisBlockConnectionPool
+from simulators import (
+    GridSimulator,
+    NiYigSimulator,
+    NrxSimulator,
+    SimulatorConfig,
+    SimulatorRunner,
+    SisBlockSimulator,
+    SisJunctionModel,
+    VnaSimulator,
+)
+from store import RohdeSchwarzVnaZva67Manager
+from store.deviceConfig import DeviceConfig
+from store.journal import journal_writer
+from store.state import state
+
+
+logger = logging.getLogger(__name__)
+
+PHASES = ["set", "settle", "read", "emit", "store"]
+
+
+class ScanBenchmark:
+    def __init__(self, options: argparse.Namespace):
+        self.options = options
+        config = SimulatorConfig(
+            latency=options.latency,
+            jitter=options.jitter,
+            error_rate=options.error_rate,
+            seed=options.seed,
+        )
+        self.model = SisJunctionModel(pump=0.3, settle_time=options.settle_time)
+        self.block = SisBlockSimulator(port=0, model=self.model, config=config)
+        self.nrx = NrxSimulator(
+            port=0,
+            config=config,
+            power_source=lambda: -40 + 1e5 * abs(self.model.measure()[1]),
+        )
+        self.vna = VnaSimulator(port=0, config=config)
+        self.ni = NiYigSimulator(port=0, config=config)
+        self.grid = GridSimulator(port=0, config=config)
+        self.runner = SimulatorRunner(
+            [self.block, self.nrx, self.vna, self.ni, self.grid]
+        )
+        self.vna_cid = None
+
+    def configure_state(self) -> None:
+        points = self.options.points
+        state.BLOCK_ADDRESS = self.block.host
+        state.BLOCK_PORT = self.block.port
+        state.NRX_IP = self.nrx.host
+        state.NRX_PORT = self.nrx.port
+        state.NI_IP = f"{self.ni.host}:{self.ni.port}"
+        state.GRID_ADDRESS = f"{self.grid.host}:{self.grid.port}"
+        state.CHOPPER_SWITCH = False
+
+        state.BLOCK_BIAS_VOLT_FROM = 0
+        state.BLOCK_BIAS_VOLT_TO = 7
+        state.BLOCK_BIAS_VOLT_POINTS = points
+        state.BLOCK_CTRL_CURR_FROM = 0
+        state.BLOCK_CTRL_CURR_TO = 30
+        state.BLOCK_CTRL_POINTS = points
+        state.BLOCK_CTRL_STEP_DELAY = self.options.step_delay
+        state.BLOCK_BIAS_STEP_DELAY = self.options.step_delay
+        state.BLOCK_SETTLE_ADAPTIVE = self.options.adaptive_settle
+        state.BLOCK_BIAS_SWEEP_ADAPTIVE = self.options.adaptive_sweep
+        state.BLOCK_BIAS_ADAPTIVE_COARSE_POINTS = max(points // 4, 3)
+        state.GRID_ANGLE_START = 0
+        state.GRID_ANGLE_STOP = 0
+        state.NI_FREQ_FROM = 3
+        state.NI_FREQ_TO = 13
+        state.NI_FREQ_POINTS = points
+        state.NRX_POINTS = 1
+
+        vna_config = DeviceConfig(
+            name=RohdeSchwarzVnaZva67Manager.name,
+            cid=RohdeSchwarzVnaZva67Manager.last_id + 1,
+            adapter=settings.SOCKET,
+            host=self.vna.host,
+            port=str(self.vna.port),
+            config_manager=RohdeSchwarzVnaZva67Manager,
+        )
+        RohdeSchwarzVnaZva67Manager.last_id += 1
+        RohdeSchwarzVnaZva67Manager.configs.append(vna_config)
+        self.vna_cid = vna_config.cid
+
+    def get_cases(self) -> Dict[str, Dict]:
+        # Views are imported after state is configured
+        from interface.views.blockTabWidget import (
+            BlockBIASScanThread,
+            BlockCLScanThread,
+        )
+        from interface.views.powerMeterTabWidget import BiasPowerThread
+        from interface.views.GridTabWidget import StepBiasPowerThread
+        from interface.views.YIG.YigWidget import MeasureThread as YigMeasureThread
+        from interface.views.sis_reflection_measure import BiasReflectionThread
+
+        return {
+            "block_bias_scan": {
+                "flag": "BLOCK_BIAS_SCAN_THREAD",
+                "thread": BlockBIASScanThread,
+            },
+            "block_ctrl_scan": {
+                "flag": "BLOCK_CTRL_SCAN_THREAD",
+                "thread": BlockCLScanThread,
+            },
+            "bias_power": {
+                "flag": "BLOCK_BIAS_POWER_MEASURE_THREAD",
+                "thread": BiasPowerThread,
+            },
+            "grid_step_bias_power": {
+                "flag": "GRID_BLOCK_BIAS_POWER_MEASURE_THREAD",
+                "thread": StepBiasPowerThread,
+            },
+            "yig_power": {
+                "flag": "NI_STABILITY_MEAS",
+                "thread": lambda: YigMeasureThread(yig="yig_1"),
+            },
+            "bias_reflection": {
+                "flag": "BIAS_REFL_SCAN_THREAD",
+                "thread": lambda: BiasReflectionThread(
+                    cid_vna=self.vna_cid,
+                    start_frequency=2,
+                    stop_frequency=12,
+                    frequency_points=201,
+                    vna_power=-30,
+                    vna_parameters=self.options.vna_parameters,
+                    vna_samples_count=1,
+                    vna_average_count=1,
+                    start_voltage=0,
+                    stop_voltage=7,
+                    voltage_points=max(self.options.points // 5, 2),
+                    step_delay=self.options.step_delay,
+                    single_sweep=self.options.single_sweep,
+                ),
+            },
+        }
+
+    def run_case(self, name: str, case: Dict) -> Dict:
+        connection = SisBlockConnectionPool.get(state.BLOCK_ADDRESS, state.BLOCK_PORT)
+        connection.stats.reset()
+        # CL scan reads bias current, junction must not be at zero bias
+        self.model.set_voltage(2e-3)
+        setattr(state, case["flag"], True)
+        thread_factory: Callable = case["thread"]
+        start = time.perf_counter()
+        thread = thread_factory()
+        signals = self.count_signals(thread)
+        thread.run()
+        duration = time.perf_counter() - start
+        setattr(state, case["flag"], False)
+        timings = thread.timer.dict()
+        return {
+            "case": name,
+            "duration": duration,
+            "scan_duration": timings["duration"],
+            "points": timings["points"],
+            "points_per_second": timings["points_per_second"],
+            "phases": timings["phases"],
+            "block_transactions": connection.stats.dict(),
+            "signals": signals,
+        }
+
+    @staticmethod
+    def count_signals(thread) -> Dict[str, int]:
+        """Count signals emitted by thread to GUI, filled while thread is running"""
+        signals = {}
+        for name, value in vars(type(thread)).items():
+            if not isinstance(value, Signal):
+                continue
+            signals[name] = 0
+
+            def count(*args, name=name):
+                signals[name] += 1
+
+            getattr(thread, name).connect(count)
+        return signals
+
+    def run(self) -> List[Dict]:
+        self.runner.start()
+        # measures are journaled as in the app, journals are removed after the run
+        journal_writer.directory = f"{self.options.output}_journal"
+        try:
+            self.configure_state()
+            cases = self.get_cases()
+            names = self.options.cases or list(cases.keys())
+            results = []
+            for name in names:
+                logger.info(f"[{self.__class__.__name__}.run] Case {name}")
+                results.append(self.run_case(name, cases[name]))
+            return results
+        finally:
+            SisBlockConnectionPool.close_all()
+            self.runner.stop()
+            journal_writer.close_all(remove=True)
+
+    def write_report(self, results: List[Dict]) -> None:
+        report = {
+            "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "options": vars(self.options),
+            "simulator": self.block.config.dict(),
+            "results": results,
+        }
+        with open(f"{self.options.output}.json", "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=4)
+
+        phases = list(PHASES)
+        for result in results:
+            phases += [p for p in result["phases"] if p not in phases]
+        with open(f"{self.options.output}.csv", "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(
+                ["case", "points", "duration", "points_per_second", "block_mean_time"]
+                + [f"{phase}_total" for phase in phases]
+            )
+            for result in results:
+                writer.writerow(
+                    [
+                        result["case"],
+                        result["points"],
+                        f"{result['duration']:.4f}",
+                        f"{result['points_per_second']:.2f}",
+                        f"{result['block_transactions']['mean_time']:.6f}",
+                    ]
+                    + [
+                        f"{result['phases'].get(phase, {}).get('total_time', 0):.4f}"
+                        for phase in phases
+                    ]
+                )
+
+    @staticmethod
+    def print_results(results: List[Dict]) -> None:
+        print(
+            f"{'Case':<24}{'Points':>8}{'Total, s':>10}{'Points/s':>10}"
+            + "".join(f"{phase + ', s':>10}" for phase in PHASES)
+        )
+        for result in results:
+            print(
+                f"{result['case']:<24}{result['points']:>8}"
+                f"{result['duration']:>10.2f}{result['points_per_second']:>10.2f}"
+                + "".join(
+                    f"{result['phases'].get(phase, {}).get('total_time', 0):>10.3f}"
+                    for phase in PHASES
+                )
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--cases", nargs="*", default=None)
+    parser.add_argument("--points", type=int, default=50)
+    parser.add_argument("--step-delay", type=float, default=0.0)
+    parser.add_argument("--settle-time", type=float, default=5e-3)
+    parser.add_argument("--adaptive-settle", action="store_true")
+    parser.add_argument("--adaptive-sweep", action="store_true")
+    parser.add_argument("--vna-parameters", nargs="+", default=["S11"])
+    parser.add_argument("--single-sweep", action="store_true")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default="scan_benchmark")
+    options = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    benchmark = ScanBenchmark(options)
+    results = benchmark.run()
+    benchmark.write_report(results)
+    benchmark.print_results(results)
+    print(f"Report: {options.output}.json, {options.output}.csv")
+
+
+if __name__ == "__main__":
+    main()
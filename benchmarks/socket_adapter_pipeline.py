@@ -0,0 +1,74 @@
+"""
+SocketAdapter benchmark: classic write -> sleep -> recv queries
+against pipelined queries on a local simulated NRX power meter.
+
+Run from the project root:
+    python -m benchmarks.socket_adapter_pipeline --queries 20 --latency 0.002
+"""
+import argparse
+import time
+from typing import Callable, Dict
+
+from api.adapters.socket_adapter import SocketAdapter
+from simulators import NrxSimulator, SimulatorConfig, SimulatorRunner
+
+
+def run_case(name: str, func: Callable, queries: int) -> Dict:
+    start = time.perf_counter()
+    answers = func()
+    duration = time.perf_counter() - start
+    assert len(answers) == queries, f"{name}: {len(answers)} answers"
+    return {"case": name, "duration": duration, "per_query": duration / queries}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.002)
+    parser.add_argument("--delay", type=float, default=0.4)
+    options = parser.parse_args()
+
+    simulator = NrxSimulator(port=0, config=SimulatorConfig(latency=options.latency))
+    runner = SimulatorRunner([simulator]).start()
+    host, port = simulator.host, simulator.port
+
+    cmds = ["READ?"] * options.queries
+    classic = SocketAdapter(host=host, port=port, delay=options.delay)
+    pipelined = SocketAdapter(host=host, port=port, pipelined=True)
+
+    results = [
+        run_case(
+            f"classic, delay {options.delay} s",
+            lambda: [classic.query(cmd) for cmd in cmds],
+            options.queries,
+        ),
+        run_case(
+            "pipelined, one by one",
+            lambda: [pipelined.query(cmd) for cmd in cmds],
+            options.queries,
+        ),
+        run_case(
+            "pipelined, back-to-back",
+            lambda: pipelined.query_many(cmds),
+            options.queries,
+        ),
+        run_case(
+            "pipelined, ';' joined",
+            lambda: pipelined.query_many(cmds, join=True),
+            options.queries,
+        ),
+    ]
+    classic.close()
+    pipelined.close()
+    runner.stop()
+
+    print(f"{'Case':<30}{'Total, s':>12}{'Per query, ms':>16}")
+    for result in results:
+        print(
+            f"{result['case']:<30}{result['duration']:>12.3f}"
+            f"{result['per_query'] * 1e3:>16.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
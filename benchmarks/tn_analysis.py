@@ -0,0 +1,215 @@
+"""
+Benchmark of Y-factor / noise temperature analysis.
+Previous Python loop implementations of `get_voltage_tn` and `linear_fit`
+are compared with `utils.analysis` on synthetic hot/cold P-V curves,
+timings and the largest differences of results are printed.
+
+Run from the project root:
+    python -m benchmarks.tn_analysis --points 300 1000 3000 --curves 20
+"""
+import argparse
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+from alvar import db_to_absolute
+
+from utils.analysis import fit_linear, get_noise_temperature, get_tn_curve
+from utils.functions import get_tn
+
+
+def legacy_get_voltage_tn(
+    hot_power, cold_power, hot_voltage, cold_voltage, th=300, tc=77, window=10
+):
+    hot = np.asarray(hot_power)
+    cold = np.asarray(cold_power)
+    volt_cold = np.asarray(cold_voltage)
+    volt_hot = np.asarray(hot_voltage)
+
+    indexes = min(len(volt_cold), len(volt_hot))
+    left_offset = int(window // 2)
+    right_offset = int(left_offset + window % 2)
+
+    y_factor = []
+    t = []
+    volt = []
+    for i in range(indexes):
+        min_ind = i - left_offset if i - left_offset >= 0 else i
+        max_ind = i + right_offset if i + right_offset <= indexes else indexes + 1
+        volt_diff = np.abs(volt_cold[min_ind:max_ind] - volt_hot[i])
+        min_volt_cold_ind = np.where(volt_diff == np.min(volt_diff))[0] + min_ind
+        y_db = hot[i] - cold[min_volt_cold_ind]
+        y_w = db_to_absolute(hot[i]) / db_to_absolute(cold[min_volt_cold_ind])
+        y_factor.append(y_db[0])
+        t.append(get_tn(y=y_w, th=th, tc=tc)[0])
+        volt.append(volt_hot[i])
+    return volt, y_factor, t
+
+
+def legacy_linear_fit(x, y):
+    def mean(xs):
+        return sum(xs) / len(xs)
+
+    m_x = mean(x)
+    m_y = mean(y)
+
+    def std(xs, m):
+        return np.sqrt(sum((pow(x1 - m, 2) for x1 in xs)) / (len(xs) - 1))
+
+    sum_xy = sum_sq_v_x = sum_sq_v_y = 0
+    for x1, y2 in zip(x, y):
+        sum_xy += (x1 - m_x) * (y2 - m_y)
+        sum_sq_v_x += pow(x1 - m_x, 2)
+        sum_sq_v_y += pow(y2 - m_y, 2)
+    r = sum_xy / np.sqrt(sum_sq_v_x * sum_sq_v_y)
+    b = r * (std(y, m_y) / std(x, m_x))
+    return b, m_y - b * m_x
+
+
+def make_curves(
+    curves: int,
+    points: int,
+    seed: int = 0,
+    voltage_noise: float = 5e-6,
+    power_noise: float = 0.01,
+    extra_cold: int = 0,
+) -> Dict[str, np.ndarray]:
+    """
+    Hot/cold IF power of SIS mixer vs bias voltage with readback noise, dBm and V.
+    Voltage noise larger than the step makes curves non monotonic,
+    cold curve is longer by `extra_cold` points.
+    """
+    rng = np.random.default_rng(seed)
+    v_step = 7e-3 / (points - 1)
+    hot_v_set = np.linspace(0, 7e-3, points)
+    cold_v_set = np.arange(points + extra_cold) * v_step
+    hot_voltage = hot_v_set + rng.normal(0, voltage_noise, (curves, points))
+    cold_voltage = cold_v_set + rng.normal(0, voltage_noise, (curves, len(cold_v_set)))
+
+    def power(voltage):
+        return -40 + 3 * np.exp(-(((voltage - 2.7e-3) / 6e-4) ** 2))
+
+    return {
+        "hot_power": power(hot_voltage) + rng.normal(0, power_noise, hot_voltage.shape),
+        "cold_power": power(cold_voltage)
+        - 2
+        + rng.normal(0, power_noise, cold_voltage.shape),
+        "hot_voltage": hot_voltage,
+        "cold_voltage": cold_voltage,
+    }
+
+
+def measure(func: Callable, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(options: argparse.Namespace) -> List[Dict]:
+    results = []
+    for points in options.points:
+        data = make_curves(options.curves, points, seed=options.seed)
+        # voltage noise of several steps and longer cold curve check the window edges
+        noisy = make_curves(
+            options.curves,
+            points,
+            seed=options.seed,
+            voltage_noise=3 * 7e-3 / points,
+            power_noise=0.5,
+            extra_cold=3,
+        )
+        for case, curves in (("tn", data), ("tn noisy", noisy)):
+            rows = [
+                {key: value[i] for key, value in curves.items()}
+                for i in range(len(curves["hot_power"]))
+            ]
+            legacy = np.asarray([legacy_get_voltage_tn(**row) for row in rows])
+            vectorized = get_tn_curve(**curves, window=10)
+            results.append(
+                {
+                    "case": f"{case} {options.curves}x{points}",
+                    "legacy": measure(
+                        lambda: [legacy_get_voltage_tn(**row) for row in rows],
+                        options.repeat,
+                    ),
+                    "vectorized": measure(
+                        lambda: get_tn_curve(**curves, window=10), options.repeat
+                    ),
+                    # all points, edge windows included, Tn is relative as it diverges at Y ~ 1
+                    "max_diff": max(
+                        np.nanmax(np.abs(legacy[:, 1] - vectorized.y_factor)),
+                        np.nanmax(
+                            np.abs(legacy[:, 2] - vectorized.tn) / np.abs(vectorized.tn)
+                        ),
+                    ),
+                }
+            )
+        x = data["hot_voltage"][0]
+        y = data["hot_power"]
+        slopes = np.asarray([legacy_linear_fit(x, row)[0] for row in y])
+        results.append(
+            {
+                "case": f"fit {options.curves}x{points}",
+                "legacy": measure(
+                    lambda: [legacy_linear_fit(x, row) for row in y], options.repeat
+                ),
+                "vectorized": measure(lambda: fit_linear(x, y), options.repeat),
+                "max_diff": np.max(np.abs(fit_linear(x, y).slope - slopes)),
+            }
+        )
+
+        # voltage x IF frequency matrix of tn_if_sis_bias
+        hot = data["hot_power"]
+        cold = data["cold_power"]
+        legacy_tn = np.asarray(
+            [get_tn(db_to_absolute(h) / db_to_absolute(c)) for h, c in zip(hot, cold)]
+        )
+        results.append(
+            {
+                "case": f"if tn {options.curves}x{points}",
+                "legacy": measure(
+                    lambda: [
+                        get_tn(db_to_absolute(h) / db_to_absolute(c))
+                        for h, c in zip(hot, cold)
+                    ],
+                    options.repeat,
+                ),
+                "vectorized": measure(
+                    lambda: get_noise_temperature(hot, cold), options.repeat
+                ),
+                "max_diff": np.max(
+                    np.abs(get_noise_temperature(hot, cold) - legacy_tn)
+                ),
+            }
+        )
+    return results
+
+
+def print_results(results: List[Dict]) -> None:
+    print(
+        f"{'Case':<28}{'Legacy, ms':>12}{'NumPy, ms':>12}{'Speedup':>10}{'Max diff':>12}"
+    )
+    for result in results:
+        print(
+            f"{result['case']:<28}{result['legacy'] * 1e3:>12.3f}"
+            f"{result['vectorized'] * 1e3:>12.3f}"
+            f"{result['legacy'] / result['vectorized']:>10.1f}"
+            f"{result['max_diff']:>12.2e}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--points", nargs="+", type=int, default=[300, 1000])
+    parser.add_argument("--curves", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+    print_results(run(options))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,3 @@
-import time
-
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
     QGroupBox,
@@ -14,47 +12,47 @@ from PySide6.QtWidgets import (
 from api.Agilent.signal_generator import SignalGenerator
 from store import AgilentSignalGeneratorManager
 from interface.components.ui.Button import Button
-from threads import Thread
+from threads import PollJob
 from utils.exceptions import DeviceConnectionError
 
 
-class StreamThread(Thread):
+class StreamJob(PollJob):
     amplitude = Signal(float)
     frequency = Signal(float)
     output = Signal(bool)
 
+    period = 0.5
+    priority = 5
+
     def __init__(self, cid: int):
-        super().__init__()
         self.cid = cid
         self.config = AgilentSignalGeneratorManager.get_config(self.cid)
+        super().__init__(key=self.config.adapter_key)
         self.signal = None
 
-    def run(self):
+    def setup(self) -> bool:
         try:
             self.signal = SignalGenerator(**self.config.dict())
         except DeviceConnectionError:
-            self.finished.emit()
-            return
-
-        while self.config.thread_stream:
-            time.sleep(0.5)
-            frequency = self.signal.get_frequency()
-            if frequency:
-                self.frequency.emit(frequency)
+            return False
+        return True
 
-            amplitude = self.signal.get_power()
-            if amplitude:
-                self.amplitude.emit(amplitude)
+    def poll(self) -> bool:
+        if not self.config.thread_stream:
+            return False
+        frequency = self.signal.get_frequency()
+        if frequency:
+            self.frequency.emit(frequency)
 
-            output = self.signal.get_rf_output_state()
-            if output is not None:
-                self.output.emit(output)
+        amplitude = self.signal.get_power()
+        if amplitude:
+            self.amplitude.emit(amplitude)
 
-            if not any((frequency, amplitude, output)):
-                break
+        output = self.signal.get_rf_output_state()
+        if output is not None:
+            self.output.emit(output)
 
-        self.pre_exit()
-        self.finished.emit()
+        return any((frequency, amplitude, output))
 
 
 class AgilentSignalGeneratorMonitorWidget(QGroupBox):
@@ -63,7 +61,7 @@ class AgilentSignalGeneratorMonitorWidget(QGroupBox):
         self.setTitle("Monitor")
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         self.cid = cid
-        self.stream_thread = None
+        self.stream_job = None
         layout = QVBoxLayout()
         glayout = QGridLayout()
         state_layout = QFormLayout()
@@ -121,28 +119,24 @@ class AgilentSignalGeneratorMonitorWidget(QGroupBox):
         self.setLayout(layout)
 
     def start_stream(self):
-        self.stream_thread = StreamThread(cid=self.cid)
+        self.stream_job = StreamJob(cid=self.cid)
         config = AgilentSignalGeneratorManager.get_config(cid=self.cid)
         config.thread_stream = True
 
-        self.stream_thread.amplitude.connect(
+        self.stream_job.amplitude.connect(
             lambda x: self.amplitude.setText(f"{round(x, 4)}")
         )
-        self.stream_thread.frequency.connect(
+        self.stream_job.frequency.connect(
             lambda x: self.frequency.setText(f"{round(x * 1e-9, 4)}")
         )
-        self.stream_thread.output.connect(self.set_output)
-        self.stream_thread.start()
+        self.stream_job.output.connect(self.set_output)
+        self.stream_job.start()
 
         self.btnStartStream.setEnabled(False)
-        self.stream_thread.finished.connect(
-            lambda: self.btnStartStream.setEnabled(True)
-        )
+        self.stream_job.finished.connect(lambda: self.btnStartStream.setEnabled(True))
 
         self.btnStopStream.setEnabled(True)
-        self.stream_thread.finished.connect(
-            lambda: self.btnStopStream.setEnabled(False)
-        )
+        self.stream_job.finished.connect(lambda: self.btnStopStream.setEnabled(False))
 
     def stop_stream(self):
         config = AgilentSignalGeneratorManager.get_config(cid=self.cid)
@@ -1,4 +1,4 @@
-import time
+from typing import Dict
 
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
@@ -11,14 +11,15 @@ from PySide6.QtWidgets import (
     QCheckBox,
 )
 
-from api.Rigol.DP832A import PowerSupplyDP832A
+from api.Rigol.DP832A import ChannelStatus, PowerSupplyDP832A
 from store import RigolPowerSupplyManager
 from interface.components.ui.Button import Button
-from threads import Thread
+from threads import PollJob
+from utils.classes import get_status_changes
 from utils.exceptions import DeviceConnectionError
 
 
-class StreamThread(Thread):
+class StreamJob(PollJob):
     measure_1 = Signal(list)
     voltage_sour_1 = Signal(float)
     current_sour_1 = Signal(float)
@@ -34,83 +35,60 @@ class StreamThread(Thread):
     current_sour_3 = Signal(float)
     output_3 = Signal(str)
 
+    period = 0.2
+    priority = 5
+
     def __init__(self, cid: int):
-        super().__init__()
         self.cid = cid
         self.config = RigolPowerSupplyManager.get_config(self.cid)
+        super().__init__(key=self.config.adapter_key)
         self.rigol = None
+        self.statuses: Dict[int, ChannelStatus] = {}
 
-    def run(self):
+    def setup(self) -> bool:
         try:
             self.rigol = PowerSupplyDP832A(**self.config.dict())
         except DeviceConnectionError:
-            self.finished.emit()
-            return
-
-        while self.config.thread_stream:
-            time.sleep(0.2)
-            if self.config.monitor_ch1:
-                measure_1 = self.rigol.measure_all(1)
-                if len(measure_1) == 3:
-                    self.measure_1.emit(measure_1)
-
-                voltage_sour_1 = self.rigol.get_voltage(1)
-                if voltage_sour_1:
-                    self.voltage_sour_1.emit(voltage_sour_1)
-
-                current_sour_1 = self.rigol.get_current(1)
-                if current_sour_1:
-                    self.current_sour_1.emit(current_sour_1)
-
-                output1 = self.rigol.get_output(1)
-                if output1:
-                    self.output_1.emit(output1)
-
-            if self.config.monitor_ch2:
-                measure_2 = self.rigol.measure_all(2)
-                if len(measure_2) == 3:
-                    self.measure_2.emit(measure_2)
-
-                voltage_sour_2 = self.rigol.get_voltage(2)
-                if voltage_sour_2:
-                    self.voltage_sour_2.emit(voltage_sour_2)
-
-                current_sour_2 = self.rigol.get_current(2)
-                if current_sour_2:
-                    self.current_sour_2.emit(current_sour_2)
-
-                output2 = self.rigol.get_output(2)
-                if output2:
-                    self.output_2.emit(output2)
-
-            if self.config.monitor_ch3:
-                measure_3 = self.rigol.measure_all(3)
-                if len(measure_3) == 3:
-                    self.measure_3.emit(measure_3)
-
-                voltage_sour_3 = self.rigol.get_voltage(3)
-                if voltage_sour_3:
-                    self.voltage_sour_3.emit(voltage_sour_3)
-
-                current_sour_3 = self.rigol.get_current(3)
-                if current_sour_3:
-                    self.current_sour_3.emit(current_sour_3)
-
-                output3 = self.rigol.get_output(3)
-                if output3:
-                    self.output_3.emit(output3)
-
-            if not any(
+            return False
+        return True
+
+    def poll(self) -> bool:
+        if not self.config.thread_stream:
+            return False
+        channels = [
+            channel
+            for channel, monitor in enumerate(
                 (
                     self.config.monitor_ch1,
                     self.config.monitor_ch2,
                     self.config.monitor_ch3,
-                )
-            ):
-                break
-
-        self.pre_exit()
-        self.finished.emit()
+                ),
+                start=1,
+            )
+            if monitor
+        ]
+        if not channels:
+            return False
+        statuses = self.rigol.get_status(channels)
+        for channel in (1, 2, 3):
+            if channel not in channels:
+                # emit all values when monitoring of channel is turned on again
+                self.statuses.pop(channel, None)
+        for channel, status in zip(channels, statuses):
+            if status is None:
+                continue
+            self.emit_changes(channel, self.statuses.get(channel), status)
+            self.statuses[channel] = status
+        return True
+
+    def emit_changes(self, channel: int, previous, status: ChannelStatus):
+        changes = get_status_changes(previous, status)
+        measure = [status.voltage, status.current, status.power]
+        if changes.keys() & {"voltage", "current", "power"} and None not in measure:
+            getattr(self, f"measure_{channel}").emit(measure)
+        for field in ("voltage_sour", "current_sour", "output"):
+            if changes.get(field) is not None:
+                getattr(self, f"{field}_{channel}").emit(changes[field])
 
 
 class MonitorWidget(QGroupBox):
@@ -120,7 +98,7 @@ class MonitorWidget(QGroupBox):
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         self.cid = cid
         self.config = RigolPowerSupplyManager.get_config(cid=self.cid)
-        self.stream_thread = None
+        self.stream_job = None
         layout = QVBoxLayout()
         glayout = QGridLayout()
         hlayout = QHBoxLayout()
@@ -309,46 +287,42 @@ class MonitorWidget(QGroupBox):
         self.setLayout(layout)
 
     def start_stream(self):
-        self.stream_thread = StreamThread(cid=self.cid)
+        self.stream_job = StreamJob(cid=self.cid)
         self.config.thread_stream = True
 
-        self.stream_thread.measure_1.connect(self.set_measure_1)
-        self.stream_thread.current_sour_1.connect(
+        self.stream_job.measure_1.connect(self.set_measure_1)
+        self.stream_job.current_sour_1.connect(
             lambda x: self.currentSour1.setText(f"{round(x, 4)}")
         )
-        self.stream_thread.voltage_sour_1.connect(
+        self.stream_job.voltage_sour_1.connect(
             lambda x: self.voltageSour1.setText(f"{round(x, 4)}")
         )
-        self.stream_thread.output_1.connect(self.set_output_1)
+        self.stream_job.output_1.connect(self.set_output_1)
 
-        self.stream_thread.measure_2.connect(self.set_measure_2)
-        self.stream_thread.current_sour_2.connect(
+        self.stream_job.measure_2.connect(self.set_measure_2)
+        self.stream_job.current_sour_2.connect(
             lambda x: self.currentSour2.setText(f"{round(x, 4)}")
         )
-        self.stream_thread.voltage_sour_2.connect(
+        self.stream_job.voltage_sour_2.connect(
             lambda x: self.voltageSour2.setText(f"{round(x, 4)}")
         )
-        self.stream_thread.output_2.connect(self.set_output_2)
+        self.stream_job.output_2.connect(self.set_output_2)
 
-        self.stream_thread.measure_3.connect(self.set_measure_3)
-        self.stream_thread.current_sour_3.connect(
+        self.stream_job.measure_3.connect(self.set_measure_3)
+        self.stream_job.current_sour_3.connect(
             lambda x: self.currentSour3.setText(f"{round(x, 4)}")
         )
-        self.stream_thread.voltage_sour_3.connect(
+        self.stream_job.voltage_sour_3.connect(
             lambda x: self.voltageSour3.setText(f"{round(x, 4)}")
         )
-        self.stream_thread.output_3.connect(self.set_output_3)
-        self.stream_thread.start()
+        self.stream_job.output_3.connect(self.set_output_3)
+        self.stream_job.start()
 
         self.btnStartStream.setEnabled(False)
-        self.stream_thread.finished.connect(
-            lambda: self.btnStartStream.setEnabled(True)
-        )
+        self.stream_job.finished.connect(lambda: self.btnStartStream.setEnabled(True))
 
         self.btnStopStream.setEnabled(True)
-        self.stream_thread.finished.connect(
-            lambda: self.btnStopStream.setEnabled(False)
-        )
+        self.stream_job.finished.connect(lambda: self.btnStopStream.setEnabled(False))
 
     def stop_stream(self):
         config = RigolPowerSupplyManager.get_config(cid=self.cid)
@@ -1,4 +1,3 @@
-import time
 from typing import Dict
 
 from PySide6.QtCore import Signal
@@ -8,6 +7,7 @@ from PySide6.QtWidgets import (
     QLabel,
     QHBoxLayout,
     QComboBox,
+    QCheckBox,
 )
 
 from api.RohdeSchwarz.spectrum_fsek30 import SpectrumBlock
@@ -15,49 +15,59 @@ from interface.components.ui.Button import Button
 from interface.components.ui.DoubleSpinBox import DoubleSpinBox
 from interface.components.FormWidget import FormWidget
 from store import RohdeSchwarzSpectrumFsek30Manager
-from threads import Thread
+from threads import PollJob
 from utils.dock import Dock
 from utils.exceptions import DeviceConnectionError
 
 
-class StreamSpectrumThread(Thread):
+class StreamSpectrumJob(PollJob):
     data = Signal(dict)
 
+    priority = 5
+
     def __init__(
         self,
         cid: int,
         step_delay: float,
         trace: str = "TRACE1",
+        single_sweep: bool = False,
     ):
-        super().__init__()
         self.cid = cid
         self.trace = trace
         self.step_delay = step_delay
+        self.single_sweep = single_sweep
         self.config = RohdeSchwarzSpectrumFsek30Manager.get_config(cid)
+        super().__init__(period=step_delay, key=self.config.adapter_key)
         self.spectrum = None
 
-    def run(self):
+    def setup(self) -> bool:
         try:
             self.spectrum = SpectrumBlock(**self.config.dict(), delay=self.config.delay)
         except DeviceConnectionError:
-            self.finished.emit()
-            return
-
-        while 1:
-            self.config.start_frequency = self.spectrum.get_start_frequency()
-            self.config.stop_frequency = self.spectrum.get_stop_frequency()
-            power, freq = self.spectrum.get_trace_data(
-                self.trace, self.config.start_frequency, self.config.stop_frequency
-            )
-            if not power:
-                continue
+            return False
+        if self.single_sweep:
+            # every trace is read after its own sweep is finished (*OPC?)
+            self.spectrum.set_single_sweep(True)
+        return True
+
+    def poll(self) -> bool:
+        self.config.start_frequency = self.spectrum.get_start_frequency()
+        self.config.stop_frequency = self.spectrum.get_stop_frequency()
+        power, freq = self.spectrum.get_trace_data(
+            self.trace, self.config.start_frequency, self.config.stop_frequency
+        )
+        if power:
             self.data.emit(
                 {
                     "x": freq,
                     "y": power,
                 }
             )
-            time.sleep(self.step_delay)
+        return True
+
+    def pre_exit(self, *args, **kwargs):
+        if self.spectrum is not None and self.spectrum.single_sweep:
+            self.spectrum.set_single_sweep(False)
 
 
 class SpectrumMonitor(QGroupBox):
@@ -82,10 +92,16 @@ class SpectrumMonitor(QGroupBox):
         self.timeDelay.setRange(0.01, 5)
         self.timeDelay.setValue(0.4)
 
+        self.singleSweep = QCheckBox(self)
+        self.singleSweep.setText("Single sweep")
+        self.singleSweep.setToolTip(
+            "Every trace is read after its own sweep is finished instead of step delay timing"
+        )
+
         self.btnStartSpectrum = Button("Start stream spectrum", animate=True)
         self.btnStartSpectrum.clicked.connect(self.startStreamSpectrum)
         self.btnStopSpectrum = Button("Stop stream spectrum")
-        self.btnStopSpectrum.clicked.connect(lambda: self.spectrum_thread.terminate())
+        self.btnStopSpectrum.clicked.connect(lambda: self.spectrum_job.terminate())
         self.btnStopSpectrum.setEnabled(False)
 
         layout.addWidget(
@@ -93,28 +109,30 @@ class SpectrumMonitor(QGroupBox):
                 self, {self.traceLabel: self.trace, self.timeDelayLabel: self.timeDelay}
             )
         )
+        layout.addWidget(self.singleSweep)
         hlayout.addWidget(self.btnStartSpectrum)
         hlayout.addWidget(self.btnStopSpectrum)
         layout.addLayout(hlayout)
         self.setLayout(layout)
 
     def startStreamSpectrum(self):
-        self.spectrum_thread = StreamSpectrumThread(
+        self.spectrum_job = StreamSpectrumJob(
             cid=self.cid,
             step_delay=self.timeDelay.value(),
             trace=self.trace.currentText(),
+            single_sweep=self.singleSweep.isChecked(),
         )
-        self.spectrum_thread.data.connect(self.show_spectrum)
+        self.spectrum_job.data.connect(self.show_spectrum)
         self.spectrumStreamGraphWindow = Dock.ex.dock_manager.findDockWidget(
             "Spectrum P-F curve"
         )
-        self.spectrum_thread.start()
+        self.spectrum_job.start()
         self.btnStartSpectrum.setEnabled(False)
         self.btnStopSpectrum.setEnabled(True)
-        self.spectrum_thread.finished.connect(
+        self.spectrum_job.finished.connect(
             lambda: self.btnStartSpectrum.setEnabled(True)
         )
-        self.spectrum_thread.finished.connect(
+        self.spectrum_job.finished.connect(
             lambda: self.btnStopSpectrum.setEnabled(False)
         )
 
@@ -60,7 +60,7 @@ class SpectrumConfigWidget(QGroupBox):
         self.readDelayLabel.setText("Read delay, s")
         self.readDelay = DoubleSpinBox(self)
         self.readDelay.setRange(0, 3)
-        self.readDelay.setValue(0.2)
+        self.readDelay.setValue(0)
 
         self.videoBwLabel = QLabel(self)
         self.videoBwLabel.setText("Video BW, kHz")
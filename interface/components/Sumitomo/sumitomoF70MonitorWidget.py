@@ -1,4 +1,3 @@
-import time
 from typing import Dict
 
 from PySide6.QtCore import Signal
@@ -14,35 +13,41 @@ from PySide6.QtWidgets import (
 from api import F70Rest
 from interface.components.ui.Button import Button
 from store import SumitomoF70Manager
-from threads import Thread
+from threads import PollJob
 
 
-class StreamThread(Thread):
+class StreamJob(PollJob):
     stream_temperatures = Signal(dict)
 
+    period = 0.5
+    priority = 8
+
     def __init__(self, cid):
-        super().__init__()
         self.config = SumitomoF70Manager.get_config(cid)
+        super().__init__(key=self.config.adapter_key)
+        self.compressor = None
 
-    def run(self):
-        compressor = F70Rest(**self.config.dict())
+    def setup(self) -> bool:
+        self.compressor = F70Rest(**self.config.dict())
         self.config.thread_stream = True
-        while self.config.thread_stream:
-            raw_data = compressor.get_temperatures()
-            if raw_data.get("error"):
-                self.finished.emit()
-                return
-            temps = raw_data.get("temperatures", [])
-            if len(temps) >= 3:
-                self.stream_temperatures.emit(
-                    {
-                        "t1": temps[0],
-                        "t2": temps[1],
-                        "t3": temps[2],
-                    }
-                )
-            time.sleep(0.5)
-        self.finished.emit()
+        return True
+
+    def poll(self) -> bool:
+        if not self.config.thread_stream:
+            return False
+        raw_data = self.compressor.get_temperatures()
+        if raw_data.get("error"):
+            return False
+        temps = raw_data.get("temperatures", [])
+        if len(temps) >= 3:
+            self.stream_temperatures.emit(
+                {
+                    "t1": temps[0],
+                    "t2": temps[1],
+                    "t3": temps[2],
+                }
+            )
+        return True
 
     def pre_exit(self):
         self.config.thread_stream = False
@@ -103,20 +108,16 @@ class SumitomoF70MonitorWidget(QGroupBox):
         self.setLayout(layout)
 
     def start_stream(self):
-        self.thread_stream = StreamThread(cid=self.cid)
-        self.thread_stream.start()
+        self.stream_job = StreamJob(cid=self.cid)
+        self.stream_job.start()
         self.btnStartStream.setEnabled(False)
         self.btnStopStream.setEnabled(True)
-        self.thread_stream.finished.connect(
-            lambda: self.btnStartStream.setEnabled(True)
-        )
-        self.thread_stream.finished.connect(
-            lambda: self.btnStopStream.setEnabled(False)
-        )
-        self.thread_stream.stream_temperatures.connect(self.set_temperatures)
+        self.stream_job.finished.connect(lambda: self.btnStartStream.setEnabled(True))
+        self.stream_job.finished.connect(lambda: self.btnStopStream.setEnabled(False))
+        self.stream_job.stream_temperatures.connect(self.set_temperatures)
 
     def stop_stream(self):
-        self.thread_stream.quit()
+        self.stream_job.quit()
 
     def set_temperatures(self, temps: Dict):
         self.temp1.setText(f"{temps['t1']}")
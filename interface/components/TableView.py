@@ -45,22 +45,22 @@ class TableView(QtWidgets.QTableView):
         self.menu.exec(self.mapToGlobal(pos))
 
     def saveSelectedRow(self):
-        model = self.model()
-        selection = self.selectionModel()
-        rows = list(set(index.row() for index in selection.selectedIndexes()))
-        if not len(rows):
+        measure_model = self.get_selected_measure_model()
+        if not measure_model:
             return
-        model.manager.save_by_index(rows[0])
+        measure_model.objects.save_to_file(measure_model)
 
     def get_selected_measure_model(self) -> Optional[MeasureModel]:
-        model = self.model()
-        selection = self.selectionModel()
-        selected_index = list(set(index for index in selection.selectedIndexes()))
-        if not len(selected_index):
+        selected_indexes = self.selectionModel().selectedIndexes()
+        if not len(selected_indexes):
             return
-        selected_index = selected_index[0]
-        measure_model_id = selected_index.model()._data[selected_index.row()][0]
-        return model.manager.get(id=measure_model_id)
+        index = selected_indexes[0]
+        model = self.model()
+        # rows of sorted and filtered view differ from rows of measures
+        if isinstance(model, QtCore.QSortFilterProxyModel):
+            index = model.mapToSource(index)
+            model = model.sourceModel()
+        return model.get_measure(index.row())
 
     def commentSelectedRow(self):
         measure_model = self.get_selected_measure_model()
@@ -70,7 +70,7 @@ class TableView(QtWidgets.QTableView):
         button = reply.exec()
         if button == 1:
             measure_model.comment = reply.commentEdit.toPlainText()
-            measure_model.objects.update_table()
+            measure_model.save(finish=False)
 
     def viewSelectedRow(self):
         measure_model = self.get_selected_measure_model()
@@ -80,13 +80,9 @@ class TableView(QtWidgets.QTableView):
         button = reply.exec()
 
     def deleteSelectedRows(self):
-        model = self.model()
-        selection = self.selectionModel()
-        row = list(set(index.row() for index in selection.selectedIndexes()))
-        if not len(row):
+        measure = self.get_selected_measure_model()
+        if not measure:
             return
-        row = row[0]
-        measure = model.manager.all()[row]
 
         dlg = QMessageBox(self)
         dlg.setWindowTitle("Deleting data")
@@ -100,6 +96,6 @@ class TableView(QtWidgets.QTableView):
         button = dlg.exec()
 
         if button == QMessageBox.StandardButton.Yes:
-            model.manager.delete_by_index(row)
+            measure.objects.delete(measure)
         else:
             return
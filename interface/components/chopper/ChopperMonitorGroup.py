@@ -1,11 +1,10 @@
-import time
-
 from PySide6.QtCore import QThread, Signal, Qt
 from PySide6.QtWidgets import QGroupBox, QVBoxLayout, QLabel, QGridLayout
 
 from api.Chopper import chopper_manager
 from interface.components.ui.Button import Button
 from store.state import state
+from threads import PollJob
 
 
 class ChopperSetZeroThread(QThread):
@@ -19,23 +18,26 @@ class ChopperSetZeroThread(QThread):
         self.finished.emit()
 
 
-class ChopperMonitorThread(QThread):
+class ChopperMonitorJob(PollJob):
     position = Signal(int)
     speed = Signal(float)
 
-    def run(self):
+    period = 0.1
+    priority = 0
+
+    def setup(self) -> bool:
+        return chopper_manager.chopper.client.connected
+
+    def poll(self) -> bool:
+        if not state.CHOPPER_MONITOR:
+            return False
         if not chopper_manager.chopper.client.connected:
-            self.finished.emit()
-            return
-        while state.CHOPPER_MONITOR:
-            if not chopper_manager.chopper.client.connected:
-                self.finished.emit()
-                return
-            pos = chopper_manager.chopper.get_actual_pos()
-            # speed = chopper_manager.chopper.get_actual_speed()
-            self.position.emit(pos)
-            # self.speed.emit(speed)
-            time.sleep(0.1)
+            return False
+        pos = chopper_manager.chopper.get_actual_pos()
+        # speed = chopper_manager.chopper.get_actual_speed()
+        self.position.emit(pos)
+        # self.speed.emit(speed)
+        return True
 
 
 class ChopperMonitorGroup(QGroupBox):
@@ -93,16 +95,16 @@ class ChopperMonitorGroup(QGroupBox):
 
     def startMonitor(self):
         state.CHOPPER_MONITOR = True
-        self.chopper_monitor_thread = ChopperMonitorThread()
-        self.chopper_monitor_thread.start()
+        self.chopper_monitor_job = ChopperMonitorJob()
+        self.chopper_monitor_job.start()
         self.btnStartMonitor.setEnabled(False)
         self.btnStopMonitor.setEnabled(True)
-        self.chopper_monitor_thread.position.connect(self.setCurrentPosition)
-        # self.chopper_monitor_thread.speed.connect(self.setActualSpeed)
-        self.chopper_monitor_thread.finished.connect(
+        self.chopper_monitor_job.position.connect(self.setCurrentPosition)
+        # self.chopper_monitor_job.speed.connect(self.setActualSpeed)
+        self.chopper_monitor_job.finished.connect(
             lambda: self.btnStartMonitor.setEnabled(True)
         )
-        self.chopper_monitor_thread.finished.connect(
+        self.chopper_monitor_job.finished.connect(
             lambda: self.btnStopMonitor.setEnabled(False)
         )
 
@@ -116,4 +118,4 @@ class ChopperMonitorGroup(QGroupBox):
 
     def stopMonitor(self):
         state.CHOPPER_MONITOR = False
-        self.chopper_monitor_thread.exit(0)
+        self.chopper_monitor_job.exit(0)
@@ -16,6 +16,7 @@ from api.Scontel.sis_block import SisBlock
 from interface.components.ui.Button import Button
 from interface.components.ui.DoubleSpinBox import DoubleSpinBox
 from store.base import MeasureModel
+from store.columns import Column
 from store.state import state
 from threads import Thread
 from utils.dock import Dock
@@ -47,9 +48,9 @@ class MeasureThread(Thread):
         time.sleep(abs(state.GRID_ANGLE_START) / state.GRID_SPEED)
 
         results = {
-            "angle": [],
-            "current_get": [],
-            "voltage_get": [],
+            "angle": Column(unit="deg", capacity=len(angle_range)),
+            "current_get": Column(unit="A", capacity=len(angle_range)),
+            "voltage_get": Column(unit="V", capacity=len(angle_range)),
         }
 
         for i, angle in enumerate(angle_range):
@@ -60,11 +61,11 @@ class MeasureThread(Thread):
                 self.grid.rotate(angle)
                 time.sleep(abs(state.GRID_ANGLE_STEP) / state.GRID_SPEED)
 
-            voltage = self.block.get_bias_voltage()
-            if not voltage:
+            bias = self.block.get_bias_point()
+            if bias is None:
                 continue
-            current = self.block.get_bias_current()
-            if not current:
+            voltage, current = bias
+            if not voltage or not current:
                 continue
 
             results["angle"].append(angle)
@@ -1,4 +1,4 @@
-import time
+from typing import Optional
 
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
@@ -11,64 +11,52 @@ from PySide6.QtWidgets import (
     QFormLayout,
 )
 
-from api.Keithley import PowerSupply
+from api.Keithley.power_supply import PowerSupply, PowerSupplyStatus
 from store import KeithleyPowerSupplyManager
 from interface.components.ui.Button import Button
-from threads import Thread
+from threads import PollJob
+from utils.classes import get_status_changes
 from utils.exceptions import DeviceConnectionError
 
 
-class KeithleyStreamThread(Thread):
+class KeithleyStreamJob(PollJob):
     current = Signal(float)
     voltage = Signal(float)
     sour_current = Signal(float)
     sour_voltage = Signal(float)
     output = Signal(str)
 
+    period = 0.5
+    priority = 5
+
     def __init__(self, cid: int):
-        super().__init__()
         self.cid = cid
         self.config = KeithleyPowerSupplyManager.get_config(self.cid)
+        super().__init__(key=self.config.adapter_key)
         self.keithley = None
+        self.status: Optional[PowerSupplyStatus] = None
 
-    def run(self):
+    def setup(self) -> bool:
         try:
             self.keithley = PowerSupply(**self.config.dict())
         except DeviceConnectionError:
-            self.finished.emit()
-            return
-
-        while self.config.thread_stream:
-            time.sleep(0.5)
-            sour_voltage = self.keithley.get_sour_voltage()
-            if sour_voltage:
-                self.sour_voltage.emit(sour_voltage)
-
-            voltage = self.keithley.get_voltage()
-            if voltage:
-                self.voltage.emit(voltage)
-
-            sour_current = self.keithley.get_sour_current()
-            if sour_current:
-                self.sour_current.emit(sour_current)
+            return False
+        return True
 
-            current = self.keithley.get_current()
-            if current:
-                self.current.emit(current)
+    def poll(self) -> bool:
+        if not self.config.thread_stream:
+            return False
+        status = self.keithley.get_status()
+        if status is None:
+            return False
+        for field, value in get_status_changes(self.status, status).items():
+            if value is not None:
+                getattr(self, field).emit(value)
+        self.status = status
 
-            output = self.keithley.get_output_state()
-            if output:
-                self.output.emit(output)
-
-            if not any((sour_voltage, voltage, sour_current, current)):
-                break
-
-        self.pre_exit()
-        self.finished.emit()
-
-    # def pre_exit(self, *args, **kwargs):
-    #     if self.keithley:
-    #         self.keithley.adapter.close()
+        return any(
+            (status.sour_voltage, status.voltage, status.sour_current, status.current)
+        )
 
 
 class KeithleyMonitor(QGroupBox):
@@ -168,32 +156,32 @@ class KeithleyMonitor(QGroupBox):
         self.setLayout(layout)
 
     def start_stream_keithley(self):
-        self.keithley_stream_thread = KeithleyStreamThread(cid=self.cid)
+        self.keithley_stream_job = KeithleyStreamJob(cid=self.cid)
         config = KeithleyPowerSupplyManager.get_config(cid=self.cid)
         config.thread_stream = True
 
-        self.keithley_stream_thread.current.connect(
+        self.keithley_stream_job.current.connect(
             lambda x: self.keithleyCurrentGet.setText(f"{round(x, 4)}")
         )
-        self.keithley_stream_thread.sour_current.connect(
+        self.keithley_stream_job.sour_current.connect(
             lambda x: self.keithleyCurrentSour.setText(f"{round(x, 4)}")
         )
-        self.keithley_stream_thread.voltage.connect(
+        self.keithley_stream_job.voltage.connect(
             lambda x: self.keithleyVoltageGet.setText(f"{round(x, 4)}")
         )
-        self.keithley_stream_thread.sour_voltage.connect(
+        self.keithley_stream_job.sour_voltage.connect(
             lambda x: self.keithleyVoltageSour.setText(f"{round(x, 4)}")
         )
-        self.keithley_stream_thread.output.connect(self.set_output)
-        self.keithley_stream_thread.start()
+        self.keithley_stream_job.output.connect(self.set_output)
+        self.keithley_stream_job.start()
 
         self.btnStartStreamKeithley.setEnabled(False)
-        self.keithley_stream_thread.finished.connect(
+        self.keithley_stream_job.finished.connect(
             lambda: self.btnStartStreamKeithley.setEnabled(True)
         )
 
         self.btnStopStreamKeithley.setEnabled(True)
-        self.keithley_stream_thread.finished.connect(
+        self.keithley_stream_job.finished.connect(
             lambda: self.btnStopStreamKeithley.setEnabled(False)
         )
 
@@ -28,6 +28,7 @@ class NRXBlockThread(QThread):
         try:
             block = NRXPowerMeter(
                 host=state.NRX_IP,
+                port=state.NRX_PORT,
                 aperture_time=state.NRX_APER_TIME,
                 delay=0,
             )
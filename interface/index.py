@@ -14,6 +14,7 @@ from PySide6.QtWidgets import (
 from PySide6 import QtGui
 import PySide6QtAds as QtAds
 
+from api.Scontel.sis_block_connection import SisBlockConnectionPool
 from interface import style
 from interface.components.ExitMessageBox import ExitMessageBox
 from interface.views.measureDataTabWidget import MeasureDataTabWidget
@@ -21,6 +22,7 @@ from interface.views.setUpTabWidget import SetUpTabWidget
 import interface.windows  # noqa
 from store import store_configs
 from store.base import MeasureManager
+from store.journal import journal_writer
 from utils.functions import import_class
 
 
@@ -337,8 +339,10 @@ class App(QMainWindow):
         if button == QMessageBox.StandardButton.Yes:
             if reply.dumpDataCheck.isChecked():
                 MeasureManager.save_all()
+            journal_writer.close_all(remove=True)
             if reply.storeStateCheck.isChecked():
                 self.store_state()
+            SisBlockConnectionPool.close_all()
             for window in QApplication.topLevelWidgets():
                 window.close()
             self.dock_manager.deleteLater()
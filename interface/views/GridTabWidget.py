@@ -24,8 +24,11 @@ from interface.components.ui.DoubleSpinBox import DoubleSpinBox
 from interface.components.grid.GridManagingGroup import GridManagingGroup
 from interface.components.ui.Lines import HLine
 from store.base import MeasureModel, MeasureType
+from store.columns import Column
+from store.powerMeterUnitsModel import power_meter_unit_model
 from store.state import state
-from threads import Thread
+from threads import PlotStream, ProgressStream, Thread
+from utils.classes import ScanTimer
 from utils.dock import Dock
 from utils.functions import get_voltage_tn
 
@@ -66,9 +69,15 @@ class StepBiasPowerThread(Thread):
 
         self.nrx = NRXPowerMeter(
             host=state.NRX_IP,
+            port=state.NRX_PORT,
             aperture_time=state.NRX_APER_TIME,
             delay=0,
         )
+        self.timer = ScanTimer()
+        self.settler = self.block.get_bias_settler()
+        self.pv_stream = PlotStream(self.stream_pv)
+        self.iv_stream = PlotStream(self.stream_iv)
+        self.progress_stream = ProgressStream(self.progress)
 
     def get_results_format(self) -> Dict:
         if state.CHOPPER_SWITCH:
@@ -76,20 +85,8 @@ class StepBiasPowerThread(Thread):
                 "id": 0,
                 "step": state.GRID_ANGLE_STEP,
                 "angle": 0,
-                "hot": {
-                    "current_get": [],
-                    "voltage_set": [],
-                    "voltage_get": [],
-                    "power": [],
-                    "time": [],
-                },
-                "cold": {
-                    "current_get": [],
-                    "voltage_set": [],
-                    "voltage_get": [],
-                    "power": [],
-                    "time": [],
-                },
+                "hot": self.get_columns(),
+                "cold": self.get_columns(),
                 "y_factor": [],
                 "t_noise": [],
             }
@@ -97,11 +94,19 @@ class StepBiasPowerThread(Thread):
             "id": 0,
             "step": state.GRID_ANGLE_STEP,
             "angle": 0,
-            "current_get": [],
-            "voltage_set": [],
-            "voltage_get": [],
-            "power": [],
-            "time": [],
+            **self.get_columns(),
+        }
+
+    @staticmethod
+    def get_columns() -> Dict:
+        points = state.BLOCK_BIAS_VOLT_POINTS
+        return {
+            "current_get": Column(unit="A", capacity=points),
+            "voltage_set": Column(unit="V", capacity=points),
+            "voltage_get": Column(unit="V", capacity=points),
+            "power": Column(unit=power_meter_unit_model.val_pretty, capacity=points),
+            "time": Column(unit="s", capacity=points),
+            "settle_time": Column(unit="s", capacity=points),
         }
 
     def run(self):
@@ -124,6 +129,7 @@ class StepBiasPowerThread(Thread):
             chopper_manager.chopper.align_to_hot()
         self.motor.rotate(state.GRID_ANGLE_START)
         time.sleep(abs(state.GRID_ANGLE_START) / state.GRID_SPEED)
+        self.timer.start()
         for angle_step, angle in enumerate(angle_range):
             if not state.GRID_BLOCK_BIAS_POWER_MEASURE_THREAD:
                 break
@@ -135,6 +141,7 @@ class StepBiasPowerThread(Thread):
             if angle_step != 0:
                 self.motor.rotate(angle)
             time.sleep(abs(state.GRID_ANGLE_STEP) / state.GRID_SPEED)
+            self.timer.lap("rotate")
             for chopper_step in chopper_range:
                 chopper_state = None
                 if state.CHOPPER_SWITCH:
@@ -144,16 +151,28 @@ class StepBiasPowerThread(Thread):
                         break
 
                     self.block.set_bias_voltage(voltage_set)
-                    if voltage_step == 0:  # self.block need time to set first point
-                        time.sleep(0.5)
-                    time.sleep(state.BLOCK_BIAS_STEP_DELAY)
-                    voltage_get = self.block.get_bias_voltage()
-                    if not voltage_get:
+                    self.timer.lap("set")
+                    if state.BLOCK_SETTLE_ADAPTIVE:
+                        settle = self.block.settle_bias_voltage(
+                            voltage_set, self.settler
+                        )
+                        bias = settle.value
+                        settle_time = self.timer.lap("settle")
+                    else:
+                        if voltage_step == 0:  # self.block need time to set first point
+                            time.sleep(0.5)
+                        time.sleep(state.BLOCK_BIAS_STEP_DELAY)
+                        settle_time = self.timer.lap("settle")
+                        bias = self.block.get_bias_point()
+                    if bias is None:
+                        self.timer.lap("read")
                         continue
-                    current_get = self.block.get_bias_current()
-                    if not current_get:
+                    voltage_get, current_get = bias
+                    if not voltage_get or not current_get:
+                        self.timer.lap("read")
                         continue
                     power = self.nrx.get_power()
+                    self.timer.lap("read")
                     time_step = time.time() - initial_time
 
                     step = (
@@ -162,45 +181,47 @@ class StepBiasPowerThread(Thread):
                         + voltage_step
                         + 1
                     )
-                    progress = int(step / total_steps * 100)
-                    self.progress.emit(progress)
-
-                    self.stream_pv.emit(
-                        {
-                            "x": [voltage_get * 1e3],
-                            "y": [power],
-                            "new_plot": voltage_step == 0,
-                            "measure_id": self.measure.id,
-                            "legend_postfix": f"angle {angle} °",
-                        }
+                    self.progress_stream.set(step / total_steps * 100)
+                    self.pv_stream.add(
+                        voltage_get * 1e3,
+                        power,
+                        new_plot=voltage_step == 0,
+                        measure_id=self.measure.id,
+                        legend_postfix=f"angle {angle} °",
                     )
-                    self.stream_iv.emit(
-                        {
-                            "x": [voltage_get * 1e3],
-                            "y": [current_get * 1e6],
-                            "new_plot": voltage_step == 0,
-                            "measure_id": self.measure.id,
-                            "legend_postfix": f"angle {angle} °",
-                        }
+                    self.iv_stream.add(
+                        voltage_get * 1e3,
+                        current_get * 1e6,
+                        new_plot=voltage_step == 0,
+                        measure_id=self.measure.id,
+                        legend_postfix=f"angle {angle} °",
                     )
+                    self.timer.lap("emit")
                     if state.CHOPPER_SWITCH:
                         results[chopper_state]["voltage_set"].append(voltage_set)
                         results[chopper_state]["voltage_get"].append(voltage_get)
                         results[chopper_state]["current_get"].append(current_get)
                         results[chopper_state]["power"].append(power)
                         results[chopper_state]["time"].append(time_step)
+                        results[chopper_state]["settle_time"].append(settle_time)
                     else:
                         results["voltage_set"].append(voltage_set)
                         results["voltage_get"].append(voltage_get)
                         results["current_get"].append(current_get)
                         results["power"].append(power)
                         results["time"].append(time_step)
+                        results["settle_time"].append(settle_time)
 
                     self.measure.data[angle_step] = results
+                    self.timer.lap("store")
+                    self.timer.point()
 
+                self.pv_stream.flush()
+                self.iv_stream.flush()
                 if state.CHOPPER_SWITCH:
                     chopper_manager.chopper.path0()
                     time.sleep(2)
+                    self.timer.lap("chopper")
 
             if state.CHOPPER_SWITCH:
                 if len(results["hot"]["power"]) and len(results["cold"]["power"]):
@@ -229,6 +250,7 @@ class StepBiasPowerThread(Thread):
                             "legend_postfix": f"angle {angle} °",
                         }
                     )
+        self.timer.stop()
         if state.CHOPPER_SWITCH:
             chopper_manager.chopper.align_to_cold()
         self.pre_exit()
@@ -322,6 +344,13 @@ class GridTabWidget(QWidget):
         self.chopperSwitch.setText("Enable chopper Hot/Cold switching")
         self.chopperSwitch.setChecked(state.CHOPPER_SWITCH)
 
+        self.adaptiveSettle = QCheckBox(self)
+        self.adaptiveSettle.setText("Adaptive bias settle")
+        self.adaptiveSettle.setToolTip(
+            "Wait for voltage readback instead of fixed step delay"
+        )
+        self.adaptiveSettle.setChecked(state.BLOCK_SETTLE_ADAPTIVE)
+
         self.progress = QProgressBar(self)
         self.progress.setValue(0)
 
@@ -342,6 +371,7 @@ class GridTabWidget(QWidget):
         layout.addRow(self.voltStepDelayLabel, self.voltStepDelay)
         layout.addRow(HLine(self))
         layout.addRow(self.chopperSwitch)
+        layout.addRow(self.adaptiveSettle)
         layout.addRow(self.progress)
         layout.addRow(self.btnStartBiasPowerScan)
         layout.addRow(self.btnStopBiasPowerScan)
@@ -358,6 +388,7 @@ class GridTabWidget(QWidget):
         state.BLOCK_BIAS_VOLT_POINTS = int(self.voltPoints.value())
         state.BLOCK_BIAS_STEP_DELAY = self.voltStepDelay.value()
         state.CHOPPER_SWITCH = self.chopperSwitch.isChecked()
+        state.BLOCK_SETTLE_ADAPTIVE = self.adaptiveSettle.isChecked()
 
         self.bias_power_thread = StepBiasPowerThread()
 
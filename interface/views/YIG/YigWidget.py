@@ -23,7 +23,10 @@ from interface.components.ui.DoubleSpinBox import DoubleSpinBox
 from interface.components.yig.manage_yig import ManageYigWidget
 from store.state import state
 from store.base import MeasureModel
-from threads import Thread
+from store.columns import Column
+from store.powerMeterUnitsModel import power_meter_unit_model
+from threads import PlotStream, ProgressStream, Thread
+from utils.classes import ScanTimer
 from utils.dock import Dock
 from utils.functions import get_if_tn
 
@@ -39,9 +42,10 @@ class MeasureThread(Thread):
     def __init__(self, yig: YigType):
         super().__init__()
         self.yig = yig
-        self.ni = NiYIGManager()
+        self.ni = NiYIGManager(host=state.NI_IP)
         self.nrx = NRXPowerMeter(
             host=state.NRX_IP,
+            port=state.NRX_PORT,
             aperture_time=state.NRX_APER_TIME,
             delay=0,
         )
@@ -56,15 +60,25 @@ class MeasureThread(Thread):
         self.measure.save(finish=False)
 
         self.initial_freq = state.DIGITAL_YIG_MAP[yig].value
+        self.timer = ScanTimer()
+        self.result_stream = PlotStream(self.stream_result)
+        self.progress_stream = ProgressStream(self.progress)
 
     def get_results_format(self):
         if not state.CHOPPER_SWITCH:
             return []
-        return {
-            "hot": {"data": [], "power": [], "frequency": []},
-            "cold": {"data": [], "power": [], "frequency": []},
-            "diff": [],
-        }
+        points = int(state.NI_FREQ_POINTS)
+        results = {}
+        for chop_state in ("hot", "cold"):
+            results[chop_state] = {
+                "data": [],
+                "power": Column(
+                    unit=power_meter_unit_model.val_pretty, capacity=points
+                ),
+                "frequency": Column(unit="GHz", capacity=points),
+            }
+        results["diff"] = []
+        return results
 
     def run(self):
         results = self.get_results_format()
@@ -76,6 +90,7 @@ class MeasureThread(Thread):
         if state.CHOPPER_SWITCH:
             chopper_manager.chopper.align_to_hot()
         start_time = time.time()
+        self.timer.start()
         chopper_range = list(range(1, 3) if state.CHOPPER_SWITCH else range(1, 2))
         total_steps = state.NI_FREQ_POINTS * state.NRX_POINTS * len(chopper_range)
         for chopper_step in chopper_range:
@@ -88,13 +103,17 @@ class MeasureThread(Thread):
                     break
                 result = {
                     "frequency": freq,
-                    "power": [],
+                    "power": Column(
+                        unit=power_meter_unit_model.val_pretty,
+                        capacity=state.NRX_POINTS,
+                    ),
                     "power_mean": 0,
-                    "time": [],
+                    "time": Column(unit="s", capacity=state.NRX_POINTS),
                 }
                 if not state.NI_STABILITY_MEAS:
                     break
                 freq_set = self.ni.set_frequency(freq * 1e9)
+                self.timer.lap("set")
                 if freq_set:
                     state.DIGITAL_YIG_MAP[self.yig].value = freq_set
                 else:
@@ -102,9 +121,11 @@ class MeasureThread(Thread):
                 time.sleep(0.01)
                 if freq_step == 1:
                     time.sleep(0.4)
+                self.timer.lap("settle")
                 tm = time.time()
                 for power_step in range(1, state.NRX_POINTS + 1):
                     power = self.nrx.get_power()
+                    self.timer.lap("read")
                     result["power"].append(power)
                     result["time"].append(time.time() - tm)
                     step = (
@@ -114,18 +135,19 @@ class MeasureThread(Thread):
                     logger.info(
                         f"[{proc} %][Time {round(time.time() - start_time, 1)} s][Freq {freq}]"
                     )
-                    self.progress.emit(int(proc))
+                    self.progress_stream.set(proc)
+                    self.timer.lap("emit")
                 logger.info(f"Power {result['power'][-1]}")
                 power_mean = np.mean(result["power"])
                 result["power_mean"] = power_mean
-                self.stream_result.emit(
-                    {
-                        "x": [freq],
-                        "y": [power_mean],
-                        "new_plot": freq_step == 1,
-                        "measure_id": self.measure.id,
-                    }
+                self.timer.lap("store")
+                self.result_stream.add(
+                    freq,
+                    power_mean,
+                    new_plot=freq_step == 1,
+                    measure_id=self.measure.id,
                 )
+                self.timer.lap("emit")
 
                 if state.CHOPPER_SWITCH:
                     results[chop_state]["data"].append(result)
@@ -135,10 +157,16 @@ class MeasureThread(Thread):
                     results.append(result)
 
                 self.measure.data = results
+                self.timer.lap("store")
+                self.timer.point()
 
+            self.result_stream.flush()
             if state.CHOPPER_SWITCH:
                 chopper_manager.chopper.path0()
                 time.sleep(2)
+                self.timer.lap("chopper")
+
+        self.timer.stop()
 
         if state.CHOPPER_SWITCH:
             hot = np.array(results["hot"]["power"])
@@ -150,14 +178,14 @@ class MeasureThread(Thread):
                 tn = get_if_tn(hot_power=hot[:min_ind], cold_power=cold[:min_ind])
                 self.stream_y_results.emit(
                     {
-                        "x": results["hot"]["frequency"],
+                        "x": results["hot"]["frequency"].tolist(),
                         "y": y_factor.tolist(),
                         "measure_id": self.measure.id,
                     }
                 )
                 self.stream_tn_results.emit(
                     {
-                        "x": results["hot"]["frequency"],
+                        "x": results["hot"]["frequency"].tolist(),
                         "y": tn.tolist(),
                         "measure_id": self.measure.id,
                     }
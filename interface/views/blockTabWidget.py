@@ -17,7 +17,6 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, Signal, QThread, QSettings
 
-from api import SocketAdapter
 from interface.components.Scontel.sisDemagnetisationWidget import (
     SisDemagnetisationWidget,
 )
@@ -26,9 +25,12 @@ from store.state import state
 from api.Scontel.sis_block import SisBlock
 from interface.components.ui.DoubleSpinBox import DoubleSpinBox
 from store.base import MeasureModel, MeasureType
-from threads import Thread
+from store.columns import Column
+from threads import PlotStream, PollJob, ProgressStream, Thread
+from utils.classes import AdaptiveSweep, ScanTimer
 from utils.dock import Dock
 from utils.exceptions import DeviceConnectionError
+from utils.functions import sort_columns
 
 logger = logging.getLogger(__name__)
 
@@ -47,10 +49,11 @@ class UtilsMixin:
         except ValueError:
             logger.warning(f"Value {self.sisVoltageSet.value()} is not correct float")
             return
-        block.set_bias_voltage(voltage_to_set)
-        current = block.get_bias_current()
+        with block.session():
+            block.set_bias_voltage(voltage_to_set)
+            current = block.get_bias_current()
+            voltage = block.get_bias_voltage()
         self.sisCurrentGet.setText(f"{round(current * 1e6, 3)}")
-        voltage = block.get_bias_voltage()
         self.sisVoltageGet.setText(f"{round(voltage * 1e3, 3)}")
         block.disconnect()
 
@@ -67,8 +70,9 @@ class UtilsMixin:
         except ValueError:
             logger.warning(f"Value {self.ctrlCurrentSet.value()} is not correct float")
             return
-        block.set_ctrl_current(ctrlCurrentSet)
-        ctrlCurrentGet = block.get_ctrl_current()
+        with block.session():
+            block.set_ctrl_current(ctrlCurrentSet)
+            ctrlCurrentGet = block.get_ctrl_current()
         block.disconnect()
         self.ctrlCurrentGet.setText(f"{round(ctrlCurrentGet * 1e3, 3)}")
 
@@ -83,82 +87,96 @@ class BlockCalibrateThread(Thread):
             cadc4 = settings.value("SIS_Block_Cals/cadc4", None)
             vadc2 = settings.value("SIS_Block_Cals/vadc2", None)
             cadc2 = settings.value("SIS_Block_Cals/cadc2", None)
-            s = SocketAdapter(host="169.254.190.83", port=9876)
-
-            if vadc4:
-                vadc4 = [float(_) for _ in vadc4]
-                s.query(f"BIAS:DEV4:VADC {vadc4}")
-            if cadc4:
-                cadc4 = [float(_) for _ in cadc4]
-                s.query(f"BIAS:DEV4:CADC {cadc4}")
-
-            if vadc2:
-                vadc2 = [float(_) for _ in vadc2]
-                s.query(f"BIAS:DEV2:VADC {vadc2}")
-            if cadc2:
-                cadc2 = [float(_) for _ in cadc2]
-                s.query(f"BIAS:DEV2:CADC {cadc2}")
-
-            s.query("GENeral:DEVice2:WriteEEProm")
-            s.query("GENeral:DEVice4:WriteEEProm")
+            block = SisBlock(host=state.BLOCK_ADDRESS, port=state.BLOCK_PORT)
+            block.connection.ensure_connected()
+
+            with block.session():
+                if vadc4:
+                    vadc4 = [float(_) for _ in vadc4]
+                    block.manipulate(f"BIAS:DEV4:VADC {vadc4}")
+                if cadc4:
+                    cadc4 = [float(_) for _ in cadc4]
+                    block.manipulate(f"BIAS:DEV4:CADC {cadc4}")
+
+                if vadc2:
+                    vadc2 = [float(_) for _ in vadc2]
+                    block.manipulate(f"BIAS:DEV2:VADC {vadc2}")
+                if cadc2:
+                    cadc2 = [float(_) for _ in cadc2]
+                    block.manipulate(f"BIAS:DEV2:CADC {cadc2}")
+
+                block.manipulate("GENeral:DEVice2:WriteEEProm")
+                block.manipulate("GENeral:DEVice4:WriteEEProm")
         except DeviceConnectionError as e:
             logger.exception(f"{e}", exc_info=True)
         self.finished.emit()
 
 
-class BlockStreamThread(QThread):
+class BlockStreamJob(PollJob):
     cl_current = Signal(float)
     bias_voltage = Signal(float)
     bias_current = Signal(float)
     plot_data = Signal(dict)
 
+    period = 0.2
+    priority = 1
+
     def __init__(self, stream_plot: bool = False):
         self.stream_plot = stream_plot
-        super().__init__()
+        super().__init__(key=f"SisBlock:{state.BLOCK_ADDRESS}:{state.BLOCK_PORT}")
+        self.block = None
+        self.i = 1
 
-    def run(self):
-        block = SisBlock(
-            host=state.BLOCK_ADDRESS,
-            port=state.BLOCK_PORT,
-            bias_dev=state.BLOCK_BIAS_DEV,
-            ctrl_dev=state.BLOCK_CTRL_DEV,
-        )
-        block.connect()
-        i = 1
-        while 1:
-            if not state.BLOCK_STREAM_THREAD:
-                break
-            time.sleep(0.2)
-
-            bias_voltage = block.get_bias_voltage()
-            if bias_voltage:
-                self.bias_voltage.emit(bias_voltage)
-
-            bias_current = block.get_bias_current()
-            if bias_current:
-                self.bias_current.emit(bias_current)
-
-            if i % 2 == 0:
-                cl_current = block.get_ctrl_current()
-                if cl_current:
-                    self.cl_current.emit(cl_current)
-
-            if self.stream_plot and bias_voltage and bias_current:
-                self.plot_data.emit(
-                    {
-                        "x": [bias_voltage * 1e3],
-                        "y": [bias_current * 1e6],
-                        "new_plot": i == 1,
-                    }
-                )
+    def setup(self) -> bool:
+        try:
+            self.block = SisBlock(
+                host=state.BLOCK_ADDRESS,
+                port=state.BLOCK_PORT,
+                bias_dev=state.BLOCK_BIAS_DEV,
+                ctrl_dev=state.BLOCK_CTRL_DEV,
+            )
+            if not self.block.connect():
+                return False
+        except DeviceConnectionError:
+            return False
+        self.i = 1
+        return True
+
+    def poll(self) -> bool:
+        if not state.BLOCK_STREAM_THREAD:
+            return False
+
+        bias_voltage = self.block.get_bias_voltage()
+        if bias_voltage:
+            self.bias_voltage.emit(bias_voltage)
+
+        bias_current = self.block.get_bias_current()
+        if bias_current:
+            self.bias_current.emit(bias_current)
+
+        if self.i % 2 == 0:
+            cl_current = self.block.get_ctrl_current()
+            if cl_current:
+                self.cl_current.emit(cl_current)
+
+        if self.stream_plot and bias_voltage and bias_current:
+            self.plot_data.emit(
+                {
+                    "x": [bias_voltage * 1e3],
+                    "y": [bias_current * 1e6],
+                    "new_plot": self.i == 1,
+                }
+            )
 
-            i += 1
+        self.i += 1
+        return True
 
-        block.disconnect()
+    def pre_exit(self, *args, **kwargs):
+        if self.block is not None:
+            self.block.disconnect()
 
     def terminate(self):
         super().terminate()
-        logger.info(f"[{self.__class__.__name__}.terminate] Terminated")
         state.BLOCK_STREAM_THREAD = False
 
 
@@ -167,6 +185,10 @@ class BlockCLScanThread(QThread):
     stream_result = Signal(dict)
     progress = Signal(int)
 
+    def __init__(self):
+        super().__init__()
+        self.timer = ScanTimer()
+
     def run(self):
         block = SisBlock(
             host=state.BLOCK_ADDRESS,
@@ -175,11 +197,14 @@ class BlockCLScanThread(QThread):
             ctrl_dev=state.BLOCK_CTRL_DEV,
         )
         block.connect()
+        points = state.BLOCK_CTRL_POINTS
         results = {
-            "ctrl_i_set": [],
-            "ctrl_i_get": [],
-            "bias_i": [],
+            "ctrl_i_set": Column(unit="mA", capacity=points),
+            "ctrl_i_get": Column(unit="mA", capacity=points),
+            "bias_i": Column(unit="uA", capacity=points),
+            "settle_time": Column(unit="s", capacity=points),
         }
+        settler = block.get_ctrl_settler()
         ctrl_i_range = np.linspace(
             state.BLOCK_CTRL_CURR_FROM / 1e3,
             state.BLOCK_CTRL_CURR_TO / 1e3,
@@ -192,38 +217,55 @@ class BlockCLScanThread(QThread):
             measure_type=MeasureType.CL_CURVE, data={}
         )
         measure.save(False)
+        stream = PlotStream(self.stream_result)
+        progress = ProgressStream(self.progress)
+        self.timer.start()
         for ctrl_i in ctrl_i_range:
             if not state.BLOCK_CTRL_SCAN_THREAD:
                 break
             proc = round((i / state.BLOCK_CTRL_POINTS) * 100, 2)
             results["ctrl_i_set"].append(ctrl_i * 1e3)
             block.set_ctrl_current(ctrl_i)
-            if i == 0:
-                time.sleep(1)
-            time.sleep(state.BLOCK_CTRL_STEP_DELAY)
-            ctrl_current = block.get_ctrl_current() * 1e3
+            self.timer.lap("set")
+            if state.BLOCK_SETTLE_ADAPTIVE:
+                settle = block.settle_ctrl_current(ctrl_i, settler)
+                ctrl_current = settle.value
+                settle_time = self.timer.lap("settle")
+            else:
+                if i == 0:
+                    time.sleep(1)
+                time.sleep(state.BLOCK_CTRL_STEP_DELAY)
+                settle_time = self.timer.lap("settle")
+                ctrl_current = block.get_ctrl_current()
             if not ctrl_current:
                 continue
+            ctrl_current *= 1e3
             bias_current = block.get_bias_current() * 1e6
+            self.timer.lap("read")
             if not bias_current:
                 continue
             results["ctrl_i_get"].append(ctrl_current)
             results["bias_i"].append(bias_current)
-            self.stream_result.emit(
-                {
-                    "x": [ctrl_current],
-                    "y": [bias_current],
-                    "new_plot": i == 0,
-                    "measure_id": measure.id,
-                }
+            results["settle_time"].append(settle_time)
+            self.timer.lap("store")
+            stream.add(
+                ctrl_current, bias_current, new_plot=i == 0, measure_id=measure.id
             )
+            self.timer.lap("emit")
             delta_t = datetime.now() - start_t
             logger.info(
                 f"[scan_ctrl_current] Proc {proc} %; Time {delta_t}; I set {ctrl_i * 1e3}"
             )
             measure.data = results
             i += 1
-            self.progress.emit(int(proc))
+            self.timer.lap("store")
+            progress.set(proc)
+            self.timer.lap("emit")
+            self.timer.point()
+        stream.flush()
+        self.timer.stop()
+        if state.BLOCK_SETTLE_ADAPTIVE:
+            logger.info(f"[scan_ctrl_current] Settle: {settler.stats}")
         block.set_ctrl_current(initial_ctrl_i)
         self.results.emit(results)
         block.disconnect()
@@ -253,6 +295,10 @@ class BlockBIASScanThread(QThread):
     stream_result = Signal(dict)
     progress = Signal(int)
 
+    def __init__(self):
+        super().__init__()
+        self.timer = ScanTimer()
+
     def run(self):
         block = SisBlock(
             host=state.BLOCK_ADDRESS,
@@ -261,56 +307,87 @@ class BlockBIASScanThread(QThread):
             ctrl_dev=state.BLOCK_CTRL_DEV,
         )
         block.connect()
+        points = state.BLOCK_BIAS_VOLT_POINTS
         results = {
-            "i_get": [],
-            "v_set": [],
-            "v_get": [],
-            "time": [],
+            "i_get": Column(unit="uA", capacity=points),
+            "v_set": Column(unit="mV", capacity=points),
+            "v_get": Column(unit="mV", capacity=points),
+            "time": Column(unit="s", capacity=points),
+            "settle_time": Column(unit="s", capacity=points),
         }
+        settler = block.get_bias_settler()
         initial_v = block.get_bias_voltage()
-        v_range = np.linspace(
-            state.BLOCK_BIAS_VOLT_FROM * 1e-3,
-            state.BLOCK_BIAS_VOLT_TO * 1e-3,
-            state.BLOCK_BIAS_VOLT_POINTS,
-        )
+        v_range = block.get_bias_range()
+        adaptive = isinstance(v_range, AdaptiveSweep)
         start_t = datetime.now()
         i = 0
         measure = MeasureModel.objects.create(
             measure_type=MeasureType.IV_CURVE, data={}
         )
         measure.save(False)
+        stream = PlotStream(self.stream_result)
+        progress = ProgressStream(self.progress)
+        self.timer.start()
         for v_set in v_range:
             if not state.BLOCK_BIAS_SCAN_THREAD:
                 break
             proc = round((i / state.BLOCK_BIAS_VOLT_POINTS) * 100, 2)
             block.set_bias_voltage(v_set)
-            if i == 0:
-                time.sleep(1)
-            time.sleep(state.BLOCK_CTRL_STEP_DELAY)
-            v_get = block.get_bias_voltage()
-            if not v_get:
+            self.timer.lap("set")
+            if state.BLOCK_SETTLE_ADAPTIVE:
+                settle = block.settle_bias_voltage(v_set, settler)
+                bias = settle.value
+                settle_time = self.timer.lap("settle")
+            else:
+                if i == 0:
+                    time.sleep(1)
+                time.sleep(state.BLOCK_CTRL_STEP_DELAY)
+                settle_time = self.timer.lap("settle")
+                bias = block.get_bias_point()
+                self.timer.lap("read")
+            if bias is None:
                 continue
-            i_get = block.get_bias_current()
-            if not i_get:
+            v_get, i_get = bias
+            if not v_get or not i_get:
                 continue
             results["v_get"].append(v_get * 1e3)
             results["v_set"].append(v_set * 1e3)
             results["i_get"].append(i_get * 1e6)
-            self.stream_result.emit(
-                {
-                    "x": [v_get * 1e3],
-                    "y": [i_get * 1e6],
-                    "new_plot": i == 0,
-                    "measure_id": measure.id,
-                }
+            results["settle_time"].append(settle_time)
+            if adaptive:
+                v_range.add(v_set, i_get)
+            self.timer.lap("store")
+            stream.add(
+                v_get * 1e3,
+                i_get * 1e6,
+                new_plot=i == 0,
+                measure_id=measure.id,
+                sort=adaptive,
             )
+            self.timer.lap("emit")
             delta_t = datetime.now() - start_t
             results["time"].append(delta_t.total_seconds())
             measure.data = results
             i += 1
-            self.progress.emit(int(proc))
+            self.timer.lap("store")
+            progress.set(proc)
+            self.timer.lap("emit")
+            self.timer.point()
             logger.info(f"[scan_bias] Proc {proc} %; Time {delta_t}; V_set {v_set}")
+        stream.flush()
+        self.timer.stop()
+        if adaptive:
+            results = sort_columns(
+                results, "v_set", reverse=v_range.stop < v_range.start
+            )
+            results["sweep"] = v_range.dict()
+            measure.data = results
+            logger.info(f"[scan_bias] Adaptive sweep: {results['sweep']}")
         block.set_bias_voltage(initial_v)
+        logger.info(f"[scan_bias] Block transactions: {block.stats}")
+        logger.info(f"[scan_bias] Timings: {self.timer}")
+        if state.BLOCK_SETTLE_ADAPTIVE:
+            logger.info(f"[scan_bias] Settle: {settler.stats}")
         block.disconnect()
         measure.save()
         self.results.emit(results)
@@ -376,6 +453,7 @@ class BlockTabWidget(QWidget, UtilsMixin):
             y=results.get("y", []),
             new_plot=results.get("new_plot", True),
             measure_id=results.get("measure_id"),
+            sort=results.get("sort", False),
         )
         self.biasGraphDockWidget.widget().show()
 
@@ -388,6 +466,7 @@ class BlockTabWidget(QWidget, UtilsMixin):
         state.BLOCK_CTRL_POINTS = int(self.ctrlPoints.value())
         state.BLOCK_CTRL_SCAN_THREAD = True
         state.BLOCK_CTRL_STEP_DELAY = self.ctrlStepDelay.value()
+        state.BLOCK_SETTLE_ADAPTIVE = self.ctrlAdaptiveSettle.isChecked()
 
         self.ctrlGraphDockWidget = Dock.ex.dock_manager.findDockWidget("I-CL curve")
 
@@ -459,6 +538,9 @@ class BlockTabWidget(QWidget, UtilsMixin):
         state.BLOCK_BIAS_VOLT_TO = self.biasVoltageTo.value()
         state.BLOCK_BIAS_VOLT_POINTS = int(self.biasPoints.value())
         state.BLOCK_BIAS_SCAN_THREAD = True
+        state.BLOCK_SETTLE_ADAPTIVE = self.biasAdaptiveSettle.isChecked()
+        state.BLOCK_BIAS_SWEEP_ADAPTIVE = self.biasAdaptiveSweep.isChecked()
+        state.BLOCK_BIAS_ADAPTIVE_COARSE_POINTS = int(self.biasCoarsePoints.value())
 
         self.biasGraphDockWidget = Dock.ex.dock_manager.findDockWidget("I-V curve")
 
@@ -484,37 +566,37 @@ class BlockTabWidget(QWidget, UtilsMixin):
         self.block_bias_scan_thread.quit()
 
     def startStreamBlock(self):
-        self.stream_thread = BlockStreamThread(stream_plot=self.plotStream.isChecked())
+        self.stream_job = BlockStreamJob(stream_plot=self.plotStream.isChecked())
 
-        self.stream_thread.cl_current.connect(
+        self.stream_job.cl_current.connect(
             lambda x: self.ctrlCurrentGet.setText(f"{round(x * 1e3, 3)}")
         )
-        self.stream_thread.bias_current.connect(
+        self.stream_job.bias_current.connect(
             lambda x: self.sisCurrentGet.setText(f"{round(x * 1e6, 3)}")
         )
-        self.stream_thread.bias_voltage.connect(
+        self.stream_job.bias_voltage.connect(
             lambda x: self.sisVoltageGet.setText(f"{round(x * 1e3, 3)}")
         )
 
-        self.stream_thread.plot_data.connect(self.show_bias_graph_window)
+        self.stream_job.plot_data.connect(self.show_bias_graph_window)
 
         self.biasGraphDockWidget = Dock.ex.dock_manager.findDockWidget("I-V curve")
 
         state.BLOCK_STREAM_THREAD = True
-        self.stream_thread.start()
+        self.stream_job.start()
 
         self.btnStartStreamBlock.setEnabled(False)
-        self.stream_thread.finished.connect(
+        self.stream_job.finished.connect(
             lambda: self.btnStartStreamBlock.setEnabled(True)
         )
 
         self.btnStopStreamBlock.setEnabled(True)
-        self.stream_thread.finished.connect(
+        self.stream_job.finished.connect(
             lambda: self.btnStopStreamBlock.setEnabled(False)
         )
 
     def stopStreamBlock(self):
-        self.stream_thread.terminate()
+        self.stream_job.terminate()
 
     def createGroupMonitor(self):
         self.groupMonitor = QGroupBox("Block Monitor")
@@ -678,6 +760,11 @@ class BlockTabWidget(QWidget, UtilsMixin):
         self.ctrlStepDelay.setRange(0, 10)
         self.ctrlStepDelay.setDecimals(2)
         self.ctrlStepDelay.setValue(state.BLOCK_CTRL_STEP_DELAY)
+        self.ctrlAdaptiveSettle = QCheckBox("Adaptive settle", self)
+        self.ctrlAdaptiveSettle.setToolTip(
+            "Wait for current readback instead of fixed step delay"
+        )
+        self.ctrlAdaptiveSettle.setChecked(state.BLOCK_SETTLE_ADAPTIVE)
 
         self.ctrlScanProgress = QProgressBar(self)
         self.ctrlScanProgress.setValue(0)
@@ -696,9 +783,10 @@ class BlockTabWidget(QWidget, UtilsMixin):
         layout.addWidget(self.ctrlPoints, 3, 1)
         layout.addWidget(self.ctrlStepDelayLabel, 4, 0)
         layout.addWidget(self.ctrlStepDelay, 4, 1)
-        layout.addWidget(self.ctrlScanProgress, 5, 0, 1, 2)
-        layout.addWidget(self.btnCTRLScan, 6, 0)
-        layout.addWidget(self.btnCTRLStopScan, 6, 1)
+        layout.addWidget(self.ctrlAdaptiveSettle, 5, 0, 1, 2)
+        layout.addWidget(self.ctrlScanProgress, 6, 0, 1, 2)
+        layout.addWidget(self.btnCTRLScan, 7, 0)
+        layout.addWidget(self.btnCTRLStopScan, 7, 1)
 
         self.groupCTRLScan.setLayout(layout)
 
@@ -727,6 +815,22 @@ class BlockTabWidget(QWidget, UtilsMixin):
         self.biasPoints.setDecimals(0)
         self.biasPoints.setMaximum(state.BLOCK_BIAS_VOLT_POINTS_MAX)
         self.biasPoints.setValue(state.BLOCK_BIAS_VOLT_POINTS)
+        self.biasAdaptiveSettle = QCheckBox("Adaptive settle", self)
+        self.biasAdaptiveSettle.setToolTip(
+            "Wait for voltage readback instead of fixed step delay"
+        )
+        self.biasAdaptiveSettle.setChecked(state.BLOCK_SETTLE_ADAPTIVE)
+        self.biasAdaptiveSweep = QCheckBox("Adaptive sampling", self)
+        self.biasAdaptiveSweep.setToolTip(
+            "Coarse pass, then refine where I-V curve bends. Points count is the limit"
+        )
+        self.biasAdaptiveSweep.setChecked(state.BLOCK_BIAS_SWEEP_ADAPTIVE)
+        self.biasCoarsePointsLabel = QLabel(self)
+        self.biasCoarsePointsLabel.setText("Coarse points count")
+        self.biasCoarsePoints = DoubleSpinBox(self)
+        self.biasCoarsePoints.setDecimals(0)
+        self.biasCoarsePoints.setRange(3, state.BLOCK_BIAS_VOLT_POINTS_MAX)
+        self.biasCoarsePoints.setValue(state.BLOCK_BIAS_ADAPTIVE_COARSE_POINTS)
 
         self.biasScanProgress = QProgressBar(self)
         self.biasScanProgress.setValue(0)
@@ -744,8 +848,12 @@ class BlockTabWidget(QWidget, UtilsMixin):
         layout.addWidget(self.biasVoltageTo, 2, 1)
         layout.addWidget(self.biasPointsLabel, 3, 0)
         layout.addWidget(self.biasPoints, 3, 1)
-        layout.addWidget(self.biasScanProgress, 4, 0, 1, 2)
-        layout.addWidget(self.btnBiasScan, 5, 0)
-        layout.addWidget(self.btnBiasStopScan, 5, 1)
+        layout.addWidget(self.biasAdaptiveSettle, 4, 0)
+        layout.addWidget(self.biasAdaptiveSweep, 4, 1)
+        layout.addWidget(self.biasCoarsePointsLabel, 5, 0)
+        layout.addWidget(self.biasCoarsePoints, 5, 1)
+        layout.addWidget(self.biasScanProgress, 6, 0, 1, 2)
+        layout.addWidget(self.btnBiasScan, 7, 0)
+        layout.addWidget(self.btnBiasStopScan, 7, 1)
 
         self.groupBiasScan.setLayout(layout)
@@ -1,6 +1,14 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHeaderView
+from PySide6.QtCore import QSortFilterProxyModel, Qt
+from PySide6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHeaderView,
+    QHBoxLayout,
+    QLineEdit,
+)
 
 from interface.components.TableView import TableView
+from interface.components.ui.Button import Button
 from store.base import MeasureTableModel, MeasureManager
 
 
@@ -11,9 +19,30 @@ class MeasureDataTabWidget(QWidget):
 
         self.tableView = None
         self.model = None
+        self.proxyModel = None
         self.createTableView()
+        self.createButtons()
+        self.layout.addLayout(self.buttonsLayout)
         self.layout.addWidget(self.tableView)
 
+    def createButtons(self):
+        self.buttonsLayout = QHBoxLayout()
+        self.btnOpen = Button("Open measure")
+        self.btnOpen.setToolTip("Open measure saved to JSON or NPZ archive")
+        self.btnOpen.clicked.connect(lambda: MeasureManager.open_file())
+        self.buttonsLayout.addWidget(self.btnOpen)
+        self.btnHistory = Button("Load history")
+        self.btnHistory.setToolTip(
+            "Add measures of previous sessions from catalog, data is read on demand"
+        )
+        self.btnHistory.clicked.connect(lambda: MeasureManager.load_history())
+        self.buttonsLayout.addWidget(self.btnHistory)
+        self.buttonsLayout.addStretch()
+        self.searchLine = QLineEdit(self)
+        self.searchLine.setPlaceholderText("Search measure")
+        self.searchLine.textChanged.connect(self.proxyModel.setFilterFixedString)
+        self.buttonsLayout.addWidget(self.searchLine)
+
     def createTableView(self):
         self.tableView = TableView(self)
         self.tableView.horizontalHeader().setSectionResizeMode(
@@ -21,5 +50,13 @@ class MeasureDataTabWidget(QWidget):
         )
         self.tableView.setAutoScroll(True)
         self.model = MeasureTableModel()
-        MeasureManager.table = self.model
-        self.tableView.setModel(self.model)
+        # rows are sorted by column and filtered by text of any column
+        self.proxyModel = QSortFilterProxyModel(self)
+        self.proxyModel.setSourceModel(self.model)
+        self.proxyModel.setSortRole(MeasureTableModel.SortRole)
+        self.proxyModel.setFilterKeyColumn(-1)
+        self.proxyModel.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.proxyModel.setDynamicSortFilter(True)
+        self.tableView.setModel(self.proxyModel)
+        self.tableView.setSortingEnabled(True)
+        self.tableView.sortByColumn(0, Qt.SortOrder.AscendingOrder)
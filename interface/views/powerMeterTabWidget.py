@@ -1,7 +1,6 @@
 import time
 import logging
 
-import numpy as np
 from PySide6.QtCore import Signal, Qt
 from PySide6.QtWidgets import (
     QGroupBox,
@@ -19,14 +18,16 @@ from PySide6.QtWidgets import (
 from api.Chopper import chopper_manager
 from interface.components.ui.Button import Button
 from store.base import MeasureModel, MeasureType
+from store.columns import Column
 from store.powerMeterUnitsModel import power_meter_unit_model
 from store.state import state
 from api.Scontel.sis_block import SisBlock
 from api.RohdeSchwarz.power_meter_nrx import NRXPowerMeter
 from interface.components.ui.DoubleSpinBox import DoubleSpinBox
-from threads import Thread
+from threads import PlotStream, ProgressStream, Thread
+from utils.classes import AdaptiveSweep, ScanTimer
 from utils.dock import Dock
-from utils.functions import get_voltage_tn
+from utils.functions import get_voltage_tn, sort_columns
 
 
 logger = logging.getLogger(__name__)
@@ -38,10 +39,14 @@ class NRXBlockStreamThread(Thread):
     def run(self):
         nrx = NRXPowerMeter(
             host=state.NRX_IP,
+            port=state.NRX_PORT,
             aperture_time=state.NRX_APER_TIME,
             delay=0,
         )
-        data = {"power": [], "time": []}
+        data = {
+            "power": Column(unit=power_meter_unit_model.val_pretty),
+            "time": Column(unit="s"),
+        }
         if state.NRX_STREAM_STORE_DATA:
             measure = MeasureModel.objects.create(
                 measure_type=MeasureType.POWER_STREAM, data=data
@@ -84,6 +89,7 @@ class BiasPowerThread(Thread):
         super().__init__()
         self.nrx = NRXPowerMeter(
             host=state.NRX_IP,
+            port=state.NRX_PORT,
             aperture_time=state.NRX_APER_TIME,
             delay=0,
         )
@@ -102,93 +108,99 @@ class BiasPowerThread(Thread):
         self.measure = MeasureModel.objects.create(measure_type=measure_type, data={})
         self.measure.save(False)
         self.initial_v = self.block.get_bias_voltage()
+        self.timer = ScanTimer()
+        self.settler = self.block.get_bias_settler()
+        self.power_stream = PlotStream(self.stream_power)
+        self.iv_stream = PlotStream(self.stream_iv)
+        self.progress_stream = ProgressStream(self.progress)
 
     def get_results_format(self):
         if state.CHOPPER_SWITCH:
             return {
-                "hot": {
-                    "current_get": [],
-                    "voltage_set": [],
-                    "voltage_get": [],
-                    "power": [],
-                    "time": [],
-                },
-                "cold": {
-                    "current_get": [],
-                    "voltage_set": [],
-                    "voltage_get": [],
-                    "power": [],
-                    "time": [],
-                },
+                "hot": self.get_columns(),
+                "cold": self.get_columns(),
                 "y_factor": [],
                 "t_noise": [],
             }
         else:
-            return {
-                "current_get": [],
-                "voltage_set": [],
-                "voltage_get": [],
-                "power": [],
-                "time": [],
-            }
+            return self.get_columns()
+
+    @staticmethod
+    def get_columns():
+        points = state.BLOCK_BIAS_VOLT_POINTS
+        return {
+            "current_get": Column(unit="A", capacity=points),
+            "voltage_set": Column(unit="V", capacity=points),
+            "voltage_get": Column(unit="V", capacity=points),
+            "power": Column(unit=power_meter_unit_model.val_pretty, capacity=points),
+            "time": Column(unit="s", capacity=points),
+            "settle_time": Column(unit="s", capacity=points),
+        }
 
     def run(self):
         results = self.get_results_format()
-        v_range = np.linspace(
-            state.BLOCK_BIAS_VOLT_FROM * 1e-3,
-            state.BLOCK_BIAS_VOLT_TO * 1e-3,
-            state.BLOCK_BIAS_VOLT_POINTS,
-        )
+        v_range = self.block.get_bias_range()
+        adaptive = isinstance(v_range, AdaptiveSweep)
         chopper_range = range(2) if state.CHOPPER_SWITCH else range(1)
-        total_steps = len(chopper_range) * len(v_range)
+        total_steps = len(chopper_range) * state.BLOCK_BIAS_VOLT_POINTS
         if state.CHOPPER_SWITCH:
             chopper_manager.chopper.align_to_hot()
         initial_time = time.time()
+        self.timer.start()
         for chopper_step in chopper_range:
             chopper_state = None
             if state.CHOPPER_SWITCH:
                 chopper_state = "hot" if chopper_step == 0 else "cold"
-            for voltage_step, voltage_set in enumerate(v_range):
+            # Cold pass repeats the voltage grid of the hot one
+            voltages = list(v_range.grid) if adaptive and chopper_step else v_range
+            for voltage_step, voltage_set in enumerate(voltages):
                 if not state.BLOCK_BIAS_POWER_MEASURE_THREAD:
                     break
 
                 self.block.set_bias_voltage(voltage_set)
-
-                if voltage_step == 0:
-                    time.sleep(0.5)
-                    initial_time = time.time()
-
-                time.sleep(state.BLOCK_BIAS_STEP_DELAY)
-                voltage_get = self.block.get_bias_voltage()
-                if not voltage_get:
+                self.timer.lap("set")
+
+                if state.BLOCK_SETTLE_ADAPTIVE:
+                    settle = self.block.settle_bias_voltage(voltage_set, self.settler)
+                    bias = settle.value
+                    settle_time = self.timer.lap("settle")
+                    if voltage_step == 0:
+                        initial_time = time.time()
+                else:
+                    if voltage_step == 0:
+                        time.sleep(0.5)
+                        initial_time = time.time()
+                    time.sleep(state.BLOCK_BIAS_STEP_DELAY)
+                    settle_time = self.timer.lap("settle")
+                    bias = self.block.get_bias_point()
+                if bias is None:
+                    self.timer.lap("read")
                     continue
-                current_get = self.block.get_bias_current()
-                if not current_get:
+                voltage_get, current_get = bias
+                if not voltage_get or not current_get:
+                    self.timer.lap("read")
                     continue
                 power = self.nrx.get_power()
+                self.timer.lap("read")
                 time_step = time.time() - initial_time
 
-                step = chopper_step * len(v_range) + voltage_step + 1
-                progress = int(step / total_steps * 100)
-                self.progress.emit(progress)
-
-                self.stream_power.emit(
-                    {
-                        "x": [voltage_get * 1e3],
-                        "y": [power],
-                        "new_plot": voltage_step == 0,
-                        "measure_id": self.measure.id,
-                    }
+                step = chopper_step * state.BLOCK_BIAS_VOLT_POINTS + voltage_step + 1
+                self.progress_stream.set(step / total_steps * 100)
+                self.power_stream.add(
+                    voltage_get * 1e3,
+                    power,
+                    new_plot=voltage_step == 0,
+                    measure_id=self.measure.id,
+                    sort=adaptive,
                 )
-
-                self.stream_iv.emit(
-                    {
-                        "x": [voltage_get * 1e3],
-                        "y": [current_get * 1e6],
-                        "new_plot": voltage_step == 0,
-                        "measure_id": self.measure.id,
-                    }
+                self.iv_stream.add(
+                    voltage_get * 1e3,
+                    current_get * 1e6,
+                    new_plot=voltage_step == 0,
+                    measure_id=self.measure.id,
+                    sort=adaptive,
                 )
+                self.timer.lap("emit")
 
                 if state.CHOPPER_SWITCH:
                     results[chopper_state]["voltage_set"].append(voltage_set)
@@ -196,18 +208,44 @@ class BiasPowerThread(Thread):
                     results[chopper_state]["current_get"].append(current_get)
                     results[chopper_state]["power"].append(power)
                     results[chopper_state]["time"].append(time_step)
+                    results[chopper_state]["settle_time"].append(settle_time)
                 else:
                     results["voltage_set"].append(voltage_set)
                     results["voltage_get"].append(voltage_get)
                     results["current_get"].append(current_get)
                     results["power"].append(power)
                     results["time"].append(time_step)
+                    results["settle_time"].append(settle_time)
+                if adaptive and not chopper_step:
+                    v_range.add(voltage_set, current_get, power)
 
                 self.measure.data = results
+                self.timer.lap("store")
+                self.timer.point()
 
+            self.power_stream.flush()
+            self.iv_stream.flush()
             if state.CHOPPER_SWITCH:
                 chopper_manager.chopper.path0()
                 time.sleep(2)
+                self.timer.lap("chopper")
+
+        self.timer.stop()
+
+        if adaptive:
+            reverse = v_range.stop < v_range.start
+            if state.CHOPPER_SWITCH:
+                for chopper_state in ("hot", "cold"):
+                    results[chopper_state] = sort_columns(
+                        results[chopper_state], "voltage_set", reverse=reverse
+                    )
+            else:
+                results = sort_columns(results, "voltage_set", reverse=reverse)
+            results["sweep"] = v_range.dict()
+            self.measure.data = results
+            logger.info(
+                f"[{self.__class__.__name__}.run] Adaptive sweep: {results['sweep']}"
+            )
 
         if state.CHOPPER_SWITCH:
             chopper_manager.chopper.align_to_cold()
@@ -402,6 +440,27 @@ class PowerMeterTabWidget(QWidget):
         self.chopperSwitch.setText("Enable chopper Hot/Cold switching")
         self.chopperSwitch.setChecked(state.CHOPPER_SWITCH)
 
+        self.adaptiveSettle = QCheckBox(self)
+        self.adaptiveSettle.setText("Adaptive bias settle")
+        self.adaptiveSettle.setToolTip(
+            "Wait for voltage readback instead of fixed step delay"
+        )
+        self.adaptiveSettle.setChecked(state.BLOCK_SETTLE_ADAPTIVE)
+
+        self.adaptiveSweep = QCheckBox(self)
+        self.adaptiveSweep.setText("Adaptive bias sampling")
+        self.adaptiveSweep.setToolTip(
+            "Coarse pass, then refine where I-V or P-V curve bends. Points count is the limit"
+        )
+        self.adaptiveSweep.setChecked(state.BLOCK_BIAS_SWEEP_ADAPTIVE)
+
+        self.coarsePointsLabel = QLabel(self)
+        self.coarsePointsLabel.setText("Coarse points count")
+        self.coarsePoints = DoubleSpinBox(self)
+        self.coarsePoints.setDecimals(0)
+        self.coarsePoints.setRange(3, state.BLOCK_BIAS_VOLT_POINTS_MAX)
+        self.coarsePoints.setValue(state.BLOCK_BIAS_ADAPTIVE_COARSE_POINTS)
+
         self.progress = QProgressBar(self)
         self.progress.setValue(0)
 
@@ -417,6 +476,9 @@ class PowerMeterTabWidget(QWidget):
         flayout.addRow(self.voltPointsLabel, self.voltPoints)
         flayout.addRow(self.voltStepDelayLabel, self.voltStepDelay)
         flayout.addRow(self.chopperSwitch)
+        flayout.addRow(self.adaptiveSettle)
+        flayout.addRow(self.adaptiveSweep)
+        flayout.addRow(self.coarsePointsLabel, self.coarsePoints)
         flayout.addRow(self.progress)
         hlayout.addWidget(self.btnStartBiasPowerScan)
         hlayout.addWidget(self.btnStopBiasPowerScan)
@@ -431,6 +493,9 @@ class PowerMeterTabWidget(QWidget):
         state.BLOCK_BIAS_VOLT_POINTS = int(self.voltPoints.value())
         state.BLOCK_BIAS_STEP_DELAY = self.voltStepDelay.value()
         state.CHOPPER_SWITCH = self.chopperSwitch.isChecked()
+        state.BLOCK_SETTLE_ADAPTIVE = self.adaptiveSettle.isChecked()
+        state.BLOCK_BIAS_SWEEP_ADAPTIVE = self.adaptiveSweep.isChecked()
+        state.BLOCK_BIAS_ADAPTIVE_COARSE_POINTS = int(self.coarsePoints.value())
 
         self.bias_power_thread = BiasPowerThread()
 
@@ -471,6 +536,7 @@ class PowerMeterTabWidget(QWidget):
             y=results.get("y", []),
             new_plot=results.get("new_plot", True),
             measure_id=results.get("measure_id"),
+            sort=results.get("sort", False),
         )
         self.biasPowerGraphWindow.widget().show()
 
@@ -482,6 +548,7 @@ class PowerMeterTabWidget(QWidget):
             y=results.get("y", []),
             new_plot=results.get("new_plot", True),
             measure_id=results.get("measure_id"),
+            sort=results.get("sort", False),
             legend_postfix=results.get("legend_postfix", ""),
         )
         self.biasCurrentGraphWindow.widget().show()
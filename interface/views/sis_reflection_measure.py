@@ -16,6 +16,7 @@ from PySide6.QtWidgets import (
     QFormLayout,
     QHBoxLayout,
     QComboBox,
+    QCheckBox,
 )
 
 from api import VNABlock
@@ -26,8 +27,10 @@ from interface.components.ui.Lines import HLine
 from interface.components.ui.MultipleComboBox import MultipleComboBox
 from store import RohdeSchwarzVnaZva67Manager
 from store.base import MeasureModel
+from store.columns import Column
 from store.state import state
 from threads import Thread
+from utils.classes import ScanTimer
 from utils.exceptions import DeviceConnectionError
 
 
@@ -52,6 +55,7 @@ class BiasReflectionThread(Thread):
         stop_voltage: float,
         voltage_points: int,
         step_delay: float,
+        single_sweep: bool = False,
     ):
         super().__init__()
         self.cid_vna = cid_vna
@@ -67,18 +71,30 @@ class BiasReflectionThread(Thread):
         self.stop_voltage = stop_voltage
         self.voltage_points = int(voltage_points)
         self.step_delay = step_delay
+        self.single_sweep = single_sweep
         self.vna = None
         self.block = None
+        self.timer = ScanTimer()
 
         self.measure = MeasureModel.objects.create(
             measure_type=MeasureModel.type_class.SV_VNA,
             data={
-                "i_get": [],
-                "v_set": [],
-                "v_get": [],
-                "params": {k: [] for k in self.vna_parameters},
-                "frequencies": [],
-                "time": [],
+                "i_get": Column(unit="uA", capacity=self.voltage_points),
+                "v_set": Column(unit="mV", capacity=self.voltage_points),
+                "v_get": Column(unit="mV", capacity=self.voltage_points),
+                # Rows are samples of complex VNA traces at every bias point
+                "params": {
+                    k: Column(
+                        dtype=np.complex128,
+                        shape=(self.vna_samples_count, self.frequency_points),
+                        capacity=self.voltage_points,
+                    )
+                    for k in self.vna_parameters
+                },
+                "frequencies": Column(unit="Hz", capacity=self.frequency_points),
+                "time": Column(
+                    unit="s", capacity=self.voltage_points * len(self.vna_parameters)
+                ),
             },
         )
         self.measure.save(False)
@@ -97,6 +113,10 @@ class BiasReflectionThread(Thread):
         self.vna.set_channel_format("COMP")
         self.vna.set_average_count(self.vna_average_count)
         self.vna.set_average_status(True)
+        if self.single_sweep:
+            self.vna.set_traces(self.vna_parameters)
+        # every trace is read after its own averaged sweep is completed (*OPC?)
+        self.vna.set_single_sweep(True, count=self.vna_average_count)
 
         self.block = SisBlock(
             host=state.BLOCK_ADDRESS,
@@ -106,15 +126,13 @@ class BiasReflectionThread(Thread):
         )
         self.block.connect()
 
-        frequencies = list(
-            np.linspace(
-                self.start_frequency * 1e9,
-                self.stop_frequency * 1e9,
-                self.frequency_points,
-            )
+        frequencies = np.linspace(
+            self.start_frequency * 1e9,
+            self.stop_frequency * 1e9,
+            self.frequency_points,
         )
 
-        self.measure.data["frequencies"] = frequencies
+        self.measure.data["frequencies"].extend(frequencies)
 
         initial_v = self.block.get_bias_voltage()
         v_range = np.linspace(
@@ -124,35 +142,57 @@ class BiasReflectionThread(Thread):
         )
         proc = 0
         start_t = datetime.now()
+        self.timer.start()
         for i, v_set in enumerate(v_range):
             if not state.BIAS_REFL_SCAN_THREAD:
                 break
             self.block.set_bias_voltage(v_set)
+            self.timer.lap("set")
             if i == 0:
                 time.sleep(1)
-            v_get = self.block.get_bias_voltage()
-            if not v_get:
+            self.timer.lap("settle")
+            bias = self.block.get_bias_point()
+            self.timer.lap("read")
+            if bias is None:
                 continue
-            i_get = self.block.get_bias_current()
-            if not i_get:
+            v_get, i_get = bias
+            if not v_get or not i_get:
                 continue
 
             self.measure.data["v_get"].append(v_get * 1e3)
             self.measure.data["v_set"].append(v_set * 1e3)
             self.measure.data["i_get"].append(i_get * 1e6)
 
+            self.timer.lap("store")
+
+            if self.single_sweep:
+                self.measure_single_sweep(i, v_set, start_t)
+                self.timer.point()
+                continue
+
             for p_i, param in enumerate(self.vna_parameters):
                 self.vna.set_parameter(param)
                 self.vna.set_channel_format("COMP")
-                # waiting for VNA averaging
-                time.sleep(self.step_delay)
-
-                vna_samples = []
+                self.timer.lap("set")
+                # VNA averaging is awaited by sweep synchronization in get_data
+                if self.step_delay:
+                    time.sleep(self.step_delay)
+                self.timer.lap("settle")
+
+                vna_samples = np.full(
+                    (self.vna_samples_count, self.frequency_points),
+                    np.nan,
+                    dtype=np.complex128,
+                )
                 for sample in range(self.vna_samples_count):
-                    vna_data = self.vna.get_data()
-                    vna_data.pop("array", None)
-                    vna_data.pop("freq", None)
-                    vna_samples.append(vna_data)
+                    trace = self.vna.get_data().get("array")
+                    self.timer.lap("read")
+                    if trace is not None and len(trace) == self.frequency_points:
+                        vna_samples[sample] = trace
+                    else:
+                        logger.warning(
+                            f"[scan_reflection] Unexpected VNA trace at V_set {v_set * 1e3}"
+                        )
                     proc = round(
                         (
                             (
@@ -171,17 +211,66 @@ class BiasReflectionThread(Thread):
                 self.measure.data["params"][param].append(vna_samples)
                 delta_t = datetime.now() - start_t
                 self.measure.data["time"].append(delta_t.total_seconds())
+                self.timer.lap("store")
                 logger.info(
                     f"[scan_reflection] Proc {proc} %; Time {delta_t}; V_set {v_set * 1e3}"
                 )
                 self.progress.emit(proc)
+                self.timer.lap("emit")
+            self.timer.point()
 
+        self.timer.stop()
+        self.vna.set_single_sweep(False)
+        if self.single_sweep:
+            self.vna.restore_traces()
         self.block.set_bias_voltage(initial_v)
         self.block.disconnect()
         self.measure.save()
         self.pre_exit()
         self.finished.emit()
 
+    def measure_single_sweep(self, i: int, v_set: float, start_t: datetime) -> None:
+        """All parameters are measured as parallel traces of one averaged sweep"""
+        vna_samples = {
+            param: np.full(
+                (self.vna_samples_count, self.frequency_points),
+                np.nan,
+                dtype=np.complex128,
+            )
+            for param in self.vna_parameters
+        }
+        for sample in range(self.vna_samples_count):
+            try:
+                self.vna.sweep()
+                self.timer.lap("settle")
+                traces = self.vna.get_traces()
+            except (ValueError, OSError) as e:
+                logger.warning(
+                    f"[scan_reflection] Unable to read VNA traces at V_set {v_set * 1e3}: {e}"
+                )
+                traces = {}
+            self.timer.lap("read")
+            for param in self.vna_parameters:
+                trace = traces.get(param)
+                if trace is not None and len(trace) == self.frequency_points:
+                    vna_samples[param][sample] = trace
+                else:
+                    logger.warning(
+                        f"[scan_reflection] Unexpected VNA trace {param} at V_set {v_set * 1e3}"
+                    )
+
+        delta_t = datetime.now() - start_t
+        for param in self.vna_parameters:
+            self.measure.data["params"][param].append(vna_samples[param])
+            self.measure.data["time"].append(delta_t.total_seconds())
+        self.timer.lap("store")
+        proc = round((i + 1) / self.voltage_points * 100)
+        logger.info(
+            f"[scan_reflection] Proc {proc} %; Time {delta_t}; V_set {v_set * 1e3}"
+        )
+        self.progress.emit(proc)
+        self.timer.lap("emit")
+
 
 class SisReflectionMeasureWidget(QWidget):
     def __init__(self, parent):
@@ -222,7 +311,7 @@ class SisReflectionMeasureWidget(QWidget):
         self.voltagePoints.setDecimals(0)
         self.voltagePoints.setValue(state.BLOCK_BIAS_VOLT_POINTS)
 
-        self.scanStepDelayLabel = QLabel("Step delay, s")
+        self.scanStepDelayLabel = QLabel("Extra step delay, s")
         self.scanStepDelay = DoubleSpinBox(self)
         self.scanStepDelay.setRange(0, 10)
         self.scanStepDelay.setValue(state.BIAS_REFL_DELAY)
@@ -270,6 +359,13 @@ class SisReflectionMeasureWidget(QWidget):
         self.vnaAverageCount.setRange(1, 1000)
         self.vnaAverageCount.setValue(10)
 
+        self.vnaSingleSweep = QCheckBox(self)
+        self.vnaSingleSweep.setText("Single sweep for all parameters")
+        self.vnaSingleSweep.setToolTip(
+            "Parameters are measured as parallel traces of one averaged sweep per bias point"
+        )
+        self.vnaSingleSweep.setChecked(state.BIAS_REFL_SINGLE_SWEEP)
+
         self.scanProgress = QProgressBar(self)
         self.scanProgress.setValue(0)
 
@@ -292,6 +388,7 @@ class SisReflectionMeasureWidget(QWidget):
         flayout.addRow(self.vnaPointsLabel, self.vnaPoints)
         flayout.addRow(self.vnaSamplesCountLabel, self.vnaSamplesCount)
         flayout.addRow(self.vnaAverageCountLabel, self.vnaAverageCount)
+        flayout.addRow(self.vnaSingleSweep)
         flayout.addRow(HLine(self))
         flayout.addRow(self.scanProgress)
 
@@ -328,7 +425,9 @@ class SisReflectionMeasureWidget(QWidget):
             stop_voltage=self.voltageStop.value(),
             voltage_points=int(self.voltagePoints.value()),
             step_delay=self.scanStepDelay.value(),
+            single_sweep=self.vnaSingleSweep.isChecked(),
         )
+        state.BIAS_REFL_SINGLE_SWEEP = self.vnaSingleSweep.isChecked()
         state.BIAS_REFL_SCAN_THREAD = True
 
         self.bias_reflection_thread.progress.connect(
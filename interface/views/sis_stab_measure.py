@@ -18,6 +18,7 @@ from api.Scontel.sis_block import SisBlock
 from interface.components.ui.Button import Button
 from interface.components.ui.DoubleSpinBox import DoubleSpinBox
 from store.base import MeasureModel
+from store.columns import Column
 from store.powerMeterUnitsModel import power_meter_unit_model
 from store.state import state
 from threads import Thread
@@ -120,6 +121,7 @@ class MeasurePowerThread(Thread):
         )
         self.nrx = NRXPowerMeter(
             host=state.NRX_IP,
+            port=state.NRX_PORT,
             aperture_time=state.NRX_APER_TIME,
             delay=0,
         )
@@ -140,14 +142,20 @@ class MeasurePowerThread(Thread):
                 "voltage": None,
                 "current": None,
                 "rd": self.rn1,
-                "power": [],
+                "power": Column(
+                    unit=power_meter_unit_model.val_pretty,
+                    capacity=len(self.freq_range),
+                ),
                 "power_units": power_meter_unit_model.val_pretty,
             },
             "point 2": {
                 "voltage": None,
                 "current": None,
                 "rd": self.rn2,
-                "power": [],
+                "power": Column(
+                    unit=power_meter_unit_model.val_pretty,
+                    capacity=len(self.freq_range),
+                ),
                 "power_units": power_meter_unit_model.val_pretty,
             },
             "frequency": self.freq_range.tolist(),
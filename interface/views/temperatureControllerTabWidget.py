@@ -19,64 +19,75 @@ from interface.components.ui.Button import Button
 from interface.components.ui.DoubleSpinBox import DoubleSpinBox
 from store import LakeShoreTemperatureControllerManager
 from store.base import MeasureModel, MeasureType
-from threads import Thread
+from store.columns import Column
+from threads import PollJob, Thread
 from utils.dock import Dock
 from utils.exceptions import DeviceConnectionError
 
 
-class MonitorThread(Thread):
+class MonitorJob(PollJob):
     temperatures = Signal(dict)
 
+    priority = 2
+
     def __init__(
         self,
         cid: int,
         step_delay: float,
         store_data: bool,
     ):
-        super().__init__()
         self.cid = cid
         self.step_delay = step_delay
         self.store_data = store_data
         self.config = LakeShoreTemperatureControllerManager.get_config(self.cid)
+        super().__init__(period=step_delay, key=self.config.adapter_key)
         self.tc = None
+        self.start_time = None
+        self.i = 0
         if store_data:
             self.measure = MeasureModel.objects.create(
                 measure_type=MeasureType.TEMPERATURE_STREAM,
-                data={"temp_a": [], "temp_c": [], "temp_b": [], "time": []},
+                data={
+                    "temp_a": Column(unit="K"),
+                    "temp_c": Column(unit="K"),
+                    "temp_b": Column(unit="K"),
+                    "time": Column(unit="s"),
+                },
             )
             self.measure.save(finish=False)
 
-    def run(self):
+    def setup(self) -> bool:
         try:
             self.tc = TemperatureController(**self.config.dict())
         except DeviceConnectionError:
-            self.finished.emit()
-            return
-        start_time = time.time()
-        i = 0
-        while self.config.thread_stream:
-            temp_a = self.tc.get_temperature_a()
-            temp_c = self.tc.get_temperature_c()
-            temp_b = self.tc.get_temperature_b()
-            if self.store_data:
-                self.measure.data["temp_a"].append(temp_a)
-                self.measure.data["temp_c"].append(temp_c)
-                self.measure.data["temp_b"].append(temp_b)
-                self.measure.data["time"].append(time.time() - start_time)
-            self.temperatures.emit(
-                {
-                    "temp_a": temp_a,
-                    "temp_c": temp_c,
-                    "temp_b": temp_b,
-                    "time": time.time() - start_time,
-                    "reset": i == 0,
-                }
-            )
-            time.sleep(self.step_delay)
-            i += 1
-
-        self.pre_exit()
-        self.finished.emit()
+            return False
+        self.start_time = time.time()
+        self.i = 0
+        return True
+
+    def poll(self) -> bool:
+        if not self.config.thread_stream:
+            return False
+        temperatures = self.tc.get_temperatures()
+        if temperatures is None:
+            return True
+        temp_a, temp_b, temp_c = temperatures[:3]
+        if self.store_data:
+            self.measure.data["temp_a"].append(temp_a)
+            self.measure.data["temp_c"].append(temp_c)
+            self.measure.data["temp_b"].append(temp_b)
+            self.measure.data["time"].append(time.time() - self.start_time)
+        self.temperatures.emit(
+            {
+                "temp_a": temp_a,
+                "temp_c": temp_c,
+                "temp_b": temp_b,
+                "time": time.time() - self.start_time,
+                "reset": self.i == 0,
+            }
+        )
+        self.i += 1
+        return True
 
     def pre_exit(self, *args, **kwargs):
         if self.store_data:
@@ -201,7 +212,7 @@ class TemperatureControllerTabWidget(QWidget):
         self.groupMonitor.setLayout(layout)
 
     def startMonitor(self):
-        self.thread_monitor = MonitorThread(
+        self.monitor_job = MonitorJob(
             cid=self.cid,
             step_delay=self.temperatureStreamStepDelay.value(),
             store_data=self.checkTemperatureStoreData.isChecked(),
@@ -215,21 +226,17 @@ class TemperatureControllerTabWidget(QWidget):
         self.temperatureStreamGraphWindow.widget().stream_window = (
             self.temperatureStreamTime.value()
         )
-        self.thread_monitor.start()
+        self.monitor_job.start()
         self.btnStartMonitor.setEnabled(False)
         self.btnStopMonitor.setEnabled(True)
-        self.thread_monitor.finished.connect(
-            lambda: self.btnStartMonitor.setEnabled(True)
-        )
-        self.thread_monitor.finished.connect(
-            lambda: self.btnStopMonitor.setEnabled(False)
-        )
-        self.thread_monitor.temperatures.connect(self.updateMonitor)
+        self.monitor_job.finished.connect(lambda: self.btnStartMonitor.setEnabled(True))
+        self.monitor_job.finished.connect(lambda: self.btnStopMonitor.setEnabled(False))
+        self.monitor_job.temperatures.connect(self.updateMonitor)
 
     def stopMonitor(self):
         config = LakeShoreTemperatureControllerManager.get_config(cid=self.cid)
         config.thread_stream = False
-        self.thread_monitor.exit(0)
+        self.monitor_job.exit(0)
 
     def updateMonitor(self, measure: Dict):
         self.tempA.setText(f"{measure.get('temp_a')}")
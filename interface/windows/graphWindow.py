@@ -1,15 +1,25 @@
 import logging
-import re
-from typing import Iterable
+from typing import Dict, Hashable, Iterable, NamedTuple, Tuple
 
 from PySide6 import QtGui
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QHBoxLayout
+import numpy as np
 import pyqtgraph as pg
 
+from store.columns import Column
+from utils.plot import configure_curve, get_symbol
+
 
 logger = logging.getLogger(__name__)
 
 
+class Curve(NamedTuple):
+    item: pg.PlotDataItem
+    x: Column
+    y: Column
+
+
 class GraphWindow(QWidget):
     window_title = "Graph"
     graph_title = "Base Graph"
@@ -27,6 +37,7 @@ class GraphWindow(QWidget):
         "#bcbd22",
         "#17becf",
     ]
+    redraw_interval = 33  # ms, appended points are drawn at most ~30 times per second
 
     def __init__(self, parent):
         super().__init__(parent)
@@ -43,6 +54,15 @@ class GraphWindow(QWidget):
         hlayout.addWidget(self.btnRemoveAllCurves)
         vlayout.addLayout(hlayout)
         vlayout.addWidget(self.graphWidget)
+        # curves by (measure_id, plot_num, legend_postfix), points are kept in columns
+        self.curves: Dict[Tuple[Hashable, int, str], Curve] = {}
+        self.plot_num = 0
+        # curves with not drawn points, value is whether curve must be sorted
+        self.dirty_curves: Dict[Tuple[Hashable, int, str], bool] = {}
+        self.redraw_timer = QTimer(self)
+        self.redraw_timer.setSingleShot(True)
+        self.redraw_timer.setInterval(self.redraw_interval)
+        self.redraw_timer.timeout.connect(self.redraw)
         self.prepare()
         self.setLayout(vlayout)
 
@@ -70,33 +90,66 @@ class GraphWindow(QWidget):
         new_plot: bool = True,
         measure_id=None,
         legend_postfix="",
+        sort: bool = False,
     ) -> str:
-        items = self.get_plot_items()
-
-        def get_id(name: str):
-            val = next((_ for _ in re.findall(r"№ (\d+);", name)), 0)
-            return int(val)
-
-        plot_num = max([get_id(name) for name in items.keys()], default=0)
         if new_plot:
-            plot_num += 1
+            self.plot_num += 1
+        plot_num = self.plot_num
         graph_id = f"id {measure_id}; № {plot_num}; {legend_postfix}"
 
-        if items.get(graph_id):
-            item = items.get(graph_id)
-            x_data = list(item.xData)
-            x_data.extend(x)
-            y_data = list(item.yData)
-            y_data.extend(y)
-            items.get(graph_id).setData(x_data, y_data)
+        key = (measure_id, plot_num, legend_postfix)
+        curve = self.curves.get(key)
+        if curve:
+            curve.x.extend(x)
+            curve.y.extend(y)
+            self.dirty_curves[key] = self.dirty_curves.get(key, False) or sort
+            if not self.redraw_timer.isActive():
+                self.redraw_timer.start()
             return graph_id
 
+        x_data = Column(values=x)
+        y_data = Column(values=y)
         pen = pg.mkPen(color=self.get_color(plot_num), width=2)
-        self.graphWidget.plot(
-            x, y, name=f"{graph_id}", pen=pen, symbolSize=6, symbolBrush=pen.color()
+        item = self.graphWidget.plot(
+            x_data.array,
+            y_data.array,
+            name=f"{graph_id}",
+            pen=pen,
+            symbolSize=6,
+            symbolBrush=pen.color(),
+            symbol=get_symbol(x_data.array),
         )
+        configure_curve(item, x_data.array)
+        self.curves[key] = Curve(item=item, x=x_data, y=y_data)
+        if sort:
+            self.dirty_curves[key] = True
+            self.redraw_timer.start()
         return graph_id
 
+    def redraw(self) -> None:
+        """Pass appended points of changed curves to plot items"""
+        dirty_curves, self.dirty_curves = self.dirty_curves, {}
+        for key, sort in dirty_curves.items():
+            curve = self.curves.get(key)
+            if curve is None:
+                continue
+            x_data, y_data = curve.x.array, curve.y.array
+            if sort and np.any(np.diff(x_data) < 0):
+                # Adaptive sweeps add points between already measured ones
+                order = np.argsort(x_data, kind="stable")
+                x_data[:] = x_data[order]
+                y_data[:] = y_data[order]
+            configure_curve(curve.item, x_data)
+            curve.item.setData(x_data, y_data)
+
+    def forget_removed_curves(self) -> None:
+        """Drop buffers of curves removed from the plot, plot number is continued from the rest"""
+        items = set(self.graphWidget.getPlotItem().items)
+        self.curves = {
+            key: curve for key, curve in self.curves.items() if curve.item in items
+        }
+        self.plot_num = max((key[1] for key in self.curves), default=0)
+
     def remove_hidden_graphs(self):
         plotItem = self.graphWidget.getPlotItem()
         items_to_remove = {
@@ -104,9 +157,11 @@ class GraphWindow(QWidget):
         }
         for item in items_to_remove.values():
             plotItem.removeItem(item)
+        self.forget_removed_curves()
 
     def remove_all_graphs(self):
         plotItem = self.graphWidget.getPlotItem()
         items_to_remove = {item.name(): item for item in plotItem.items}
         for item in items_to_remove.values():
             plotItem.removeItem(item)
+        self.forget_removed_curves()
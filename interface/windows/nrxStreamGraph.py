@@ -4,8 +4,10 @@ from PySide6 import QtGui
 from PySide6.QtWidgets import QWidget, QVBoxLayout
 import pyqtgraph as pg
 
+from store.columns import TimeSeriesBuffer
 from store.powerMeterUnitsModel import power_meter_unit_model
 from store.state import state
+from utils.plot import configure_curve, get_symbol
 
 
 logger = logging.getLogger(__name__)
@@ -24,7 +26,7 @@ class NRXStreamGraphWindow(QWidget):
         layout = QVBoxLayout()
         self.graphWidget = pg.PlotWidget()
         layout.addWidget(self.graphWidget)
-        self.dataset = {"y": [], "x": []}
+        self.dataset = TimeSeriesBuffer(window=state.NRX_STREAM_GRAPH_TIME)
         self.prepare()
         self.setLayout(layout)
         power_meter_unit_model.value_pretty.connect(
@@ -41,36 +43,33 @@ class NRXStreamGraphWindow(QWidget):
         self.graphWidget.showGrid(x=True, y=True)
 
     def plotGraph(self) -> None:
-        try:
-            x = self.dataset["x"]
-            y = self.dataset["y"]
-        except (IndexError, KeyError) as e:
-            logger.error(f"Plot graph Error: {e}")
-            return
+        x = self.dataset.x
+        y = self.dataset.y
 
         plotItem = self.graphWidget.getPlotItem()
         items = {item.name(): item for item in plotItem.items}
         if items.get("Stream"):
+            configure_curve(items.get("Stream"), x)
             items.get("Stream").setData(x, y)
             return
 
         pen = pg.mkPen(color="#0000FF", width=2)
-        self.graphWidget.plot(
-            x, y, name="Stream", pen=pen, symbolSize=6, symbolBrush=pen.color()
+        item = self.graphWidget.plot(
+            x,
+            y,
+            name="Stream",
+            pen=pen,
+            symbolSize=6,
+            symbolBrush=pen.color(),
+            symbol=get_symbol(x),
         )
+        configure_curve(item, x)
 
     def addData(self, x: float, y: float, reset_data: bool = True) -> None:
         if reset_data:
-            self.dataset["y"] = [y]
-            self.dataset["x"] = [x]
-            return
-
-        if max(self.dataset["x"]) >= state.NRX_STREAM_GRAPH_TIME:
-            del self.dataset["y"][0]
-            del self.dataset["x"][0]
-
-        self.dataset["y"].append(y)
-        self.dataset["x"].append(x)
+            self.dataset.clear()
+        self.dataset.window = state.NRX_STREAM_GRAPH_TIME
+        self.dataset.append(x, y)
 
     def plotNew(self, x: float, y: float, reset_data: bool = True) -> None:
         self.addData(x=x, y=y, reset_data=reset_data)
@@ -5,6 +5,8 @@ from PySide6 import QtGui
 from PySide6.QtWidgets import QWidget, QVBoxLayout
 import pyqtgraph as pg
 
+from utils.plot import configure_curve, get_symbol
+
 
 logger = logging.getLogger(__name__)
 
@@ -46,13 +48,21 @@ class SpectrumGraphWindow(QWidget):
         plotItem = self.graphWidget.getPlotItem()
         items = {item.name(): item for item in plotItem.items}
         if items.get("Stream"):
+            configure_curve(items.get("Stream"), x)
             items.get("Stream").setData(x, y)
             return
 
         pen = pg.mkPen(color="#0000FF", width=2)
-        self.graphWidget.plot(
-            x, y, name="Stream", pen=pen, symbolSize=6, symbolBrush=pen.color()
+        item = self.graphWidget.plot(
+            x,
+            y,
+            name="Stream",
+            pen=pen,
+            symbolSize=6,
+            symbolBrush=pen.color(),
+            symbol=get_symbol(x),
         )
+        configure_curve(item, x)
 
     def addData(self, x: List, y: List) -> None:
         self.dataset["y"] = y
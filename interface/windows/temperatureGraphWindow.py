@@ -5,6 +5,9 @@ from PySide6 import QtGui
 from PySide6.QtWidgets import QWidget, QVBoxLayout
 import pyqtgraph as pg
 
+from store.columns import TimeSeriesBuffer
+from utils.plot import configure_curve, get_symbol
+
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +25,7 @@ class TemperatureGraphWindow(QWidget):
         layout = QVBoxLayout()
         self.graphWidget = pg.PlotWidget()
         layout.addWidget(self.graphWidget)
-        self.dataset = defaultdict(dict[str, list])
+        self.dataset = defaultdict(TimeSeriesBuffer)
         self.prepare()
         self.setLayout(layout)
         self.stream_window = 60
@@ -43,35 +46,33 @@ class TemperatureGraphWindow(QWidget):
         self.graphWidget.showGrid(x=True, y=True)
 
     def plotGraph(self, ds_id: str) -> None:
-        try:
-            x = self.dataset[ds_id]["x"]
-            y = self.dataset[ds_id]["y"]
-        except (IndexError, KeyError) as e:
-            logger.error(f"Plot graph Error: {e}")
-            return
+        x = self.dataset[ds_id].x
+        y = self.dataset[ds_id].y
 
         plotItem = self.graphWidget.getPlotItem()
         items = {item.name(): item for item in plotItem.items}
         if items.get(ds_id):
+            configure_curve(items.get(ds_id), x)
             items.get(ds_id).setData(x, y)
             return
         pen = pg.mkPen(color=self.get_color(ds_id), width=2)
-        self.graphWidget.plot(
-            x, y, name=ds_id, pen=pen, symbolSize=6, symbolBrush=pen.color()
+        item = self.graphWidget.plot(
+            x,
+            y,
+            name=ds_id,
+            pen=pen,
+            symbolSize=6,
+            symbolBrush=pen.color(),
+            symbol=get_symbol(x),
         )
+        configure_curve(item, x)
 
     def addData(self, ds_id: str, x: float, y: float, reset_data: bool = True) -> None:
+        dataset = self.dataset[ds_id]
         if reset_data:
-            self.dataset[ds_id]["y"] = [y]
-            self.dataset[ds_id]["x"] = [x]
-            return
-
-        if max(self.dataset[ds_id]["x"]) >= self.stream_window:
-            del self.dataset[ds_id]["y"][0]
-            del self.dataset[ds_id]["x"][0]
-
-        self.dataset[ds_id]["y"].append(y)
-        self.dataset[ds_id]["x"].append(x)
+            dataset.clear()
+        dataset.window = self.stream_window
+        dataset.append(x, y)
 
     def plotNew(self, ds_id: str, x: float, y: float, reset_data: bool = True) -> None:
         self.addData(ds_id=ds_id, x=x, y=y, reset_data=reset_data)
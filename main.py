@@ -4,6 +4,7 @@ from PySide6.QtWidgets import QApplication
 import PySide6QtAds as QtAds
 
 from store import restore_configs
+from store.base import MeasureManager
 from interface.index import App
 from utils.dock import Dock
 from utils.logger import configure_logger
@@ -25,6 +26,7 @@ if __name__ == "__main__":
     ex.dock_manager = dock_manager
     Dock.ex = ex
     ex.add_views()
+    MeasureManager.recover()
     ex.create_perspective_ui()
     ex.init_settings()
     restore_configs(ex.settings)
@@ -0,0 +1,15 @@
+from .base import BaseSimulator, SimulatorConfig, SimulatorRunner
+from .scpi import ScpiSimulator
+from .sis_block import SisBlockSimulator, SisJunctionModel
+from .instruments import (
+    GenericScpiSimulator,
+    KeithleySimulator,
+    LakeShoreSimulator,
+    NrxSimulator,
+    RigolDP832Simulator,
+    SpectrumFsek30Simulator,
+    VnaSimulator,
+)
+from .prologix import PrologixSimulator
+from .modbus import ChopperSimulator, ModbusTcpSimulator
+from .http import F70Simulator, GridSimulator, HttpJsonSimulator, NiYigSimulator
@@ -0,0 +1,87 @@
+"""
+Run all instrument simulators on localhost.
+Point the application to 127.0.0.1 with ports printed on start:
+    python -m simulators --latency 0.002 --jitter 0.001 --error-rate 0.01
+"""
+import argparse
+import logging
+import time
+
+from simulators import (
+    ChopperSimulator,
+    F70Simulator,
+    GenericScpiSimulator,
+    GridSimulator,
+    KeithleySimulator,
+    LakeShoreSimulator,
+    NiYigSimulator,
+    NrxSimulator,
+    PrologixSimulator,
+    RigolDP832Simulator,
+    SimulatorConfig,
+    SimulatorRunner,
+    SisBlockSimulator,
+    SisJunctionModel,
+    SpectrumFsek30Simulator,
+    VnaSimulator,
+)
+
+
+def get_simulators(host: str, config: SimulatorConfig):
+    model = SisJunctionModel(pump=0.3)
+    gpib = {
+        19: GenericScpiSimulator(
+            idn="Agilent Technologies,E8257D,0,1.0", config=config
+        ),
+        20: SpectrumFsek30Simulator(config=config),
+        22: KeithleySimulator(config=config),
+    }
+    return [
+        SisBlockSimulator(host=host, model=model, config=config),
+        NrxSimulator(
+            host=host,
+            config=config,
+            power_source=lambda: -40 + 1e5 * abs(model.measure()[1]),
+        ),
+        VnaSimulator(host=host, config=config),
+        LakeShoreSimulator(host=host, config=config),
+        RigolDP832Simulator(host=host, config=config),
+        PrologixSimulator(host=host, devices=gpib, config=config),
+        ChopperSimulator(host=host, config=config),
+        NiYigSimulator(host=host, port=8080, config=config),
+        GridSimulator(host=host, port=8081, config=config),
+        F70Simulator(host=host, config=config),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    options = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config = SimulatorConfig(
+        latency=options.latency,
+        jitter=options.jitter,
+        error_rate=options.error_rate,
+        drop_rate=options.drop_rate,
+        seed=options.seed,
+    )
+    simulators = get_simulators(options.host, config)
+    with SimulatorRunner(simulators):
+        for simulator in simulators:
+            print(f"{simulator.name:<16}{simulator.host}:{simulator.port}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
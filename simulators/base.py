@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import random
+import threading
+from typing import List, Optional, Set
+
+
+logger = logging.getLogger(__name__)
+
+
+class SimulatorConfig:
+    """
+    Transport behaviour of simulated instrument.
+    :param latency: mean answer delay, s
+    :param jitter: max deviation of answer delay, s
+    :param error_rate: probability to answer with error
+    :param drop_rate: probability to leave the command without answer
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.random = random.Random(seed)
+
+    def delay(self) -> float:
+        if not self.jitter:
+            return self.latency
+        return max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+
+    def is_error(self) -> bool:
+        return self.error_rate > 0 and self.random.random() < self.error_rate
+
+    def is_dropped(self) -> bool:
+        return self.drop_rate > 0 and self.random.random() < self.drop_rate
+
+    def dict(self):
+        return {
+            "latency": self.latency,
+            "jitter": self.jitter,
+            "error_rate": self.error_rate,
+            "drop_rate": self.drop_rate,
+        }
+
+
+class BaseSimulator:
+    """
+    Asyncio TCP server of simulated instrument.
+    Subclasses implement `handle_client`.
+    """
+
+    name = "Simulator"
+    default_port = 0
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = None,
+        config: SimulatorConfig = None,
+    ):
+        self.host = host
+        self.port = self.default_port if port is None else port
+        self.config = config or SimulatorConfig()
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.clients: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(
+            self.serve_client, host=self.host, port=self.port
+        )
+        # Port 0 means any free port
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info(f"[{self.name}] Listening {self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        if self.server is None:
+            return
+        self.server.close()
+        for task in self.clients:
+            task.cancel()
+        await asyncio.gather(*self.clients, return_exceptions=True)
+        await self.server.wait_closed()
+        self.server = None
+
+    async def serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        self.clients.add(task)
+        try:
+            await self.handle_client(reader, writer)
+        except asyncio.CancelledError:
+            writer.close()
+        finally:
+            self.clients.discard(task)
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        raise NotImplementedError
+
+    async def wait(self) -> None:
+        delay = self.config.delay()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class SimulatorRunner:
+    """
+    Runs simulators in event loop of a background thread,
+    so synchronous drivers can be used against them from the main thread.
+    """
+
+    def __init__(self, simulators: List[BaseSimulator]):
+        self.simulators = simulators
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def start(self) -> "SimulatorRunner":
+        self.thread.start()
+        for simulator in self.simulators:
+            asyncio.run_coroutine_threadsafe(simulator.start(), self.loop).result()
+        return self
+
+    def stop(self) -> None:
+        for simulator in self.simulators:
+            asyncio.run_coroutine_threadsafe(simulator.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def __enter__(self) -> "SimulatorRunner":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
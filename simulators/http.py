@@ -0,0 +1,185 @@
+import asyncio
+import json
+import logging
+import random
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from simulators.base import BaseSimulator
+
+
+logger = logging.getLogger(__name__)
+
+REASONS = {200: "OK", 404: "Not Found", 500: "Internal Server Error"}
+
+
+class HttpJsonSimulator(BaseSimulator):
+    """
+    Minimal HTTP/1.1 JSON server.
+    Requests are matched against `routes` by method and path regex:
+        routes = [("POST", r"/devices/(\\w+)/start", "start_task"), ...]
+    Handlers receive the regex match and decoded json body
+    and return (status, data) tuple.
+    """
+
+    name = "HTTP"
+    routes: List[Tuple[str, str, str]] = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compiled_routes: List[Tuple[str, re.Pattern, Callable]] = [
+            (method, re.compile(f"^{pattern}$"), getattr(self, handler))
+            for method, pattern, handler in self.routes
+        ]
+
+    def handle_request(self, method: str, path: str, body: Dict) -> Tuple[int, Dict]:
+        path = path.split("?")[0]
+        for route_method, pattern, handler in self.compiled_routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                return handler(match, body)
+        return 404, {"detail": "Not Found"}
+
+    async def read_request(self, reader: asyncio.StreamReader) -> Optional[tuple]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        method, path, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        body = await reader.readexactly(length) if length else b""
+        return method, path, headers, body
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request = await self.read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                try:
+                    data = json.loads(body) if body else {}
+                except json.JSONDecodeError:
+                    data = {}
+                if self.config.is_error():
+                    status, answer = 500, {"error": "Simulated error"}
+                else:
+                    status, answer = self.handle_request(method, path, data)
+                if self.config.is_dropped():
+                    break
+                await self.wait()
+                content = json.dumps(answer).encode("utf-8")
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(content)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                    "\r\n".encode("latin-1") + content
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError) as e:
+            logger.debug(f"[{self.name}.handle_client] {e}")
+        finally:
+            writer.close()
+
+
+class NiYigSimulator(HttpJsonSimulator):
+    """National Instruments DAQ REST server driving YIG filters"""
+
+    name = "NI YIG"
+    default_port = 80
+    routes = [
+        ("GET", r"/", "index"),
+        ("GET", r"/devices/", "get_devices"),
+        ("POST", r"/devices/(\w+)/(start|stop|close|reset)", "task_action"),
+        ("POST", r"/devices/(\w+)/write/(\w+)/", "write_task"),
+    ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values = {"yig_1": 0, "yig_2": 0}
+
+    def index(self, match, body) -> Tuple[int, Dict]:
+        return 200, {"status": "ok"}
+
+    def get_devices(self, match, body) -> Tuple[int, Dict]:
+        return 200, {"devices": ["Dev1"]}
+
+    def task_action(self, match, body) -> Tuple[int, Dict]:
+        return 200, {"device": match.group(1), "action": match.group(2)}
+
+    def write_task(self, match, body) -> Tuple[int, Dict]:
+        yig = match.group(2)
+        self.values[yig] = int(body.get("value", 0))
+        return 200, {"result": self.values[yig]}
+
+
+class F70Simulator(HttpJsonSimulator):
+    """Sumitomo F70 compressor REST server"""
+
+    name = "F70"
+    default_port = 21024
+    routes = [
+        ("GET", r"/api/v1/temperatures/", "get_temperatures"),
+        ("GET", r"/api/v1/pressures/", "get_pressures"),
+        ("POST", r"/api/v1/turn-on/", "turn_on"),
+        ("POST", r"/api/v1/turn-off/", "turn_off"),
+    ]
+    temperatures = [35.0, 30.0, 25.0, 20.0]
+    pressures = [1.6, 0.0]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.random = random.Random()
+        self.on = True
+
+    def get_temperatures(self, match, body) -> Tuple[int, Dict]:
+        return 200, {
+            "temperatures": [
+                round(t + self.random.gauss(0, 0.1), 1) for t in self.temperatures
+            ]
+        }
+
+    def get_pressures(self, match, body) -> Tuple[int, Dict]:
+        return 200, {"pressures": self.pressures}
+
+    def turn_on(self, match, body) -> Tuple[int, Dict]:
+        self.on = True
+        return 200, {"result": "on"}
+
+    def turn_off(self, match, body) -> Tuple[int, Dict]:
+        self.on = False
+        return 200, {"result": "off"}
+
+
+class GridSimulator(HttpJsonSimulator):
+    """Arduino step motor of polarization grid"""
+
+    name = "Grid"
+    default_port = 80
+    routes = [
+        ("POST", r"/rotate", "rotate"),
+        ("POST", r"/test", "test"),
+    ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.angle = 0.0
+
+    def rotate(self, match, body) -> Tuple[int, Dict]:
+        self.angle += float(body.get("angle", 0))
+        return 200, {"angle": self.angle}
+
+    def test(self, match, body) -> Tuple[int, Dict]:
+        return 200, {"result": "OK"}
@@ -0,0 +1,277 @@
+import math
+import random
+import struct
+from typing import Callable, List, Optional, Union
+
+from simulators.scpi import ScpiSimulator
+
+
+class NrxSimulator(ScpiSimulator):
+    """Rohde & Schwarz NRX power meter"""
+
+    name = "NRX"
+    idn = "Rohde&Schwarz,NRX,000000,02.50"
+    default_port = 5026
+    routes = [
+        (r"READ\?", "read_power"),
+        (r"FETC\?", "read_power"),
+    ]
+    defaults = {"UNIT:POW": "DBM"}
+
+    def __init__(self, *args, power_source: Callable[[], float] = None, **kwargs):
+        """
+        :param power_source: callable returning power in dBm,
+            e.g. bound to SIS block model to get bias dependent IF power
+        """
+        super().__init__(*args, **kwargs)
+        self.power_source = power_source
+        self.random = random.Random()
+
+    def read_power(self, match, args) -> str:
+        if self.power_source is not None:
+            power = self.power_source()
+        else:
+            power = -30 + self.random.gauss(0, 0.01)
+        return self.format_float(power)
+
+
+class VnaSimulator(ScpiSimulator):
+    """Rohde & Schwarz ZVA67 vector network analyzer"""
+
+    name = "VNA"
+    idn = "Rohde&Schwarz,ZVA67-4Port,000000,3.60"
+    default_port = 5025
+    routes = [
+        (r"CALC\d*:DATA\?", "get_data"),
+        (r"CALC\d*:DATA:ALL\?", "get_all_data"),
+        (r"CALC(\d*):PAR:DEF", "define_parameter"),
+        (r"CALC(\d*):PAR:SDEF", "add_parameter"),
+        (r"CALC(\d*):PAR:DEL:ALL", "delete_parameters"),
+        (r"CALC(\d*):PAR:CAT\?", "get_catalog"),
+        (r"CALC(\d*):PAR:MEAS\?", "get_measured_parameter"),
+    ]
+    defaults = {
+        "SWE:POIN": "201",
+        "SENS:FREQ:STAR": "2E9",
+        "SENS:FREQ:STOP": "12E9",
+        "SOUR:POW": "-30",
+        "CALC:FORM": "COMP",
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.traces = {"Trc1": "S11"}
+
+    @property
+    def points(self) -> int:
+        return int(float(self.values.get("SWE:POIN", "201")))
+
+    def trace(self, parameter: str):
+        """Synthetic resonance, different for every S-parameter"""
+        shift = sum(ord(char) for char in parameter) % 7 / 10
+        values = []
+        for i in range(self.points):
+            phase = 2 * math.pi * i / max(self.points - 1, 1)
+            amplitude = 0.5 + 0.4 * math.cos(phase * 3 + shift)
+            values.append((amplitude * math.cos(phase), amplitude * math.sin(phase)))
+        return values
+
+    def format_traces(self, parameters: List[str]) -> Union[str, bytes]:
+        values = [
+            value
+            for parameter in parameters
+            for point in self.trace(parameter)
+            for value in point
+        ]
+        data_format = self.values.get("FORM", "ASC").replace(" ", "").upper()
+        if data_format.startswith("REAL"):
+            order = (
+                ">" if self.values.get("FORM:BORD", "SWAP").upper() == "NORM" else "<"
+            )
+            size = "d" if data_format.endswith("64") else "f"
+            return self.format_block(
+                struct.pack(f"{order}{len(values)}{size}", *values)
+            )
+        return ",".join(self.format_float(value) for value in values)
+
+    def get_data(self, match, args) -> Union[str, bytes]:
+        parameter = next(iter(self.traces.values()), "S11")
+        return self.format_traces([parameter])
+
+    def get_all_data(self, match, args) -> Union[str, bytes]:
+        return self.format_traces(list(self.traces.values()))
+
+    def define_parameter(self, match, args) -> None:
+        trace, _, parameter = args.partition(",")
+        self.traces = {trace.strip("'"): parameter.strip("'")}
+
+    def add_parameter(self, match, args) -> None:
+        trace, _, parameter = args.partition(",")
+        self.traces[trace.strip().strip("'")] = parameter.strip().strip("'")
+
+    def delete_parameters(self, match, args) -> None:
+        self.traces = {}
+
+    def get_catalog(self, match, args) -> str:
+        catalog = ",".join(f"{trace},{param}" for trace, param in self.traces.items())
+        return f"'{catalog}'"
+
+    def get_measured_parameter(self, match, args) -> str:
+        parameter = self.traces.get(args.strip().strip("'"), "")
+        return f"'{parameter}'"
+
+
+class LakeShoreSimulator(ScpiSimulator):
+    """LakeShore 336 temperature controller"""
+
+    name = "LakeShore"
+    idn = "LSCI,MODEL336,LSA2CMQ/LSA2C8R,2.9"
+    default_port = 7777
+    abbreviate_headers = False
+    routes = [
+        (r"KRDG\?", "get_temperature"),
+        (r"HTR\?", "get_heater_output"),
+        (r"HTRST\?", "get_heater_status"),
+    ]
+    defaults = {"MODE": "0", "RANGE": "0", "SETP": "4.2", "MOUT": "0"}
+    temperatures = {"A": 4.2, "B": 77.0, "C": 300.0, "D": 40.0}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.random = random.Random()
+
+    def temperature(self, channel: str) -> str:
+        value = self.temperatures.get(channel, 0) + self.random.gauss(0, 1e-3)
+        return f"{value:+.4f}"
+
+    def get_temperature(self, match, args) -> str:
+        channel = args.strip().upper() or "A"
+        if channel == "0":
+            return ",".join(self.temperature(ch) for ch in self.temperatures)
+        return self.temperature(channel)
+
+    def get_heater_output(self, match, args) -> str:
+        return "0.00"
+
+    def get_heater_status(self, match, args) -> str:
+        return "0"
+
+
+class RigolDP832Simulator(ScpiSimulator):
+    """Rigol DP832A three channel power supply"""
+
+    name = "Rigol DP832A"
+    idn = "RIGOL TECHNOLOGIES,DP832A,DP8A000000,00.01.16"
+    default_port = 5555
+    routes = [
+        (r"\*TST\?", "self_test"),
+        (r"SOUR(\d*):(CURR|VOLT)\?", "get_source"),
+        (r"SOUR(\d*):(CURR|VOLT)", "set_source"),
+        (r"MEAS:ALL\?", "measure_all"),
+        (r"MEAS:(CURR|VOLT|POW)\?", "measure"),
+        (r"OUTP\?", "get_output"),
+        (r"OUTP", "set_output"),
+    ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.channels = {
+            ch: {"VOLT": 0.0, "CURR": 0.0, "OUTP": "OFF"} for ch in ("1", "2", "3")
+        }
+
+    @staticmethod
+    def channel(value: str) -> str:
+        value = value.upper().replace("CH", "").strip()
+        return value or "1"
+
+    def self_test(self, match, args) -> str:
+        return "TopBoard:PASS,BottomBoard:PASS,Fan:PASS"
+
+    def get_source(self, match, args) -> str:
+        return f"{self.channels[self.channel(match.group(1))][match.group(2)]:.3f}"
+
+    def set_source(self, match, args) -> None:
+        self.channels[self.channel(match.group(1))][match.group(2)] = float(args)
+
+    def measured(self, channel: str):
+        state = self.channels[self.channel(channel)]
+        if state["OUTP"] != "ON":
+            return 0.0, 0.0, 0.0
+        return state["VOLT"], state["CURR"], state["VOLT"] * state["CURR"]
+
+    def measure_all(self, match, args) -> str:
+        return ",".join(f"{value:.4f}" for value in self.measured(args))
+
+    def measure(self, match, args) -> str:
+        index = {"VOLT": 0, "CURR": 1, "POW": 2}[match.group(1)]
+        return f"{self.measured(args)[index]:.4f}"
+
+    def get_output(self, match, args) -> str:
+        return self.channels[self.channel(args)]["OUTP"]
+
+    def set_output(self, match, args) -> None:
+        channel, _, value = args.partition(",")
+        self.channels[self.channel(channel)]["OUTP"] = value.strip().upper()
+
+
+class KeithleySimulator(ScpiSimulator):
+    """Keithley 2200-30-5 power supply"""
+
+    name = "Keithley"
+    idn = "Keithley instruments, 2200-30-5, 0000000,1.0"
+    routes = [
+        (r"SOUR:(CURR|VOLT)\?", "get_source"),
+        (r"SOUR:(CURR|VOLT)", "set_source"),
+        (r"MEAS:(CURR|VOLT)\?", "measure"),
+        (r"OUTP\?", "get_output"),
+        (r"OUTP", "set_output"),
+    ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.source = {"VOLT": 0.0, "CURR": 0.0}
+        self.output = "0"
+
+    def get_source(self, match, args) -> str:
+        return f"{self.source[match.group(1)]:.4f}"
+
+    def set_source(self, match, args) -> None:
+        self.source[match.group(1)] = float(args.rstrip("AV"))
+
+    def measure(self, match, args) -> str:
+        value = self.source[match.group(1)] if self.output == "1" else 0.0
+        return f"{value:.4f}"
+
+    def get_output(self, match, args) -> str:
+        return self.output
+
+    def set_output(self, match, args) -> None:
+        self.output = args.strip()
+
+
+class SpectrumFsek30Simulator(ScpiSimulator):
+    """Rohde & Schwarz FSEK30 spectrum analyzer"""
+
+    name = "FSEK30"
+    idn = "Rohde&Schwarz,FSEK30,000000,3.40"
+    routes = [(r"TRAC:DATA\?", "get_trace")]
+    defaults = {"FREQ:STAR": "1E9", "FREQ:STOP": "2E9"}
+    trace_points = 500
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.random = random.Random()
+
+    def get_trace(self, match, args) -> str:
+        return ",".join(
+            f"{-80 + self.random.gauss(0, 0.5):.2f}" for _ in range(self.trace_points)
+        )
+
+
+class GenericScpiSimulator(ScpiSimulator):
+    """Any other GPIB instrument (lock-in, signal generator)"""
+
+    def __init__(self, *args, idn: Optional[str] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if idn:
+            self.idn = idn
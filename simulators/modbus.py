@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import struct
+from typing import Dict, Optional
+
+from simulators.base import BaseSimulator
+
+
+logger = logging.getLogger(__name__)
+
+READ_HOLDING_REGISTERS = 0x03
+WRITE_SINGLE_REGISTER = 0x06
+WRITE_MULTIPLE_REGISTERS = 0x10
+
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_DATA_VALUE = 0x03
+SLAVE_DEVICE_FAILURE = 0x04
+
+
+class ModbusTcpSimulator(BaseSimulator):
+    """
+    Minimal Modbus TCP slave with holding registers only (functions 3, 6 and 16).
+    Subclasses react on register writes in `on_write`.
+    """
+
+    name = "Modbus TCP"
+    header = struct.Struct(">HHHB")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.registers: Dict[int, int] = {}
+
+    def read_register(self, address: int) -> int:
+        return self.registers.get(address, 0) & 0xFFFF
+
+    def write_register(self, address: int, value: int) -> None:
+        self.registers[address] = value & 0xFFFF
+        self.on_write(address, value & 0xFFFF)
+
+    def on_write(self, address: int, value: int) -> None:
+        ...
+
+    @staticmethod
+    def exception(function: int, code: int) -> bytes:
+        return struct.pack(">BB", function | 0x80, code)
+
+    def handle_pdu(self, pdu: bytes) -> bytes:
+        function = pdu[0]
+        if self.config.is_error():
+            return self.exception(function, SLAVE_DEVICE_FAILURE)
+        if function == READ_HOLDING_REGISTERS:
+            address, count = struct.unpack(">HH", pdu[1:5])
+            if not 1 <= count <= 125:
+                return self.exception(function, ILLEGAL_DATA_VALUE)
+            values = [self.read_register(address + i) for i in range(count)]
+            return struct.pack(f">BB{count}H", function, count * 2, *values)
+        if function == WRITE_SINGLE_REGISTER:
+            address, value = struct.unpack(">HH", pdu[1:5])
+            self.write_register(address, value)
+            return pdu[:5]
+        if function == WRITE_MULTIPLE_REGISTERS:
+            address, count, _ = struct.unpack(">HHB", pdu[1:6])
+            values = struct.unpack(f">{count}H", pdu[6 : 6 + count * 2])
+            for i, value in enumerate(values):
+                self.write_register(address + i, value)
+            return struct.pack(">BHH", function, address, count)
+        return self.exception(function, ILLEGAL_FUNCTION)
+
+    async def read_frame(self, reader: asyncio.StreamReader) -> Optional[tuple]:
+        try:
+            header = await reader.readexactly(self.header.size)
+            transaction, protocol, length, unit = self.header.unpack(header)
+            pdu = await reader.readexactly(length - 1)
+        except asyncio.IncompleteReadError:
+            return None
+        return transaction, protocol, unit, pdu
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                frame = await self.read_frame(reader)
+                if frame is None:
+                    break
+                transaction, protocol, unit, pdu = frame
+                answer = self.handle_pdu(pdu)
+                if self.config.is_dropped():
+                    continue
+                await self.wait()
+                header = self.header.pack(transaction, protocol, len(answer) + 1, unit)
+                writer.write(header + answer)
+                await writer.drain()
+        except ConnectionError as e:
+            logger.debug(f"[{self.name}.handle_client] {e}")
+        finally:
+            writer.close()
+
+
+class ChopperSimulator(ModbusTcpSimulator):
+    """
+    Step motor driver of chopper behind Waveshare Modbus TCP gateway.
+    Motions are finished immediately, position is 10000 pulses per revolution.
+    Hot/cold sensors DI2/DI3 (register 0x0179) alternate every 90 degrees,
+    right sensor is shifted by `sensor_shift` degrees to allow alignment.
+    """
+
+    name = "Chopper"
+    default_port = 1111
+    pulses_per_revolution = 10000
+    sensor_shift = 4
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.position = 0
+        self.rotating = False
+
+    @staticmethod
+    def to_int32(high: int, low: int) -> int:
+        value = (high << 16) | low
+        return value - (1 << 32) if value & 0x80000000 else value
+
+    def angle(self) -> float:
+        return self.position * 360 / self.pulses_per_revolution
+
+    def is_hot(self, angle: float) -> bool:
+        return angle % 180 < 90
+
+    def read_register(self, address: int) -> int:
+        position = self.position & 0xFFFFFFFF
+        if address == 0x602C:
+            return position >> 16
+        if address == 0x602D:
+            return position & 0xFFFF
+        if address == 0x0179:
+            angle = self.angle()
+            left = self.is_hot(angle)
+            right = self.is_hot(angle - self.sensor_shift)
+            return (left << 1) | (right << 2)
+        return super().read_register(address)
+
+    def on_write(self, address: int, value: int) -> None:
+        if address != 0x6002:
+            return
+        if value == 0x010:
+            # PR0, relative motion, direction 0 - CW, 1 - CCW
+            steps = self.to_int32(
+                self.registers.get(0x6201, 0), self.registers.get(0x6202, 0)
+            )
+            sign = -1 if self.registers.get(0x007, 0) else 1
+            self.position += sign * steps
+        elif value == 0x011:
+            self.rotating = True
+        elif value == 0x012:
+            self.rotating = False
+        elif value == 0x013:
+            # PR2, absolute motion
+            self.position = self.to_int32(
+                self.registers.get(0x6219, 0), self.registers.get(0x621A, 0)
+            )
+        elif value == 0x021:
+            self.position = 0
+        elif value == 0x040:
+            self.rotating = False
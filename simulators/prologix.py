@@ -0,0 +1,83 @@
+import asyncio
+import logging
+from typing import Dict, Optional, Union
+
+from simulators.base import BaseSimulator
+from simulators.scpi import ScpiSimulator
+
+
+logger = logging.getLogger(__name__)
+
+
+class PrologixSimulator(BaseSimulator):
+    """
+    Prologix GPIB-Ethernet controller in CONTROLLER mode without read after write.
+    `++addr N` selects device, `++read eoi` returns pending answer of selected device,
+    other `++` commands are accepted silently.
+    Devices are SCPI simulators used as command processors, their own servers are not started:
+        PrologixSimulator(devices={22: KeithleySimulator(), 20: SpectrumFsek30Simulator()})
+    """
+
+    name = "Prologix"
+    default_port = 1234
+    terminator = b"\n"
+
+    def __init__(self, *args, devices: Dict[int, ScpiSimulator] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.devices: Dict[int, ScpiSimulator] = devices or {}
+        self.address: Optional[int] = None
+        self.pending: Dict[int, Union[str, bytes]] = {}
+        self.addr_count = 0
+
+    def handle_controller(self, cmd: str) -> Optional[Union[str, bytes]]:
+        name, _, args = cmd[2:].partition(" ")
+        name = name.lower()
+        if name == "addr":
+            if args.strip():
+                self.address = int(args)
+                self.addr_count += 1
+                return None
+            return str(self.address)
+        if name == "read":
+            return self.pending.pop(self.address, None)
+        if name == "ver":
+            return "Prologix GPIB-ETHERNET Controller version 01.06.06.00"
+        return None
+
+    def handle_device(self, cmd: str) -> None:
+        device = self.devices.get(self.address)
+        if device is None:
+            logger.debug(f"[{self.name}.handle_device] No device at {self.address}")
+            return
+        answer = device.handle_message(cmd)
+        if answer is not None:
+            self.pending[self.address] = answer
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    data = await reader.readuntil(self.terminator)
+                except asyncio.IncompleteReadError:
+                    break
+                cmd = data.decode("ascii", "replace").strip()
+                if not cmd:
+                    continue
+                if not cmd.startswith("++"):
+                    self.handle_device(cmd)
+                    continue
+                answer = self.handle_controller(cmd)
+                if answer is None or self.config.is_dropped():
+                    continue
+                # GPIB transfer of the whole answer
+                await self.wait()
+                if isinstance(answer, str):
+                    answer = answer.encode("ascii")
+                writer.write(answer + self.terminator)
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError) as e:
+            logger.debug(f"[{self.name}.handle_client] {e}")
+        finally:
+            writer.close()
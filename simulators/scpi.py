@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import re
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from simulators.base import BaseSimulator
+
+
+logger = logging.getLogger(__name__)
+
+VOWELS = "AEIOU"
+NODE_PATTERN = re.compile(r"^([A-Z*]+)(\d*)$")
+
+
+def short_node(node: str) -> str:
+    """
+    SCPI short form of mnemonic: first four letters,
+    or three if the fourth one is a vowel (PARameter -> PAR).
+    Numeric suffix 1 is the default and is dropped.
+    """
+    match = NODE_PATTERN.match(node)
+    if not match:
+        return node
+    name, suffix = match.groups()
+    if len(name) > 4:
+        name = name[:3] if name[3] in VOWELS else name[:4]
+    if suffix == "1":
+        suffix = ""
+    return f"{name}{suffix}"
+
+
+def normalize_header(header: str, abbreviate: bool = True) -> str:
+    header = header.strip().upper().lstrip(":")
+    if not abbreviate:
+        return header
+    query = header.endswith("?")
+    nodes = header.rstrip("?").split(":")
+    normalized = ":".join(short_node(node) for node in nodes)
+    return f"{normalized}?" if query else normalized
+
+
+class ScpiSimulator(BaseSimulator):
+    """
+    Line terminated SCPI instrument.
+    Commands are matched against `routes` by normalized short form header:
+        routes = [(r"SOUR(\\d*):VOLT\\?", "get_voltage"), ...]
+    Route handlers receive the regex match and arguments string
+    and return the answer for queries.
+    Unmatched setters are stored in `values`, unmatched queries read them back.
+    Instruments with non SCPI mnemonics set `abbreviate_headers = False`.
+    Handlers may return bytes for binary block answers.
+    """
+
+    name = "SCPI"
+    idn = "Simulator,SCPI,0,1.0"
+    terminator = b"\n"
+    error_answer = ""
+    abbreviate_headers = True
+    routes: List[Tuple[str, str]] = []
+    defaults: Dict[str, str] = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values: Dict[str, str] = dict(self.defaults)
+        self.compiled_routes: List[Tuple[re.Pattern, Callable]] = [
+            (re.compile(f"^{pattern}$"), getattr(self, method))
+            for pattern, method in self.routes
+        ]
+        self.commands_count = 0
+        self.event_status = 0
+
+    def handle_command(self, cmd: str) -> Optional[str]:
+        header, _, args = cmd.strip().partition(" ")
+        if not header:
+            return None
+        self.commands_count += 1
+        header = normalize_header(header, self.abbreviate_headers)
+        args = args.strip()
+        for pattern, handler in self.compiled_routes:
+            match = pattern.match(header)
+            if match:
+                return handler(match, args)
+        if header == "*IDN?":
+            return self.idn
+        if header == "*OPC":
+            self.event_status |= 1
+            return None
+        if header == "*ESR?":
+            event_status, self.event_status = self.event_status, 0
+            return str(event_status)
+        if header == "*CLS":
+            self.event_status = 0
+            return None
+        if header == "*WAI":
+            return None
+        if header in ("*OPC?", "*TST?"):
+            return "1" if header == "*OPC?" else "0"
+        if header.endswith("?"):
+            key = header[:-1]
+            if args:
+                key = f"{key} {args.upper()}"
+            return self.values.get(key, "0")
+        self.values[header] = args
+        return None
+
+    def handle_message(self, message: str) -> Optional[Union[str, bytes]]:
+        """Handle `;` joined program message, answers are joined with `;`"""
+        answers = []
+        for cmd in message.split(";"):
+            answer = self.handle_command(cmd)
+            if answer is not None:
+                answers.append(answer)
+        if not answers:
+            return None
+        if self.config.is_error():
+            return self.error_answer
+        if len(answers) == 1:
+            return answers[0]
+        return ";".join(answers)
+
+    async def read_message(self, reader: asyncio.StreamReader) -> Optional[bytes]:
+        try:
+            return await reader.readuntil(self.terminator)
+        except asyncio.IncompleteReadError:
+            return None
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                data = await self.read_message(reader)
+                if not data:
+                    break
+                answer = self.handle_message(data.decode("ascii", "replace"))
+                if answer is None or self.config.is_dropped():
+                    continue
+                await self.wait()
+                if isinstance(answer, str):
+                    answer = answer.encode("ascii")
+                writer.write(answer + self.terminator)
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError) as e:
+            logger.debug(f"[{self.name}.handle_client] {e}")
+        finally:
+            writer.close()
+
+    @staticmethod
+    def format_float(value: float) -> str:
+        return f"{value:.6E}"
+
+    @staticmethod
+    def format_block(data: bytes) -> bytes:
+        """IEEE 488.2 definite length binary block"""
+        length = str(len(data))
+        return f"#{len(length)}{length}".encode("ascii") + data
@@ -0,0 +1,165 @@
+import asyncio
+import math
+import random
+import time
+from typing import Optional
+
+from simulators.scpi import ScpiSimulator
+
+
+class SisJunctionModel:
+    """
+    Simple SIS junction I-V curve: subgap leakage, smeared gap rise,
+    optional photon assisted steps below the gap and first order bias settling.
+    All values in SI units.
+    """
+
+    def __init__(
+        self,
+        gap_voltage: float = 2.8e-3,
+        normal_resistance: float = 15,
+        leakage: float = 0.02,
+        gap_width: float = 0.05e-3,
+        photon_step: float = 0.95e-3,
+        pump: float = 0.0,
+        settle_time: float = 5e-3,
+        voltage_noise: float = 0.0,
+        current_noise: float = 0.0,
+    ):
+        self.gap_voltage = gap_voltage
+        self.normal_resistance = normal_resistance
+        self.leakage = leakage
+        self.gap_width = gap_width
+        self.photon_step = photon_step
+        self.pump = pump
+        self.settle_time = settle_time
+        self.voltage_noise = voltage_noise
+        self.current_noise = current_noise
+        self.target_voltage = 0.0
+        self.start_voltage = 0.0
+        self.set_time = time.perf_counter()
+        self.ctrl_current = 0.0
+        self.random = random.Random()
+
+    def step(self, voltage: float, edge: float) -> float:
+        return 0.5 * (1 + math.tanh((abs(voltage) - edge) / self.gap_width))
+
+    def current(self, voltage: float) -> float:
+        normal = voltage / self.normal_resistance
+        current = normal * (
+            self.leakage + (1 - self.leakage) * self.step(voltage, self.gap_voltage)
+        )
+        if self.pump and self.photon_step:
+            steps = int(self.gap_voltage // self.photon_step)
+            for k in range(1, steps + 1):
+                edge = self.gap_voltage - k * self.photon_step
+                current += (
+                    math.copysign(1, voltage)
+                    * self.pump
+                    * self.gap_voltage
+                    / self.normal_resistance
+                    / k
+                    * self.step(voltage, edge)
+                    * (1 - self.step(voltage, self.gap_voltage))
+                )
+        return current
+
+    def set_voltage(self, voltage: float) -> None:
+        self.start_voltage = self.voltage()
+        self.target_voltage = voltage
+        self.set_time = time.perf_counter()
+
+    def voltage(self) -> float:
+        elapsed = time.perf_counter() - self.set_time
+        settled = 1.0
+        if self.settle_time:
+            settled = 1 - math.exp(-elapsed / self.settle_time)
+        voltage = (
+            self.start_voltage + (self.target_voltage - self.start_voltage) * settled
+        )
+        if self.voltage_noise:
+            voltage += self.random.gauss(0, self.voltage_noise)
+        return voltage
+
+    def measure(self):
+        voltage = self.voltage()
+        current = self.current(voltage)
+        if self.current_noise:
+            current += self.random.gauss(0, self.current_noise)
+        return voltage, current
+
+
+class SisBlockSimulator(ScpiSimulator):
+    """
+    Scontel SIS block. Commands come without terminator,
+    each received chunk is handled as one command, every command is answered.
+    """
+
+    name = "SIS block"
+    default_port = 9876
+    terminator = b"\r\n"
+    error_answer = "ERROR"
+    routes = [
+        (r"BIAS:DEV\d*:VOLT\?", "get_bias_voltage"),
+        (r"BIAS:DEV\d*:VOLT", "set_bias_voltage"),
+        (r"BIAS:DEV\d*:CURR\?", "get_bias_current"),
+        (r"BIAS:DEV\d*:DATA\?", "get_bias_data"),
+        (r"BIAS:DEV\d*:CMRE\?", "get_resistance"),
+        (r"CTRL:DEV\d*:CURR\?", "get_ctrl_current"),
+        (r"CTRL:DEV\d*:CURR", "set_ctrl_current"),
+        (r"CTRL:DEV\d*:DATA\?", "get_ctrl_data"),
+        (r"(BIAS|CTRL):DEV\d*:SHOR\?", "get_short_status"),
+        (r"(BIAS|CTRL):DEV\d*:SHOR", "set_short_status"),
+        (r"GEN:DEV\d*:STAT\?", "get_status"),
+    ]
+
+    def __init__(self, *args, model: SisJunctionModel = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.model = model or SisJunctionModel()
+        self.short_status = {"BIAS": "1", "CTRL": "1"}
+
+    async def read_message(self, reader: asyncio.StreamReader) -> Optional[bytes]:
+        return await reader.read(1024)
+
+    def handle_command(self, cmd: str) -> Optional[str]:
+        answer = super().handle_command(cmd)
+        if answer is None and cmd.strip():
+            return "OK"
+        return answer
+
+    def get_bias_voltage(self, match, args) -> str:
+        return self.format_float(self.model.voltage())
+
+    def set_bias_voltage(self, match, args) -> str:
+        self.model.set_voltage(float(args))
+        return "OK"
+
+    def get_bias_current(self, match, args) -> str:
+        return self.format_float(self.model.measure()[1])
+
+    def get_bias_data(self, match, args) -> str:
+        voltage, current = self.model.measure()
+        return f"{self.format_float(voltage)},{self.format_float(current)}"
+
+    def get_resistance(self, match, args) -> str:
+        return self.format_float(self.model.normal_resistance)
+
+    def get_ctrl_current(self, match, args) -> str:
+        return self.format_float(self.model.ctrl_current)
+
+    def set_ctrl_current(self, match, args) -> str:
+        self.model.ctrl_current = float(args)
+        return "OK"
+
+    def get_ctrl_data(self, match, args) -> str:
+        return f"{self.format_float(self.model.ctrl_current)},0"
+
+    def get_short_status(self, match, args) -> str:
+        return self.short_status[match.group(1)]
+
+    def set_short_status(self, match, args) -> str:
+        self.short_status[match.group(1)] = args
+        return "OK"
+
+    def get_status(self, match, args) -> str:
+        return "OK"
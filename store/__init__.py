@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Dict, List, Union
 
 import settings
 from store.adapterConfig import AdapterManager
@@ -152,3 +152,20 @@ def store_configs(qsettings):
     LakeShoreTemperatureControllerManager.store_config(qsettings)
     RohdeSchwarzVnaZva67Manager.store_config(qsettings)
     RohdeSchwarzSpectrumFsek30Manager.store_config(qsettings)
+
+
+def get_device_configs() -> Dict[str, List[Dict]]:
+    """Configs of all devices by manager name, measures keep them as setup snapshot"""
+    managers = (
+        KeithleyPowerSupplyManager,
+        AgilentSignalGeneratorManager,
+        RigolPowerSupplyManager,
+        SumitomoF70Manager,
+        LakeShoreTemperatureControllerManager,
+        RohdeSchwarzVnaZva67Manager,
+        RohdeSchwarzSpectrumFsek30Manager,
+    )
+    return {
+        manager.name: [config.dict() for config in manager.configs]
+        for manager in managers
+    }
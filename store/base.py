@@ -1,12 +1,31 @@
 import json
+import logging
 import os
 from datetime import datetime
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, List, Tuple
 
 from PySide6 import QtGui
-from PySide6.QtCore import QAbstractTableModel, Qt, QModelIndex
+from PySide6.QtCore import QAbstractTableModel, Qt, QModelIndex, QObject, Signal
 from PySide6.QtWidgets import QFileDialog
 
+from store import get_device_configs
+from store.catalog import (
+    FORMAT_JSON,
+    FORMAT_NPZ,
+    CatalogEntry,
+    dump_json,
+    measure_catalog,
+    read_json,
+)
+from store.columns import get_columns_meta, to_serializable
+from store.export import load_npz, save_npz
+from store.journal import journal_writer, read_journal
+
+
+logger = logging.getLogger(__name__)
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 
 class MeasureType:
     IV_CURVE = "iv_curve"
@@ -73,22 +92,31 @@ class MeasureList(list):
         del self[index]
 
 
+class MeasureEvents(QObject):
+    """
+    Changes of measures list, emitted by `MeasureManager` from any thread,
+    so table model connected in GUI thread gets them queued
+    """
+
+    added = Signal(list)
+    changed = Signal(object)
+    removed = Signal(object)
+
+
 class MeasureManager:
-    table: "MeasureTableModel" = None
+    events = MeasureEvents()
     _instances: MeasureList["MeasureModel"] = MeasureList()
     latest_id = 0
 
     @classmethod
     def create(cls, *args, **kwargs) -> "MeasureModel":
         instance = MeasureModel(*args, **kwargs)
+        instance.configs = get_device_configs()
         cls._instances.append(instance)
+        journal_writer.add(instance)
+        cls.events.added.emit([instance])
         return instance
 
-    @classmethod
-    def update_table(cls):
-        if isinstance(cls.table, MeasureTableModel):
-            cls.table.updateData()
-
     @classmethod
     def all(cls):
         return cls._instances
@@ -110,37 +138,188 @@ class MeasureManager:
 
     @classmethod
     def delete_by_index(cls, index: int) -> None:
-        cls.all().delete_by_index(index)
-        cls.update_table()
+        cls.delete(cls.all()[index])
+
+    @classmethod
+    def delete(cls, measure: "MeasureModel") -> None:
+        journal_writer.remove(measure)
+        if measure.lazy:
+            measure_catalog.forget(measure)
+        cls.all().remove(measure)
+        cls.events.removed.emit(measure)
+
+    # Save dialog filters, binary ones write NPZ archive with JSON sidecar
+    FILTER_JSON = "JSON (*.json)"
+    FILTER_NPZ = "NumPy archive, memory-mapped on open (*.npz)"
+    FILTER_NPZ_COMPRESSED = "Compressed NumPy archive (*.npz)"
 
     @classmethod
     def save_by_index(cls, index: int) -> None:
-        measure = cls.all()[index]
-        results = measure.to_json()
-        caption = f"Saving {measure.type_display} started at {measure.started.strftime('%Y-%m-%d %H:%M:%S')}"
+        cls.save_to_file(cls.all()[index])
+
+    @classmethod
+    def save_to_file(cls, measure: "MeasureModel") -> None:
+        caption = f"Saving {measure.type_display} started at {measure.started.strftime(DATETIME_FORMAT)}"
         try:
-            filepath = QFileDialog.getSaveFileName(filter="*.json", caption=caption)[0]
+            filepath, selected_filter = QFileDialog.getSaveFileName(
+                filter=";;".join(
+                    [cls.FILTER_JSON, cls.FILTER_NPZ, cls.FILTER_NPZ_COMPRESSED]
+                ),
+                caption=caption,
+            )
             if not filepath:
                 return
-            if not filepath.endswith(".json"):
-                filepath += ".json"
-            with open(filepath, "w", encoding="utf-8") as file:
-                json.dump(results, file, ensure_ascii=False, indent=4)
+            if selected_filter in (cls.FILTER_NPZ, cls.FILTER_NPZ_COMPRESSED):
+                if not filepath.endswith(".npz"):
+                    filepath += ".npz"
+                save_npz(
+                    info=measure.info(),
+                    data=measure.data,
+                    filepath=filepath,
+                    compress=selected_filter == cls.FILTER_NPZ_COMPRESSED,
+                )
+                file_format = FORMAT_NPZ
+            else:
+                if not filepath.endswith(".json"):
+                    filepath += ".json"
+                with open(filepath, "w", encoding="utf-8") as file:
+                    json.dump(measure.to_json(), file, ensure_ascii=False, indent=4)
+                file_format = FORMAT_JSON
+            cls.add_to_catalog([measure], filepath, file_format)
             measure.saved = True
             measure.save(finish=False)
         except (IndexError, FileNotFoundError):
             pass
 
+    @classmethod
+    def load(cls, filepath: str) -> List["MeasureModel"]:
+        """Load measures saved to JSON (single or `save_all` dump) or NPZ archive"""
+        spans = None
+        if filepath.endswith(".npz"):
+            items = [load_npz(filepath)]
+        else:
+            items, spans = read_json(filepath)
+            if isinstance(items, dict):
+                items, spans = [items], None
+        measures = []
+        for item in items:
+            measure = MeasureModel.from_json(item)
+            cls._instances.append(measure)
+            measures.append(measure)
+        cls.add_to_catalog(
+            measures,
+            filepath,
+            FORMAT_NPZ if filepath.endswith(".npz") else FORMAT_JSON,
+            spans=spans,
+        )
+        cls.events.added.emit(measures)
+        return measures
+
+    @classmethod
+    def add_to_catalog(
+        cls,
+        measures: List["MeasureModel"],
+        filepath: str,
+        file_format: str,
+        spans: List[Tuple[int, int]] = None,
+    ) -> None:
+        """Catalog saved measures, `spans` are bytes of items of `save_all` dump"""
+        try:
+            ids = measure_catalog.add_many(
+                [
+                    {
+                        "info": measure.info(),
+                        "data": measure.data,
+                        "filepath": filepath,
+                        "file_format": file_format,
+                        "position": -1 if spans is None else position,
+                        "span": (-1, -1) if spans is None else spans[position],
+                        "configs": measure.configs,
+                    }
+                    for position, measure in enumerate(measures)
+                ]
+            )
+        except Exception as e:
+            logger.error(f"[{cls.__name__}.add_to_catalog] {filepath}: {e}")
+            return
+        for measure, catalog_id in zip(measures, ids):
+            measure.catalog_id = catalog_id
+
+    @classmethod
+    def load_history(cls, directory: str = "dumps") -> List["MeasureModel"]:
+        """
+        Add measures of the catalog which are not opened yet, their data is loaded on access.
+        Dumps of `directory` are added to the catalog first.
+        """
+        added = measure_catalog.index_directory(directory)
+        if added:
+            logger.info(
+                f"[{cls.__name__}.load_history] Added {added} measures of {directory} to catalog"
+            )
+        opened = {measure.catalog_id for measure in cls.all()}
+        measures = []
+        for entry in reversed(measure_catalog.query()):
+            if entry.id in opened:
+                continue
+            measure = MeasureModel.from_catalog(entry)
+            cls._instances.append(measure)
+            measures.append(measure)
+        if measures:
+            cls.events.added.emit(measures)
+        return measures
+
+    @classmethod
+    def recover(cls) -> List["MeasureModel"]:
+        """Restore measures from journals left by crashed or killed session"""
+        measures = []
+        for path in journal_writer.get_orphaned():
+            try:
+                item = read_journal(path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"[{cls.__name__}.recover] Unable to read {path}: {e}")
+                continue
+            # journal is kept until the recovered measure is dumped on clean exit
+            if item is None:
+                journal_writer.adopt(path)
+                continue
+            measure = MeasureModel.from_journal(**item)
+            journal_writer.adopt(path, measure)
+            cls._instances.append(measure)
+            measures.append(measure)
+        if measures:
+            logger.info(
+                f"[{cls.__name__}.recover] Recovered {len(measures)} measures from journal"
+            )
+            cls.events.added.emit(measures)
+        return measures
+
+    @classmethod
+    def open_file(cls) -> None:
+        filepath = QFileDialog.getOpenFileName(
+            filter="Measure (*.json *.npz)", caption="Open measure"
+        )[0]
+        if not filepath:
+            return
+        try:
+            measures = cls.load(filepath)
+            logger.info(
+                f"[{cls.__name__}.open_file] Loaded {len(measures)} measures from {filepath}"
+            )
+        except Exception as e:
+            logger.error(f"[{cls.__name__}.open_file] Unable to load {filepath}: {e}")
+
     @classmethod
     def save_all(cls):
-        data = [m.to_json() for m in cls.all()]
+        # measures restored from the catalog are in their files already
+        measures = [m for m in cls.all() if not m.lazy]
+        data = [m.to_json() for m in measures]
         if not data:
             return
         if not os.path.exists("dumps"):
             os.mkdir("dumps")
         filepath = f"dumps/dump_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.json"
-        with open(filepath, "w", encoding="utf-8") as file:
-            json.dump(data, file, ensure_ascii=False, indent=4)
+        spans = dump_json(data, filepath)
+        cls.add_to_catalog(measures, filepath, FORMAT_JSON, spans=spans)
 
 
 class MeasureModel:
@@ -165,13 +344,31 @@ class MeasureModel:
         self.validate_type(value=measure_type)
         # Setting attrs
         self.measure_type = measure_type
-        self.data = data
+        self._data = data
         self.objects.latest_id += 1
         self.id = self.objects.latest_id
         self.started = datetime.now()
         self.finished = finished
         self.saved = False
         self.comment = ""
+        self.configs = {}
+        self.catalog_id = None
+        self.catalog_entry: Union[CatalogEntry, None] = None
+        # data is read from catalog file on access and may be evicted
+        self.lazy = False
+
+    @property
+    def data(self):
+        if self.lazy:
+            return measure_catalog.get_payload(self)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        if self.lazy:
+            measure_catalog.forget(self)
+            self.lazy = False
+        self._data = value
 
     @staticmethod
     def validate_type(value: str) -> None:
@@ -190,9 +387,50 @@ class MeasureModel:
     def save(self, finish: bool = True):
         if finish:
             self.finished = datetime.now()
-        self.objects.update_table()
+            journal_writer.finish(self)
+        if self.catalog_id is not None:
+            measure_catalog.update_comment(self.catalog_id, self.comment)
+        self.objects.events.changed.emit(self)
 
-    def to_json(self):
+    @classmethod
+    def from_json(cls, data: Dict) -> "MeasureModel":
+        """Restore saved measure, it gets a new id"""
+        cls.validate_type(value=data["type"])
+        measure = cls(measure_type=data["type"], data=data.get("data", {}))
+        measure.comment = data.get("comment", "")
+        measure.started = datetime.strptime(data["started"], DATETIME_FORMAT)
+        measure.finished = datetime.strptime(data["finished"], DATETIME_FORMAT)
+        measure.configs = data.get("configs", {})
+        measure.saved = True
+        return measure
+
+    @classmethod
+    def from_catalog(cls, entry: CatalogEntry) -> "MeasureModel":
+        """Measure of the catalog, data is read from file on access"""
+        measure = cls(measure_type=entry.measure_type, data=None)
+        measure.comment = entry.comment
+        measure.started = entry.started
+        measure.finished = entry.finished or "--"
+        measure.configs = entry.configs
+        measure.saved = True
+        measure.catalog_id = entry.id
+        measure.catalog_entry = entry
+        measure.lazy = True
+        return measure
+
+    @classmethod
+    def from_journal(cls, info: Dict, data: Any) -> "MeasureModel":
+        """Restore measure of crashed session, it gets a new id"""
+        cls.validate_type(value=info["type"])
+        measure = cls(measure_type=info["type"], data=data)
+        measure.comment = info.get("comment", "")
+        measure.started = datetime.fromisoformat(info["started"])
+        if info.get("finished"):
+            measure.finished = datetime.fromisoformat(info["finished"])
+        measure.configs = info.get("configs", {})
+        return measure
+
+    def info(self) -> Dict:
         finished = self.finished
         if finished == "--":
             finished = datetime.now()
@@ -201,19 +439,53 @@ class MeasureModel:
             "comment": self.comment,
             "type": self.measure_type,
             "measure": self.type_display,
-            "started": self.started.strftime("%Y-%m-%d %H:%M:%S"),
-            "finished": finished.strftime("%Y-%m-%d %H:%M:%S"),
-            "data": self.data,
+            "started": self.started.strftime(DATETIME_FORMAT),
+            "finished": finished.strftime(DATETIME_FORMAT),
+            "configs": self.configs,
+        }
+
+    def to_json(self):
+        return {
+            **self.info(),
+            "data": to_serializable(self.data),
+            "columns": get_columns_meta(self.data),
         }
 
 
 class MeasureTableModel(QAbstractTableModel):
+    """
+    Table of measures updated by rows on `MeasureManager.events`,
+    so selection and scroll of the view are kept while measures are added and saved
+    """
+
     manager = MeasureManager
+    SortRole = Qt.ItemDataRole.UserRole
 
     def __init__(self, data=None):
         super().__init__()
+        self.measures: List[MeasureModel] = []
         self._data = []
         self._headers = ["Id", "Type", "Comment", "Started", "Finished", "Saved"]
+        self.manager.events.added.connect(self.addMeasures)
+        self.manager.events.changed.connect(self.updateMeasure)
+        self.manager.events.removed.connect(self.removeMeasure)
+        self.updateData()
+
+    @staticmethod
+    def get_row(measure: MeasureModel) -> List:
+        return [
+            measure.id,
+            measure.type_display,
+            measure.comment,
+            measure.started,
+            measure.finished,
+            measure.saved,
+        ]
+
+    def get_measure(self, row: int) -> Union[MeasureModel, None]:
+        if 0 <= row < len(self.measures):
+            return self.measures[row]
+        return None
 
     def data(self, index, role):
         if not self._data:
@@ -231,6 +503,13 @@ class MeasureTableModel(QAbstractTableModel):
             return value
         if role == Qt.ItemDataRole.TextAlignmentRole:
             return Qt.AlignmentFlag.AlignCenter
+        if role == self.SortRole:
+            if isinstance(value, datetime):
+                return value.timestamp()
+            if index.column() == 4:
+                # measure in progress is not finished ("--") yet
+                return float("inf")
+            return value
 
     def setData(self, index: QModelIndex, value: Any, role: int = ...) -> bool:
         if index.isValid() and role == Qt.ItemDataRole.EditRole:
@@ -242,14 +521,45 @@ class MeasureTableModel(QAbstractTableModel):
         return False
 
     def updateData(self):
+        """Rebuild all rows, measures changed by events are updated by rows"""
         self.beginResetModel()
-        measures = self.manager.all()
-        self._data = [
-            [m.id, m.type_display, m.comment, m.started, m.finished, m.saved]
-            for m in measures
-        ]
+        self.measures = list(self.manager.all())
+        self._data = [self.get_row(m) for m in self.measures]
         self.endResetModel()
 
+    def addMeasures(self, measures: List[MeasureModel]):
+        # measure may be removed before queued event is delivered
+        alive = set(map(id, self.manager.all()))
+        shown = set(map(id, self.measures))
+        measures = [m for m in measures if id(m) in alive and id(m) not in shown]
+        if not measures:
+            return
+        first = len(self.measures)
+        self.beginInsertRows(QModelIndex(), first, first + len(measures) - 1)
+        self.measures.extend(measures)
+        self._data.extend(self.get_row(m) for m in measures)
+        self.endInsertRows()
+
+    def updateMeasure(self, measure: MeasureModel):
+        try:
+            row = self.measures.index(measure)
+        except ValueError:
+            return
+        self._data[row] = self.get_row(measure)
+        self.dataChanged.emit(
+            self.index(row, 0), self.index(row, len(self._headers) - 1)
+        )
+
+    def removeMeasure(self, measure: MeasureModel):
+        try:
+            row = self.measures.index(measure)
+        except ValueError:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.measures[row]
+        del self._data[row]
+        self.endRemoveRows()
+
     def headerData(self, section, orientation, role):
         if role == Qt.ItemDataRole.DisplayRole:
             if orientation == Qt.Orientation.Horizontal:
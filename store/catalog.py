@@ -0,0 +1,487 @@
+"""
+SQLite catalog of measures saved to files.
+Every saved measure (single JSON or NPZ file, or item of `save_all` dump) is a row with
+type, comment, start/finish, device configs, file location and summary of its columns,
+so measures of earlier sessions are found by indexed queries without reading their files:
+    entries = measure_catalog.query(measure_type=MeasureType.IV_CURVE, started_from=datetime(2024, 1, 1))
+    payload = measure_catalog.load_payload(entries[0])
+Measures restored from the catalog keep only the row in memory, their data is read from file
+on first access and evicted from the LRU cache of `cache_size` payloads.
+"""
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from store.columns import Column
+from store.export import load_npz
+from store.journal import iter_leaves
+
+
+logger = logging.getLogger(__name__)
+
+CATALOG_PATH = "catalog.sqlite3"
+FORMAT_JSON = "json"
+FORMAT_NPZ = "npz"
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS measures (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    measure_type TEXT NOT NULL,
+    comment TEXT NOT NULL DEFAULT '',
+    started TEXT NOT NULL,
+    finished TEXT,
+    filepath TEXT NOT NULL,
+    file_format TEXT NOT NULL,
+    position INTEGER NOT NULL DEFAULT -1,
+    byte_offset INTEGER NOT NULL DEFAULT -1,
+    byte_length INTEGER NOT NULL DEFAULT -1,
+    points INTEGER NOT NULL DEFAULT 0,
+    configs TEXT NOT NULL DEFAULT '{}',
+    stats TEXT NOT NULL DEFAULT '{}',
+    -- case folded comment, NOCASE collation of SQLite folds ASCII only
+    comment_key TEXT NOT NULL DEFAULT '',
+    UNIQUE (filepath, position)
+);
+"""
+INDEXES = """
+CREATE INDEX IF NOT EXISTS measures_type_started ON measures (measure_type, started);
+CREATE INDEX IF NOT EXISTS measures_started ON measures (started);
+CREATE INDEX IF NOT EXISTS measures_comment_key ON measures (comment_key);
+"""
+
+
+class CatalogEntry(NamedTuple):
+    id: int
+    measure_type: str
+    comment: str
+    started: datetime
+    finished: Optional[datetime]
+    filepath: str
+    file_format: str
+    position: int  # index of measure in `save_all` dump, -1 for single measure file
+    byte_offset: int  # measure in dump, whole file is read if -1
+    byte_length: int
+    points: int
+    configs: Dict
+    stats: Dict
+
+
+def get_stats(data: Any) -> Dict[str, Dict]:
+    """Count, min, max and mean of numeric columns and lists by dotted path"""
+    stats = {}
+    for path, value in iter_leaves(data):
+        if isinstance(value, Column):
+            array = value.array
+        elif isinstance(value, (list, np.ndarray)) and len(value):
+            try:
+                array = np.asarray(value, dtype=float)
+            except (TypeError, ValueError):
+                continue
+        else:
+            continue
+        if np.iscomplexobj(array):
+            array = np.abs(array)
+        if not np.issubdtype(array.dtype, np.number) or not array.size:
+            continue
+        with np.errstate(all="ignore"):
+            stats[".".join(str(key) for _, key in path)] = {
+                "count": int(len(array)),
+                "min": float(np.nanmin(array)),
+                "max": float(np.nanmax(array)),
+                "mean": float(np.nanmean(array)),
+            }
+    return stats
+
+
+def read_json(filepath: str) -> Tuple[Any, List[Tuple[int, int]]]:
+    """
+    Content of JSON file and `(offset, length)` bytes of every item if it is a list (`save_all` dump),
+    so one item is read later without parsing the whole dump
+    """
+    with open(filepath, "rb") as file:
+        raw = file.read()
+    text = raw.decode("utf-8")
+    index = WHITESPACE.match(text).end()
+    if not text.startswith("[", index):
+        return json.loads(text), []
+    is_ascii = len(raw) == len(text)
+    decoder = json.JSONDecoder()
+    items, spans = [], []
+    index = WHITESPACE.match(text, index + 1).end()
+    # whitespace and commas are one byte, so byte offset follows char index
+    offset = len(text[:index].encode("utf-8"))
+    if text.startswith("]", index):
+        return items, spans
+    while True:
+        item, end = decoder.raw_decode(text, index)
+        length = end - index if is_ascii else len(text[index:end].encode("utf-8"))
+        items.append(item)
+        spans.append((offset, length))
+        offset += length
+        index = WHITESPACE.match(text, end).end()
+        if text.startswith("]", index):
+            return items, spans
+        if not text.startswith(",", index):
+            raise ValueError(f"Expecting ',' delimiter at {index} of {filepath}")
+        next_index = WHITESPACE.match(text, index + 1).end()
+        offset += next_index - end
+        index = next_index
+
+
+def dump_json(items: List, filepath: str) -> List[Tuple[int, int]]:
+    """Write list of measures as JSON, returns `(offset, length)` bytes of every item"""
+    spans = []
+    with open(filepath, "wb") as file:
+        file.write(b"[")
+        for position, item in enumerate(items):
+            file.write(b",\n" if position else b"\n")
+            chunk = json.dumps(item, ensure_ascii=False, indent=4).encode("utf-8")
+            spans.append((file.tell(), len(chunk)))
+            file.write(chunk)
+        file.write(b"\n]")
+    return spans
+
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class MeasureCatalog:
+    def __init__(self, path: str = CATALOG_PATH, cache_size: int = 32):
+        self.path = path
+        self.cache_size = cache_size
+        # catalog id: measure with loaded payload, the least recently used first
+        self.cache: OrderedDict = OrderedDict()
+        self.loads = 0
+        self.evictions = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.executescript(SCHEMA)
+            self.migrate(self._connection)
+            self._connection.executescript(INDEXES)
+        return self._connection
+
+    @staticmethod
+    def migrate(connection: sqlite3.Connection) -> None:
+        """Add case folded comments to catalog created without them"""
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(measures)")}
+        if "comment_key" in columns:
+            return
+        with connection:
+            connection.execute("DROP INDEX IF EXISTS measures_comment")
+            connection.execute(
+                "ALTER TABLE measures ADD COLUMN comment_key TEXT NOT NULL DEFAULT ''"
+            )
+            connection.executemany(
+                "UPDATE measures SET comment_key = ? WHERE id = ?",
+                [
+                    (comment.casefold(), catalog_id)
+                    for catalog_id, comment in connection.execute(
+                        "SELECT id, comment FROM measures"
+                    ).fetchall()
+                ],
+            )
+
+    def add(
+        self,
+        info: Dict,
+        data: Any,
+        filepath: str,
+        file_format: str,
+        position: int = -1,
+        span: Tuple[int, int] = (-1, -1),
+        configs: Dict = None,
+    ) -> int:
+        """Add saved measure, the existing row of the same file and position is updated"""
+        return self.add_many(
+            [
+                {
+                    "info": info,
+                    "data": data,
+                    "filepath": filepath,
+                    "file_format": file_format,
+                    "position": position,
+                    "span": span,
+                    "configs": configs,
+                }
+            ]
+        )[0]
+
+    def add_many(self, items: List[Dict]) -> List[int]:
+        """Add measures in one transaction, items are `add` kwargs, returns ids"""
+        rows = [self.get_row(**item) for item in items]
+        ids = []
+        with self._lock, self.connection:
+            for row in rows:
+                self.connection.execute(
+                    "INSERT INTO measures "
+                    "(measure_type, comment, started, finished, filepath, file_format, "
+                    "position, byte_offset, byte_length, points, configs, stats, comment_key) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (filepath, position) DO UPDATE SET "
+                    "measure_type = excluded.measure_type, comment = excluded.comment, "
+                    "comment_key = excluded.comment_key, "
+                    "started = excluded.started, finished = excluded.finished, "
+                    "file_format = excluded.file_format, byte_offset = excluded.byte_offset, "
+                    "byte_length = excluded.byte_length, points = excluded.points, "
+                    "configs = excluded.configs, stats = excluded.stats",
+                    row,
+                )
+                ids.append(
+                    self.connection.execute(
+                        "SELECT id FROM measures WHERE filepath = ? AND position = ?",
+                        (row[4], row[6]),
+                    ).fetchone()[0]
+                )
+        return ids
+
+    def get_row(
+        self,
+        info: Dict,
+        data: Any,
+        filepath: str,
+        file_format: str,
+        position: int = -1,
+        span: Tuple[int, int] = (-1, -1),
+        configs: Dict = None,
+    ) -> Tuple:
+        stats = get_stats(data)
+        points = max((item["count"] for item in stats.values()), default=0)
+        finished = info.get("finished")
+        comment = info.get("comment", "")
+        return (
+            info["type"],
+            comment,
+            self.to_iso(info["started"]),
+            self.to_iso(finished) if finished else None,
+            os.path.abspath(filepath),
+            file_format,
+            position,
+            *span,
+            points,
+            json.dumps(configs or info.get("configs") or {}),
+            json.dumps(stats),
+            comment.casefold(),
+        )
+
+    @staticmethod
+    def to_iso(value: Any) -> str:
+        """ISO datetime of `datetime` or string in measure info format"""
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return datetime.fromisoformat(value).isoformat()
+
+    def update_comment(self, catalog_id: int, comment: str) -> None:
+        with self._lock, self.connection:
+            self.connection.execute(
+                "UPDATE measures SET comment = ?, comment_key = ? WHERE id = ?",
+                (comment, comment.casefold(), catalog_id),
+            )
+
+    def delete(self, catalog_id: int) -> None:
+        """Remove row, measure file is kept"""
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM measures WHERE id = ?", (catalog_id,))
+
+    def query(
+        self,
+        measure_type: str = None,
+        started_from: datetime = None,
+        started_to: datetime = None,
+        comment: str = None,
+        limit: int = None,
+        offset: int = 0,
+    ) -> List[CatalogEntry]:
+        """
+        Entries ordered by start, newest first.
+        Type and start range are searched by index, `comment` matches comments
+        starting with it (case insensitive for any script, also by index).
+        """
+        where, params = self.get_conditions(
+            measure_type, started_from, started_to, comment
+        )
+        sql = f"SELECT * FROM measures {where} ORDER BY started DESC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._lock:
+            rows = self.connection.execute(sql, params).fetchall()
+        return [self.to_entry(row) for row in rows]
+
+    def count(
+        self,
+        measure_type: str = None,
+        started_from: datetime = None,
+        started_to: datetime = None,
+        comment: str = None,
+    ) -> int:
+        where, params = self.get_conditions(
+            measure_type, started_from, started_to, comment
+        )
+        with self._lock:
+            return self.connection.execute(
+                f"SELECT COUNT(*) FROM measures {where}", params
+            ).fetchone()[0]
+
+    def get(self, catalog_id: int) -> Optional[CatalogEntry]:
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT * FROM measures WHERE id = ?", (catalog_id,)
+            ).fetchone()
+        return self.to_entry(row) if row else None
+
+    @staticmethod
+    def get_conditions(
+        measure_type: str = None,
+        started_from: datetime = None,
+        started_to: datetime = None,
+        comment: str = None,
+    ):
+        conditions, params = [], []
+        if measure_type:
+            conditions.append("measure_type = ?")
+            params.append(measure_type)
+        if started_from:
+            conditions.append("started >= ?")
+            params.append(started_from.isoformat())
+        if started_to:
+            conditions.append("started < ?")
+            params.append(started_to.isoformat())
+        if comment:
+            # prefix range of case folded comments is searched by index
+            key = comment.casefold()
+            conditions.append("comment_key >= ? AND comment_key < ?")
+            params += [key, f"{key}\U0010ffff"]
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    @staticmethod
+    def to_entry(row) -> CatalogEntry:
+        # case folded comment is the last column
+        values = list(row)[: len(CatalogEntry._fields)]
+        values[3] = parse_datetime(values[3])
+        values[4] = parse_datetime(values[4])
+        values[11] = json.loads(values[11])
+        values[12] = json.loads(values[12])
+        return CatalogEntry(*values)
+
+    def is_indexed(self, filepath: str) -> bool:
+        with self._lock:
+            return (
+                self.connection.execute(
+                    "SELECT 1 FROM measures WHERE filepath = ? LIMIT 1",
+                    (os.path.abspath(filepath),),
+                ).fetchone()
+                is not None
+            )
+
+    def index_file(self, filepath: str) -> int:
+        """Add measures of JSON (single or dump) or NPZ file, returns number of added measures"""
+        if filepath.endswith(".npz"):
+            item = load_npz(filepath)
+            self.add(item, item.get("data"), filepath, FORMAT_NPZ)
+            return 1
+        items, spans = read_json(filepath)
+        if isinstance(items, dict):
+            self.add(items, items.get("data"), filepath, FORMAT_JSON)
+            return 1
+        self.add_many(
+            [
+                {
+                    "info": item,
+                    "data": item.get("data"),
+                    "filepath": filepath,
+                    "file_format": FORMAT_JSON,
+                    "position": position,
+                    "span": span,
+                }
+                for position, (item, span) in enumerate(zip(items, spans))
+            ]
+        )
+        return len(items)
+
+    def index_directory(self, directory: str) -> int:
+        """Add measure files of directory which are not in the catalog yet"""
+        if not os.path.isdir(directory):
+            return 0
+        added = 0
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith((".json", ".npz")) or name.endswith(".meta.json"):
+                continue
+            filepath = os.path.join(directory, name)
+            if self.is_indexed(filepath):
+                continue
+            try:
+                added += self.index_file(filepath)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.error(
+                    f"[{self.__class__.__name__}.index_directory] {filepath}: {e}"
+                )
+        return added
+
+    @staticmethod
+    def load_payload(entry: CatalogEntry) -> Any:
+        """Measure data read from its file"""
+        if entry.file_format == FORMAT_NPZ:
+            return load_npz(entry.filepath).get("data")
+        if entry.byte_offset >= 0:
+            with open(entry.filepath, "rb") as file:
+                file.seek(entry.byte_offset)
+                return json.loads(file.read(entry.byte_length)).get("data")
+        with open(entry.filepath, encoding="utf-8") as file:
+            items = json.load(file)
+        if entry.position >= 0:
+            items = items[entry.position]
+        return items.get("data")
+
+    def get_payload(self, measure) -> Any:
+        """Data of measure restored from catalog, loaded if it was evicted"""
+        with self._lock:
+            if measure.catalog_id in self.cache:
+                self.cache.move_to_end(measure.catalog_id)
+                return measure._data
+            measure._data = self.load_payload(measure.catalog_entry)
+            self.loads += 1
+            self.cache[measure.catalog_id] = measure
+            while len(self.cache) > self.cache_size:
+                _, evicted = self.cache.popitem(last=False)
+                evicted._data = None
+                self.evictions += 1
+            return measure._data
+
+    def forget(self, measure) -> None:
+        """Drop cached payload, measure data is kept by measure itself"""
+        with self._lock:
+            self.cache.pop(measure.catalog_id, None)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def dict(self) -> Dict:
+        return {
+            "path": self.path,
+            "cache_size": self.cache_size,
+            "cached": len(self.cache),
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
+
+
+measure_catalog = MeasureCatalog()
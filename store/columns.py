@@ -0,0 +1,247 @@
+from typing import Any, Dict, Iterable, Tuple
+
+import numpy as np
+
+
+class Column:
+    """
+    Growable typed NumPy array of measured values.
+    Capacity is doubled when full, so appends are amortized O(1),
+    `array` is a view on filled rows without copying.
+    Rows may be arrays of fixed `shape` (VNA traces):
+        trace = Column(dtype=np.complex128, shape=(201,), unit="")
+        trace.append(vna_data["array"])
+    Column mimics list for threads and analysis code:
+    append, extend, len, indexing, iteration and `np.asarray(column)`.
+    """
+
+    min_capacity = 64
+
+    def __init__(
+        self,
+        dtype=np.float64,
+        unit: str = "",
+        shape: Tuple = (),
+        description: str = "",
+        capacity: int = None,
+        values: Iterable = None,
+    ):
+        self.dtype = np.dtype(dtype)
+        self.unit = unit
+        self.shape = tuple(shape)
+        self.description = description
+        self._data = np.empty(
+            (max(capacity or self.min_capacity, 1), *self.shape), dtype=self.dtype
+        )
+        self._size = 0
+        if values is not None:
+            self.extend(values)
+
+    @classmethod
+    def from_array(
+        cls, array: np.ndarray, unit: str = "", description: str = ""
+    ) -> "Column":
+        """
+        Wrap filled array without copying (memory-mapped file data),
+        the first append moves data to a new buffer.
+        """
+        column = cls(
+            dtype=array.dtype,
+            unit=unit,
+            shape=array.shape[1:],
+            description=description,
+            capacity=1,
+        )
+        column._data = array
+        column._size = len(array)
+        return column
+
+    def to_memory(self) -> None:
+        """Copy memory-mapped data to memory, so its file can be overwritten"""
+        if isinstance(self._data, np.memmap):
+            self._data = np.array(self.array)
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._data[: self._size]
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def reserve(self, size: int) -> None:
+        if size <= self.capacity:
+            return
+        data = np.empty((max(size, 2 * self.capacity), *self.shape), dtype=self.dtype)
+        data[: self._size] = self._data[: self._size]
+        self._data = data
+
+    def empty_value(self) -> Any:
+        """Value stored instead of None, NaN for inexact types"""
+        if np.issubdtype(self.dtype, np.inexact):
+            return np.nan
+        return 0
+
+    def append(self, value: Any) -> None:
+        if self._size == self.capacity:
+            self.reserve(self._size + 1)
+        self._data[self._size] = self.empty_value() if value is None else value
+        self._size += 1
+
+    def extend(self, values: Iterable) -> None:
+        values = np.asarray(
+            [self.empty_value() if value is None else value for value in values]
+            if not isinstance(values, np.ndarray)
+            else values,
+            dtype=self.dtype,
+        ).reshape((-1, *self.shape))
+        self.reserve(self._size + len(values))
+        self._data[self._size : self._size + len(values)] = values
+        self._size += len(values)
+
+    def clear(self) -> None:
+        self._data = np.empty((self.min_capacity, *self.shape), dtype=self.dtype)
+        self._size = 0
+
+    def take(self, indexes: Iterable[int]) -> "Column":
+        """New column with the same metadata and rows at `indexes`"""
+        return self.__class__(
+            dtype=self.dtype,
+            unit=self.unit,
+            shape=self.shape,
+            description=self.description,
+            values=self.array[np.asarray(indexes, dtype=int)],
+        )
+
+    def tolist(self) -> list:
+        return self.array.tolist()
+
+    def to_json(self) -> Any:
+        """JSON compatible values, complex values are split to real and imaginary parts"""
+        if np.issubdtype(self.dtype, np.complexfloating):
+            return {"real": self.array.real.tolist(), "imag": self.array.imag.tolist()}
+        return self.array.tolist()
+
+    def dict(self) -> Dict:
+        return {
+            "dtype": self.dtype.name,
+            "unit": self.unit,
+            "shape": list(self.shape),
+            "description": self.description,
+            "length": self._size,
+        }
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if dtype is None:
+            return self.array
+        return self.array.astype(dtype)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index):
+        return self.array[index]
+
+    def __iter__(self):
+        return iter(self.array)
+
+    def __repr__(self):
+        unit = f", unit={self.unit!r}" if self.unit else ""
+        return f"{self.__class__.__name__}({self.tolist()!r}{unit})"
+
+
+def to_serializable(data: Any) -> Any:
+    """Replace columns and NumPy values in nested measure data with JSON compatible ones"""
+    if isinstance(data, Column):
+        return data.to_json()
+    if isinstance(data, dict):
+        return {key: to_serializable(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [to_serializable(value) for value in data]
+    if isinstance(data, np.ndarray):
+        return data.tolist()
+    if isinstance(data, np.generic):
+        return data.item()
+    return data
+
+
+def get_columns_meta(data: Any, prefix: str = "") -> Dict[str, Dict]:
+    """Metadata of all columns in nested measure data by dotted path"""
+    if isinstance(data, Column):
+        return {prefix: data.dict()}
+    meta = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            meta.update(
+                get_columns_meta(value, f"{prefix}.{key}" if prefix else f"{key}")
+            )
+    elif isinstance(data, list):
+        for index, value in enumerate(data):
+            meta.update(
+                get_columns_meta(value, f"{prefix}.{index}" if prefix else f"{index}")
+            )
+    return meta
+
+
+class TimeSeriesBuffer:
+    """
+    Fixed capacity ring buffer of (x, y) samples for live stream plots.
+    Every sample is written twice, at `i` and `i + capacity`, so the filled part
+    is always a contiguous slice and `x`, `y` are views passed to `setData` without copying.
+    Append is O(1), samples older than `window` (in x units) are dropped by index,
+    the oldest sample is overwritten when the buffer is full:
+        buffer = TimeSeriesBuffer(window=60)
+        buffer.append(elapsed, power)
+        curve.setData(buffer.x, buffer.y)
+    Views are valid until the next append.
+    """
+
+    def __init__(self, capacity: int = 100000, window: float = None, dtype=np.float64):
+        self.capacity = max(int(capacity), 1)
+        self.window = window
+        self.dtype = np.dtype(dtype)
+        self._x = np.empty(2 * self.capacity, dtype=self.dtype)
+        self._y = np.empty(2 * self.capacity, dtype=self.dtype)
+        self._start = 0
+        self._size = 0
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._x[self._start : self._start + self._size]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._y[self._start : self._start + self._size]
+
+    def append(self, x: float, y: float) -> None:
+        if x is None:
+            return
+        y = np.nan if y is None else y
+        index = (self._start + self._size) % self.capacity
+        self._x[index] = self._x[index + self.capacity] = x
+        self._y[index] = self._y[index + self.capacity] = y
+        if self._size == self.capacity:
+            self._start = (self._start + 1) % self.capacity
+        else:
+            self._size += 1
+        if self.window is not None:
+            self.trim(x - self.window)
+
+    def trim(self, x_min: float) -> None:
+        """Drop samples with x less than `x_min`, x must be increasing"""
+        drop = int(np.searchsorted(self.x, x_min, side="left"))
+        if not drop:
+            return
+        self._start = (self._start + drop) % self.capacity
+        self._size -= drop
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
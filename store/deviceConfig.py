@@ -96,6 +96,11 @@ class DeviceConfig(QObject):
     def set_status(self, status: str):
         self.status = status
 
+    @property
+    def adapter_key(self) -> str:
+        """Connection of device, GPIB devices of one Prologix controller share it"""
+        return f"{self._adapter}:{self._host}:{self._port}"
+
     def dict(self):
         return dict(
             _name=self._name,
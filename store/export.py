@@ -0,0 +1,217 @@
+"""
+Binary export of measure data.
+Arrays of measure data are written to NPZ archive members `<path>.npy`,
+everything else (measure info, column units, scalars, strings) goes to the JSON sidecar
+`<name>.meta.json`, where arrays are replaced with {"$array": "<path>"} references.
+Archives written without compression are memory-mapped back by `load_npz`,
+so large VNA scans are opened without reading them into memory.
+Archive is written to a temporary file replacing the target when complete,
+arrays mapped from the target are copied to memory before.
+"""
+import json
+import logging
+import os
+import struct
+import zipfile
+from numbers import Number
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from store.columns import Column, to_serializable
+
+
+logger = logging.getLogger(__name__)
+
+ARRAY_KEY = "$array"
+META_MEMBER = "meta.json"
+FORMAT_VERSION = 1
+ZIP_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+
+
+def get_sidecar_path(filepath: str) -> str:
+    return f"{os.path.splitext(filepath)[0]}.meta.json"
+
+
+def is_numeric_list(value: Any) -> bool:
+    return (
+        isinstance(value, list)
+        and len(value) > 0
+        and all(isinstance(item, Number) for item in value)
+    )
+
+
+def split_arrays(data: Any, path: str = "") -> Tuple[Any, Dict[str, np.ndarray]]:
+    """
+    Move numeric arrays out of nested measure data.
+    Returns JSON compatible tree with array references and arrays by path.
+    """
+    arrays = {}
+    if isinstance(data, Column):
+        arrays[path] = data.array
+        return {ARRAY_KEY: path, **data.dict()}, arrays
+    if isinstance(data, np.ndarray) and data.dtype != object:
+        arrays[path] = data
+        return {ARRAY_KEY: path}, arrays
+    if is_numeric_list(data):
+        arrays[path] = np.asarray(data)
+        return {ARRAY_KEY: path}, arrays
+    if isinstance(data, dict):
+        tree = {}
+        for key, value in data.items():
+            tree[key], value_arrays = split_arrays(
+                value, f"{path}/{key}" if path else f"{key}"
+            )
+            arrays.update(value_arrays)
+        return tree, arrays
+    if isinstance(data, (list, tuple)):
+        tree = []
+        for index, value in enumerate(data):
+            item, value_arrays = split_arrays(
+                value, f"{path}/{index}" if path else f"{index}"
+            )
+            tree.append(item)
+            arrays.update(value_arrays)
+        return tree, arrays
+    return to_serializable(data), arrays
+
+
+def join_arrays(tree: Any, arrays: Dict[str, np.ndarray]) -> Any:
+    """Inverse of `split_arrays`, arrays with column metadata are wrapped to columns"""
+    if isinstance(tree, dict):
+        if ARRAY_KEY in tree:
+            array = arrays[tree[ARRAY_KEY]]
+            if "dtype" not in tree:
+                return array
+            return Column.from_array(
+                array,
+                unit=tree.get("unit", ""),
+                description=tree.get("description", ""),
+            )
+        return {key: join_arrays(value, arrays) for key, value in tree.items()}
+    if isinstance(tree, list):
+        return [join_arrays(value, arrays) for value in tree]
+    return tree
+
+
+def is_mapped_from(array: Any, filepath: str) -> bool:
+    return (
+        isinstance(array, np.memmap)
+        and array.filename is not None
+        and os.path.normcase(array.filename)
+        == os.path.normcase(os.path.abspath(filepath))
+    )
+
+
+def copy_mapped(data: Any, filepath: str) -> Any:
+    """
+    Copy arrays of `data` memory-mapped from `filepath` to memory in place,
+    overwritten mapped file crashes the process (SIGBUS) on access.
+    """
+    if isinstance(data, Column):
+        if is_mapped_from(data._data, filepath):
+            data.to_memory()
+        return data
+    if is_mapped_from(data, filepath):
+        return np.array(data)
+    if isinstance(data, dict):
+        for key, value in data.items():
+            data[key] = copy_mapped(value, filepath)
+    elif isinstance(data, list):
+        for index, value in enumerate(data):
+            data[index] = copy_mapped(value, filepath)
+    return data
+
+
+def save_npz(info: Dict, data: Any, filepath: str, compress: bool = False) -> None:
+    """
+    Write measure `data` arrays to NPZ archive and `info` with the rest of data
+    to JSON sidecar. Arrays are streamed member by member.
+    """
+    if os.path.exists(filepath):
+        data = copy_mapped(data, filepath)
+    tree, arrays = split_arrays(data)
+    meta = {
+        **info,
+        "format": {
+            "name": "npz",
+            "version": FORMAT_VERSION,
+            "compressed": compress,
+        },
+        "data": tree,
+    }
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    tmp_path = f"{filepath}.tmp"
+    try:
+        with open(tmp_path, "wb") as tmp_file, zipfile.ZipFile(
+            tmp_file, "w", compression=compression
+        ) as archive:
+            for name, array in arrays.items():
+                with archive.open(f"{name}.npy", "w", force_zip64=True) as file:
+                    np.lib.format.write_array(
+                        file, np.ascontiguousarray(array), allow_pickle=False
+                    )
+            archive.writestr(META_MEMBER, json.dumps(meta, ensure_ascii=False))
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    with open(get_sidecar_path(filepath), "w", encoding="utf-8") as file:
+        json.dump(meta, file, ensure_ascii=False, indent=4)
+
+
+def map_member(filepath: str, info: zipfile.ZipInfo) -> np.ndarray:
+    """Memory-map not compressed `.npy` archive member"""
+    with open(filepath, "rb") as file:
+        file.seek(info.header_offset)
+        header = ZIP_LOCAL_HEADER.unpack(file.read(ZIP_LOCAL_HEADER.size))
+        name_length, extra_length = header[-2], header[-1]
+        file.seek(
+            info.header_offset + ZIP_LOCAL_HEADER.size + name_length + extra_length
+        )
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            header = np.lib.format.read_array_header_1_0(file)
+        else:
+            header = np.lib.format.read_array_header_2_0(file)
+        shape, fortran_order, dtype = header
+        offset = file.tell()
+    if not int(np.prod(shape)):
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(
+        filepath,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
+
+
+def load_npz(filepath: str, mmap: bool = True) -> Dict:
+    """
+    Load measure saved by `save_npz` in the format of `MeasureModel.to_json`.
+    Arrays of not compressed archives are memory-mapped read-only if `mmap`.
+    """
+    arrays = {}
+    with zipfile.ZipFile(filepath) as archive:
+        sidecar = get_sidecar_path(filepath)
+        if os.path.exists(sidecar):
+            with open(sidecar, encoding="utf-8") as file:
+                meta = json.load(file)
+        else:
+            meta = json.loads(archive.read(META_MEMBER))
+        for info in archive.infolist():
+            if not info.filename.endswith(".npy"):
+                continue
+            name = info.filename[: -len(".npy")]
+            if mmap and info.compress_type == zipfile.ZIP_STORED:
+                arrays[name] = map_member(filepath, info)
+                continue
+            with archive.open(info) as file:
+                arrays[name] = np.lib.format.read_array(file, allow_pickle=False)
+    logger.debug(f"[load_npz] Loaded {len(arrays)} arrays from {filepath}")
+    meta.pop("format", None)
+    meta["data"] = join_arrays(meta.get("data"), arrays)
+    return meta
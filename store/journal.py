@@ -0,0 +1,404 @@
+"""
+Crash-safe journal of measures in progress.
+Every measure created by `MeasureManager.create` gets an append-only journal file
+`journal/<id>_<started>.journal`. Background writer walks measure data every `interval`
+seconds and appends only new rows of every column as binary chunks and only new items
+of growing lists as JSON, other values are appended as JSON when they are changed, unchanged
+ones are not serialized again, file is fsynced after every pass. Scan threads are not involved, so cost of a measured point doesn't change
+and at most `interval` seconds of points are not on disk.
+Journals are removed on clean exit and recovered by `MeasureManager.recover` on the next launch:
+    measure = MeasureModel.objects.create(measure_type=MeasureType.IV_CURVE, data={})
+    ...  # crash
+    MeasureManager.recover()  # measures with data journaled before the crash
+
+Record is `<magic, type, length, crc32>` header and payload, reading stops
+at the first torn or corrupted record, so data of the last incomplete write is dropped.
+"""
+import glob
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from store.columns import Column, to_serializable
+
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_DIR = "journal"
+JOURNAL_EXTENSION = ".journal"
+RECORD_MAGIC = b"TJ"
+RECORD_HEADER = struct.Struct("<2sBII")
+COLUMN_HEADER = struct.Struct("<I")
+RECORD_INFO = 1
+RECORD_COLUMN = 2
+RECORD_VALUE = 3
+RECORD_EXTEND = 4
+CHUNK_BYTES = 1 << 20
+
+DICT = "dict"
+LIST = "list"
+IMMUTABLE = (str, bytes, int, float, complex, np.generic, type(None))
+
+
+def iter_leaves(data: Any, path: Tuple = ()) -> Iterator[Tuple[Tuple, Any]]:
+    """
+    Columns and other values of nested measure data by path,
+    path items are `(container, key)` pairs, so int keys of dicts and list indexes differ
+    """
+    if isinstance(data, dict) and data:
+        for key, value in list(data.items()):
+            yield from iter_leaves(value, path + ((DICT, key),))
+    elif isinstance(data, list) and any(
+        isinstance(item, (dict, list, Column)) for item in data
+    ):
+        for index, value in enumerate(list(data)):
+            yield from iter_leaves(value, path + ((LIST, index),))
+    else:
+        yield path, data
+
+
+def set_leaf(data: Any, path: List, value: Any) -> Any:
+    """Put `value` to nested `data` by path, missing containers are created"""
+    if not path:
+        return value
+    (container, key), rest = path[0], path[1:]
+    if data is None:
+        data = {} if container == DICT else []
+    if container == LIST:
+        while len(data) <= key:
+            data.append(None)
+        data[key] = set_leaf(data[key], rest, value)
+    else:
+        data[key] = set_leaf(data.get(key), rest, value)
+    return data
+
+
+def get_leaf(data: Any, path: List) -> Any:
+    for container, key in path:
+        try:
+            data = data[key]
+        except (IndexError, KeyError, TypeError):
+            return None
+    return data
+
+
+class MeasureJournal:
+    """Journal file of one measure, `sync` appends changes made since the previous call"""
+
+    def __init__(self, measure, directory: str = JOURNAL_DIR):
+        self.measure = measure
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(
+            directory,
+            f"{measure.id}_{measure.started.strftime('%Y-%m-%d_%H-%M-%S')}{JOURNAL_EXTENSION}",
+        )
+        self.file = open(self.path, "ab")
+        self.lock = threading.Lock()
+        self.columns: Dict[Tuple, Tuple[int, int]] = {}  # path: (id of column, rows)
+        self.values: Dict[Tuple, Tuple[Any, str]] = {}  # path: (value, record)
+        self.lists: Dict[Tuple, Tuple[list, int]] = {}  # path: (list, written items)
+        self.info = None
+        self.written = 0
+
+    def get_info(self) -> Dict:
+        finished = self.measure.finished
+        return {
+            "type": self.measure.measure_type,
+            "comment": self.measure.comment,
+            "started": self.measure.started.isoformat(),
+            "finished": finished.isoformat()
+            if hasattr(finished, "isoformat")
+            else None,
+            "root": LIST if isinstance(self.measure.data, list) else DICT,
+            "configs": self.measure.configs,
+        }
+
+    def write_record(self, record_type: int, payload: bytes) -> None:
+        self.file.write(
+            RECORD_HEADER.pack(
+                RECORD_MAGIC, record_type, len(payload), zlib.crc32(payload)
+            )
+        )
+        self.file.write(payload)
+        self.written += RECORD_HEADER.size + len(payload)
+
+    def write_column(self, path: Tuple, column: Column, start: int, array: np.ndarray):
+        row_bytes = max(array[:1].nbytes, 1)
+        step = max(CHUNK_BYTES // row_bytes, 1)
+        # empty column is written too, so it is recovered
+        for offset in range(0, max(len(array), 1), step):
+            header = json.dumps(
+                {
+                    "path": path,
+                    "start": start + offset,
+                    "dtype": column.dtype.str,
+                    "shape": list(column.shape),
+                    "unit": column.unit,
+                    "description": column.description,
+                }
+            ).encode()
+            chunk = np.ascontiguousarray(array[offset : offset + step])
+            self.write_record(
+                RECORD_COLUMN,
+                COLUMN_HEADER.pack(len(header)) + header + chunk.tobytes(),
+            )
+
+    def extend_list(self, path: Tuple, items: list) -> bool:
+        """
+        Append new items of list written before, False if list is new, replaced or shrunk.
+        Lists of scan threads only grow, items changed in place are not tracked.
+        """
+        written, length = self.lists.get(path, (None, 0))
+        size = len(items)
+        if written is not items or size < length:
+            return False
+        if size > length:
+            record = json.dumps(
+                {
+                    "path": path,
+                    "start": length,
+                    "values": to_serializable(items[length:size]),
+                }
+            )
+            self.write_record(RECORD_EXTEND, record.encode())
+            self.lists[path] = (items, size)
+            # the full record is outdated, replaced list is written again
+            self.values.pop(path, None)
+        return True
+
+    def sync(self) -> int:
+        """Append changes of measure, returns number of written bytes"""
+        with self.lock:
+            if self.file.closed:
+                return 0
+            written = self.written
+            info = json.dumps(self.get_info())
+            if info != self.info:
+                self.write_record(RECORD_INFO, info.encode())
+                self.info = info
+            for path, value in iter_leaves(self.measure.data):
+                if isinstance(value, Column) and not value.dtype.hasobject:
+                    array = value.array
+                    column_id, rows = self.columns.get(path, (None, 0))
+                    if column_id != id(value) or len(array) < rows:
+                        rows = 0
+                    if len(array) > rows or column_id != id(value):
+                        self.write_column(path, value, rows, array[rows:])
+                    self.columns[path] = (id(value), len(array))
+                    continue
+                if isinstance(value, list) and self.extend_list(path, value):
+                    continue
+                cached = self.values.get(path)
+                if (
+                    cached is not None
+                    and cached[0] is value
+                    and isinstance(value, IMMUTABLE)
+                ):
+                    continue
+                size = len(value) if isinstance(value, list) else 0
+                record = json.dumps(
+                    {
+                        "path": path,
+                        "value": to_serializable(value[:size] if size else value),
+                    }
+                )
+                if cached is None or cached[1] != record:
+                    self.write_record(RECORD_VALUE, record.encode())
+                self.values[path] = (value, record)
+                if isinstance(value, list):
+                    self.lists[path] = (value, size)
+                else:
+                    self.lists.pop(path, None)
+            if self.written != written:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+            return self.written - written
+
+    def close(self, remove: bool = False) -> None:
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class JournalWriter:
+    """
+    Background thread syncing journals of measures in progress every `interval` seconds.
+    Journals are closed after measure is finished and removed on clean exit.
+    """
+
+    def __init__(self, directory: str = JOURNAL_DIR, interval: float = 1.0):
+        self.directory = directory
+        self.interval = interval
+        self.enabled = True
+        self.journals: Dict[int, MeasureJournal] = {}
+        self.paths: List[str] = []  # journals of the session and recovered ones
+        # journal of measure is kept after it is finished until exit or delete
+        self.measure_paths: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, measure) -> None:
+        if not self.enabled:
+            return
+        try:
+            journal = MeasureJournal(measure, directory=self.directory)
+        except OSError as e:
+            logger.error(f"[{self.__class__.__name__}.add] {e}")
+            return
+        with self._lock:
+            self.journals[measure.id] = journal
+            self.paths.append(journal.path)
+            self.measure_paths[measure.id] = journal.path
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="JournalWriter", daemon=True
+                )
+                self._thread.start()
+
+    def finish(self, measure) -> None:
+        """Write the rest of finished measure and close its journal"""
+        with self._lock:
+            journal = self.journals.pop(measure.id, None)
+        if journal is not None:
+            self._sync(journal)
+            journal.close()
+
+    def adopt(self, path: str, measure=None) -> None:
+        """Journal of crashed session, it is removed with recovered `measure` or on exit"""
+        with self._lock:
+            self.paths.append(path)
+            if measure is not None:
+                self.measure_paths[measure.id] = path
+
+    def remove(self, measure) -> None:
+        """Measure is deleted, its journal is not needed, open or finished"""
+        with self._lock:
+            journal = self.journals.pop(measure.id, None)
+            path = self.measure_paths.pop(measure.id, None)
+            if path in self.paths:
+                self.paths.remove(path)
+        if journal is not None:
+            journal.close()
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+    def sync_all(self) -> None:
+        with self._lock:
+            journals = list(self.journals.values())
+        for journal in journals:
+            self._sync(journal)
+
+    def close_all(self, remove: bool = False) -> None:
+        """Close journals, data is saved or dropped by user on exit if `remove`"""
+        with self._lock:
+            journals = list(self.journals.values())
+            self.journals.clear()
+            self.measure_paths.clear()
+            paths, self.paths = self.paths, []
+        self._wakeup.set()
+        for journal in journals:
+            journal.close()
+        if remove:
+            for path in paths:
+                if os.path.exists(path):
+                    os.remove(path)
+            if os.path.isdir(self.directory) and not os.listdir(self.directory):
+                os.rmdir(self.directory)
+
+    def get_orphaned(self) -> List[str]:
+        """Journals left by crashed session"""
+        return sorted(
+            path
+            for path in glob.glob(os.path.join(self.directory, f"*{JOURNAL_EXTENSION}"))
+            if path not in self.paths
+        )
+
+    def _sync(self, journal: MeasureJournal) -> None:
+        try:
+            journal.sync()
+        except (OSError, RuntimeError, TypeError, ValueError) as e:
+            # data is changed by scan thread while walking or not serializable, next pass retries
+            logger.error(f"[{self.__class__.__name__}._sync] {journal.path}: {e}")
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            with self._lock:
+                if not self.journals:
+                    self._thread = None
+                    return
+            self.sync_all()
+
+
+def read_records(path: str) -> Iterator[Tuple[int, bytes]]:
+    with open(path, "rb") as file:
+        while True:
+            header = file.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            magic, record_type, length, crc = RECORD_HEADER.unpack(header)
+            payload = file.read(length)
+            if magic != RECORD_MAGIC or len(payload) < length:
+                logger.warning(f"[read_records] {path}: torn record is dropped")
+                return
+            if zlib.crc32(payload) != crc:
+                logger.warning(f"[read_records] {path}: corrupted record is dropped")
+                return
+            yield record_type, payload
+
+
+def read_journal(path: str) -> Optional[Dict]:
+    """Measure info and data rebuilt from journal, None if it has no info"""
+    info = None
+    data = None
+    for record_type, payload in read_records(path):
+        if record_type == RECORD_INFO:
+            info = json.loads(payload)
+            if data is None:
+                data = [] if info.get("root") == LIST else {}
+        elif record_type == RECORD_VALUE:
+            record = json.loads(payload)
+            data = set_leaf(data, record["path"], record["value"])
+        elif record_type == RECORD_EXTEND:
+            record = json.loads(payload)
+            items = get_leaf(data, record["path"])
+            if isinstance(items, list) and len(items) >= record["start"]:
+                items = items[: record["start"]] + record["values"]
+                data = set_leaf(data, record["path"], items)
+        elif record_type == RECORD_COLUMN:
+            (length,) = COLUMN_HEADER.unpack_from(payload)
+            header = json.loads(
+                payload[COLUMN_HEADER.size : COLUMN_HEADER.size + length]
+            )
+            dtype = np.dtype(header["dtype"])
+            values = np.frombuffer(
+                payload[COLUMN_HEADER.size + length :], dtype=dtype
+            ).reshape((-1, *header["shape"]))
+            column = get_leaf(data, header["path"])
+            if not isinstance(column, Column) or len(column) < header["start"]:
+                column = Column(
+                    dtype=dtype,
+                    unit=header["unit"],
+                    shape=header["shape"],
+                    description=header["description"],
+                )
+            elif len(column) > header["start"]:
+                column = column.take(range(header["start"]))
+            column.extend(values)
+            data = set_leaf(data, header["path"], column)
+    if info is None:
+        return None
+    return {"info": info, "data": data}
+
+
+journal_writer = JournalWriter()
@@ -24,6 +24,15 @@ class State:
     BLOCK_BIAS_POWER_MEASURE_THREAD = False
     BLOCK_DEMAG_THREAD = False
     BLOCK_BIAS_STEP_DELAY = 0.1
+    BLOCK_SETTLE_ADAPTIVE = False
+    BLOCK_BIAS_SETTLE_TOLERANCE = 0.005  # mV
+    BLOCK_CTRL_SETTLE_TOLERANCE = 0.01  # mA
+    BLOCK_SETTLE_STABLE_READS = 3
+    BLOCK_SETTLE_TIMEOUT = 1  # s
+    BLOCK_BIAS_SWEEP_ADAPTIVE = False
+    BLOCK_BIAS_ADAPTIVE_COARSE_POINTS = 50
+    BLOCK_BIAS_ADAPTIVE_MIN_STEP = 0.005  # mV
+    BLOCK_BIAS_ADAPTIVE_TOLERANCE = 1e-5
     BLOCK_BIAS_SHORT_STATUS = "1"
     BLOCK_CTRL_SHORT_STATUS = "1"
 
@@ -68,6 +77,7 @@ class State:
     NRX_APER_TIME = 50  # ms
     NRX_FILTER_TIME = 0.01
     NRX_IP = "169.254.2.20"
+    NRX_PORT = 5025
     NRX_STREAM_THREAD = False
     NRX_STREAM_PLOT_GRAPH = False
     NRX_STREAM_GRAPH_TIME = 60
@@ -89,7 +99,8 @@ class State:
     BIAS_REFL_VOLT_FROM = 0
     BIAS_REFL_VOLT_TO = 0
     BIAS_REFL_VOLT_POINTS = 300
-    BIAS_REFL_DELAY = 0.8
+    BIAS_REFL_DELAY = 0
+    BIAS_REFL_SINGLE_SWEEP = False
 
     # Agilent signal generator
     AGILENT_SIGNAL_GENERATOR_IP = "169.254.190.9"
@@ -1 +1,3 @@
 from .base import Thread
+from .batch import PlotStream, ProgressStream
+from .polling import PollJob, PollingScheduler, polling_scheduler
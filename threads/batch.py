@@ -0,0 +1,67 @@
+import time
+from typing import Dict, Optional
+
+from PySide6.QtCore import SignalInstance
+
+
+class PlotStream:
+    """
+    Batches plot points of scan thread and emits them with `signal` at most `rate` times per second.
+    Payload is the usual `plotNew` dict with lists of accumulated points:
+        stream = PlotStream(self.stream_iv)
+        stream.add(v * 1e3, i * 1e6, new_plot=step == 0, measure_id=measure.id)
+        ...
+        stream.flush()
+    Points of new curve (`new_plot`) or with other curve options flush the previous batch,
+    so every batch belongs to one curve.
+    """
+
+    def __init__(self, signal: SignalInstance, rate: float = 30):
+        self.signal = signal
+        self.interval = 1 / rate if rate else 0
+        self.batch: Optional[Dict] = None
+        self.last_flush = 0.0
+        self.points = 0
+        self.emitted = 0
+
+    def add(self, x: float, y: float, new_plot: bool = False, **kwargs) -> None:
+        if self.batch is None or new_plot or self.batch["options"] != kwargs:
+            self.flush()
+            self.batch = {"x": [], "y": [], "new_plot": new_plot, "options": kwargs}
+        self.batch["x"].append(x)
+        self.batch["y"].append(y)
+        self.points += 1
+        if time.perf_counter() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Emit accumulated points, must be called when scan is finished"""
+        if not self.batch or not self.batch["x"]:
+            return
+        batch = self.batch
+        self.signal.emit(
+            {
+                "x": batch["x"],
+                "y": batch["y"],
+                "new_plot": batch["new_plot"],
+                **batch["options"],
+            }
+        )
+        self.batch = {"x": [], "y": [], "new_plot": False, "options": batch["options"]}
+        self.last_flush = time.perf_counter()
+        self.emitted += 1
+
+
+class ProgressStream:
+    """Emits progress percent with `signal` only when it is changed"""
+
+    def __init__(self, signal: SignalInstance):
+        self.signal = signal
+        self.value = None
+
+    def set(self, value: int) -> None:
+        value = int(value)
+        if value == self.value:
+            return
+        self.value = value
+        self.signal.emit(value)
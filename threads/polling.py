@@ -0,0 +1,335 @@
+"""
+Polling of device monitors by one scheduler instead of thread per monitor.
+Monitor is `PollJob` with period and priority, jobs wait in the priority queue
+ordered by due time and are run by small pool of worker threads.
+Jobs with the same adapter `key` (host:port of socket or Prologix controller)
+are never run at the same time, so monitors don't compete for one connection.
+Overdue polls are not caught up: missed periods are merged to one poll and counted as skipped.
+
+    class KeithleyStreamJob(PollJob):
+        voltage = Signal(float)
+        period = 0.5
+
+        def setup(self) -> bool:
+            self.keithley = PowerSupply(**self.config.dict())
+            return True
+
+        def poll(self) -> bool:
+            self.voltage.emit(self.keithley.get_voltage())
+            return self.config.thread_stream
+
+    job = KeithleyStreamJob(key=config.adapter_key)
+    job.finished.connect(...)
+    job.start()
+
+Job has the same `start`, `quit`, `exit`, `terminate`, `finished` interface as `Thread`,
+`setup`, `poll` and `pre_exit` are called in worker threads.
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, Hashable, List, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+from utils.classes import TransactionStats
+from utils.exceptions import DeviceConnectionError
+
+
+logger = logging.getLogger(__name__)
+
+
+class PollJob(QObject):
+    finished = Signal()
+
+    period = 1.0  # s
+    priority = 10  # lower value is polled first when several jobs are due
+
+    def __init__(
+        self,
+        period: float = None,
+        priority: int = None,
+        key: Optional[Hashable] = None,
+        scheduler: "PollingScheduler" = None,
+    ):
+        super().__init__()
+        if period is not None:
+            self.period = period
+        if priority is not None:
+            self.priority = priority
+        self.key = key
+        self.scheduler = scheduler
+        self.active = False
+        self.running = False
+        self.initialized = False
+        self.stats = TransactionStats()
+        self.lateness_stats = TransactionStats()
+        self.skipped = 0
+        self.started = None
+        self.stopped = None
+
+    @property
+    def name(self) -> str:
+        return self.__class__.__name__
+
+    @property
+    def requested_rate(self) -> float:
+        return 1 / self.period if self.period else 0.0
+
+    @property
+    def achieved_rate(self) -> float:
+        if self.started is None:
+            return 0.0
+        elapsed = (self.stopped or time.perf_counter()) - self.started
+        if elapsed <= 0:
+            return 0.0
+        return self.stats.count / elapsed
+
+    def setup(self) -> bool:
+        """Connect devices before the first poll, False stops the job"""
+        return True
+
+    def poll(self) -> bool:
+        """One polling cycle, False stops the job"""
+        return False
+
+    def pre_exit(self, *args, **kwargs):
+        ...
+
+    def start(self) -> None:
+        (self.scheduler or polling_scheduler).add(self)
+
+    def stop(self) -> None:
+        (self.scheduler or polling_scheduler).remove(self)
+
+    def isRunning(self) -> bool:
+        return self.active
+
+    def quit(self) -> None:
+        self.stop()
+        logger.info(f"[{self.name}.quit] Quited")
+
+    def exit(self, returnCode: int = ...):
+        self.stop()
+        logger.info(f"[{self.name}.exit] Exited")
+
+    def terminate(self) -> None:
+        self.stop()
+        logger.info(f"[{self.name}.terminate] Terminated")
+
+    def dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "key": str(self.key),
+            "priority": self.priority,
+            "requested_rate": self.requested_rate,
+            "achieved_rate": self.achieved_rate,
+            "skipped": self.skipped,
+            "poll": self.stats.dict(),
+            "lateness": self.lateness_stats.dict(),
+        }
+
+    def __str__(self):
+        return (
+            f"{self.name}: {self.achieved_rate:.2f} of {self.requested_rate:.2f} Hz; "
+            f"polls {self.stats.count}; skipped {self.skipped}; "
+            f"mean poll {self.stats.mean_time * 1e3:.1f} ms; "
+            f"mean lateness {self.lateness_stats.mean_time * 1e3:.1f} ms"
+        )
+
+
+class PollingScheduler:
+    """
+    Runs registered `PollJob`s by due time over `workers` threads.
+    Worker threads are started on demand and live while there are jobs.
+    """
+
+    def __init__(self, workers: int = 3):
+        self.workers = workers
+        self._condition = threading.Condition()
+        self._queue: List = []  # heap of [due, priority, seq, job]
+        self._entries: Dict[PollJob, List] = {}
+        self._counter = itertools.count()
+        self._busy_keys = set()
+        self._workers_alive = 0
+        self.jobs: List[PollJob] = []
+
+    def add(self, job: PollJob) -> None:
+        with self._condition:
+            if job in self.jobs:
+                return
+            job.active = True
+            job.initialized = False
+            job.started = time.perf_counter()
+            job.stopped = None
+            self.jobs.append(job)
+            self._push(job, job.started)
+            self._start_workers()
+            self._condition.notify_all()
+
+    def remove(self, job: PollJob) -> None:
+        """Stop job, `pre_exit` and `finished` follow after the running poll"""
+        with self._condition:
+            if not job.active:
+                return
+            job.active = False
+            if not job.running:
+                # finish it by the first free worker
+                self._push(job, 0)
+            self._condition.notify_all()
+
+    def stop_all(self) -> None:
+        for job in list(self.jobs):
+            self.remove(job)
+
+    def _push(self, job: PollJob, due: float) -> None:
+        entry = [due, job.priority, next(self._counter), job]
+        old = self._entries.get(job)
+        if old is not None:
+            old[-1] = None
+        self._entries[job] = entry
+        heapq.heappush(self._queue, entry)
+
+    def _start_workers(self) -> None:
+        while self._workers_alive < min(self.workers, len(self.jobs)):
+            thread = threading.Thread(
+                target=self._work, name=f"PollingWorker-{self._workers_alive}"
+            )
+            thread.daemon = True
+            self._workers_alive += 1
+            thread.start()
+
+    def _take(self) -> Optional[List]:
+        """Due entry of the highest priority with free adapter, waits if nothing is due"""
+        while True:
+            if not self.jobs:
+                return None
+            now = time.perf_counter()
+            ready, wait = [], None
+            while self._queue:
+                entry = self._queue[0]
+                if entry[-1] is None:
+                    heapq.heappop(self._queue)
+                    continue
+                if entry[0] > now:
+                    wait = entry[0] - now
+                    break
+                ready.append(heapq.heappop(self._queue))
+            chosen = None
+            for entry in sorted(ready, key=lambda e: (e[1], e[0], e[2])):
+                job = entry[-1]
+                if chosen is None and (
+                    job.key is None or job.key not in self._busy_keys
+                ):
+                    chosen = entry
+                else:
+                    heapq.heappush(self._queue, entry)
+            if chosen is not None:
+                return chosen
+            self._condition.wait(wait)
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                entry = self._take()
+                if entry is None:
+                    self._workers_alive -= 1
+                    return
+                due, job = entry[0], entry[-1]
+                self._entries.pop(job, None)
+                job.running = True
+                if job.key is not None:
+                    self._busy_keys.add(job.key)
+            keep = False
+            try:
+                keep = self._run(job, due)
+            except BaseException:
+                # worker dies, the job is finished below and other jobs get a new worker
+                with self._condition:
+                    self._workers_alive -= 1
+                    self._start_workers()
+                raise
+            finally:
+                # adapter key is released and job is finished whatever poll raised
+                with self._condition:
+                    job.running = False
+                    if job.key is not None:
+                        self._busy_keys.discard(job.key)
+                    finish = not (keep and job.active)
+                    if finish:
+                        self._remove_job(job)
+                    else:
+                        self._reschedule(job, due)
+                    self._condition.notify_all()
+                if finish:
+                    self._finish(job)
+
+    def _run(self, job: PollJob, due: float) -> bool:
+        try:
+            if not job.active:
+                return False
+            if not job.initialized:
+                job.initialized = True
+                if not job.setup():
+                    return False
+                return True
+            start = time.perf_counter()
+            if due:
+                job.lateness_stats.add(max(start - due, 0))
+            keep = job.poll()
+            job.stats.add(time.perf_counter() - start)
+            return bool(keep)
+        except (Exception, DeviceConnectionError) as e:
+            job.stats.add_error()
+            logger.error(f"[{self.__class__.__name__}._run] {job.name}: {e}")
+            return False
+
+    def _reschedule(self, job: PollJob, due: float) -> None:
+        now = time.perf_counter()
+        if not job.stats.count:
+            # job is set up, the first poll is right away
+            self._push(job, now)
+            return
+        due += job.period
+        if due < now:
+            # merge overdue polls to one
+            if job.period:
+                job.skipped += int((now - due) / job.period)
+            due = now
+        self._push(job, due)
+
+    def _remove_job(self, job: PollJob) -> None:
+        job.active = False
+        job.stopped = time.perf_counter()
+        if job in self.jobs:
+            self.jobs.remove(job)
+        entry = self._entries.pop(job, None)
+        if entry is not None:
+            entry[-1] = None
+
+    def _finish(self, job: PollJob) -> None:
+        """Called out of the lock, `pre_exit` may close connections"""
+        try:
+            job.pre_exit()
+        except (Exception, DeviceConnectionError) as e:
+            logger.error(f"[{self.__class__.__name__}._finish] {job.name}: {e}")
+        logger.info(f"[{self.__class__.__name__}._finish] {job}")
+        job.finished.emit()
+
+    def dict(self) -> Dict:
+        with self._condition:
+            return {
+                "workers": self._workers_alive,
+                "jobs": [job.dict() for job in self.jobs],
+            }
+
+    def __str__(self):
+        return "\n".join(
+            [f"Polling scheduler: {len(self.jobs)} jobs"]
+            + [f"    {job}" for job in self.jobs]
+        )
+
+
+polling_scheduler = PollingScheduler()
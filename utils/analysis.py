@@ -0,0 +1,227 @@
+"""
+Vectorized Y-factor and noise temperature analysis.
+Hot and cold curves are matched by nearest bias voltage with sorted indexes and
+`np.searchsorted` (or interpolated), dB <-> W conversion and fits are done on whole arrays.
+All functions work along the last axis, leading axes are batches of curves
+of the same length, so whole grid scans (angle x voltage) or voltage x IF frequency
+matrices are processed in one call:
+    result = get_tn_curve(hot_power, cold_power, hot_voltage, cold_voltage)
+    tn = get_noise_temperature(hot_matrix, cold_matrix, th=300, tc=77)
+"""
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+class TnCurve(NamedTuple):
+    voltage: np.ndarray
+    y_factor: np.ndarray  # dB
+    tn: np.ndarray  # K
+    cold_index: np.ndarray  # index of matched cold point, -1 if interpolated
+
+
+class LinearFit(NamedTuple):
+    slope: np.ndarray
+    intercept: np.ndarray
+    slope_error: np.ndarray
+    intercept_error: np.ndarray
+    r: np.ndarray
+    residual_std: np.ndarray
+
+
+def db_to_watt(power: np.ndarray) -> np.ndarray:
+    """dBm to W"""
+    return 1e-3 * np.power(10.0, np.asarray(power, dtype=float) / 10)
+
+
+def watt_to_db(power: np.ndarray) -> np.ndarray:
+    """W to dBm"""
+    return 10 * np.log10(np.asarray(power, dtype=float) / 1e-3)
+
+
+def get_noise_temperature(
+    hot_power: np.ndarray, cold_power: np.ndarray, th: float = 300, tc: float = 77
+) -> np.ndarray:
+    """Noise temperature by Y-factor of hot and cold powers in dBm, arrays of any shape"""
+    y = np.power(
+        10.0,
+        (np.asarray(hot_power, dtype=float) - np.asarray(cold_power, dtype=float)) / 10,
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (th - tc * y) / (y - 1)
+
+
+def _row_offsets(values: np.ndarray) -> np.ndarray:
+    """
+    Offsets which make rows of 2-D array non overlapping,
+    so rows are searched in one flat sorted array
+    """
+    span = np.nanmax(values) - np.nanmin(values) + 1.0
+    return (np.arange(values.shape[0]) * span)[:, None]
+
+
+def nearest_indexes(reference: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Indexes of the nearest `reference` points for every point of `values` along the last axis.
+    Reference points may be in any order, ties are resolved to the lower reference value.
+    """
+    reference = np.asarray(reference, dtype=float)
+    values = np.asarray(values, dtype=float)
+    batch = reference.shape[:-1]
+    reference = reference.reshape(-1, reference.shape[-1])
+    values = values.reshape(-1, values.shape[-1])
+    rows, size = reference.shape
+    if size == 1:
+        return np.zeros(batch + values.shape[-1:], dtype=int)
+
+    offsets = _row_offsets(np.concatenate([reference, values], axis=1))
+    order = np.argsort(reference, axis=-1, kind="stable")
+    sorted_reference = np.take_along_axis(reference, order, axis=-1) + offsets
+    shifted = values + offsets
+    position = np.searchsorted(sorted_reference.ravel(), shifted.ravel()).reshape(
+        shifted.shape
+    )
+    # position within the row, neighbours are compared inside the row only
+    position = np.clip(position - np.arange(rows)[:, None] * size, 1, size - 1)
+    left = np.take_along_axis(sorted_reference, position - 1, axis=-1)
+    right = np.take_along_axis(sorted_reference, position, axis=-1)
+    position -= (shifted - left) <= (right - shifted)
+    return np.take_along_axis(order, position, axis=-1).reshape(
+        batch + values.shape[-1:]
+    )
+
+
+def nearest_indexes_window(
+    reference: np.ndarray, values: np.ndarray, window: int
+) -> np.ndarray:
+    """
+    Like `nearest_indexes`, but point `i` is matched only with reference points
+    `i - window // 2 ... i + window // 2` (scan order), so curves with not unique voltage
+    (hysteresis, back bending) are matched locally.
+    Edges are kept as in the previous loop of `get_voltage_tn`: the first `window // 2`
+    points search from themselves forward, the last points may also match
+    reference point `len(values)` if reference is longer.
+    """
+    reference = np.asarray(reference, dtype=float)
+    values = np.asarray(values, dtype=float)
+    size = values.shape[-1]
+    left_offset = window // 2
+    right_offset = max(left_offset + window % 2, 1)
+    offsets = np.arange(-left_offset, right_offset)
+    index = np.arange(size)[:, None]
+    candidates = index + offsets
+    start = np.where(index >= left_offset, index - left_offset, index)
+    end = np.minimum(index + right_offset, min(size + 1, reference.shape[-1]))
+    valid = (candidates >= start) & (candidates < end)
+    candidates = np.clip(candidates, 0, reference.shape[-1] - 1)
+    diff = np.abs(reference[..., candidates] - values[..., None])
+    diff = np.where(valid, diff, np.inf)
+    best = np.argmin(diff, axis=-1)
+    return np.take_along_axis(
+        np.broadcast_to(candidates, diff.shape), best[..., None], axis=-1
+    )[..., 0]
+
+
+def interpolate_curve(
+    voltage: np.ndarray, power: np.ndarray, values: np.ndarray
+) -> np.ndarray:
+    """Power curve linearly interpolated at `values` voltages along the last axis"""
+    voltage = np.asarray(voltage, dtype=float)
+    power = np.asarray(power, dtype=float)
+    values = np.asarray(values, dtype=float)
+    batch = values.shape[:-1]
+    voltage = voltage.reshape(-1, voltage.shape[-1])
+    power = power.reshape(-1, power.shape[-1])
+    values = values.reshape(-1, values.shape[-1])
+
+    order = np.argsort(voltage, axis=-1, kind="stable")
+    voltage = np.take_along_axis(voltage, order, axis=-1)
+    power = np.take_along_axis(power, order, axis=-1)
+    # values out of the row range are clamped to the row ends as np.interp does
+    values = np.clip(values, voltage[:, :1], voltage[:, -1:])
+    offsets = _row_offsets(np.concatenate([voltage, values], axis=1))
+    result = np.interp(
+        (values + offsets).ravel(), (voltage + offsets).ravel(), power.ravel()
+    )
+    return result.reshape(batch + values.shape[-1:])
+
+
+def get_tn_curve(
+    hot_power: np.ndarray,
+    cold_power: np.ndarray,
+    hot_voltage: np.ndarray,
+    cold_voltage: np.ndarray,
+    th: float = 300,
+    tc: float = 77,
+    window: Optional[int] = None,
+    interpolate: bool = False,
+) -> TnCurve:
+    """
+    Y-factor and noise temperature at hot curve voltages.
+    Cold power is taken at the nearest cold voltage (within index `window` if given)
+    or linearly interpolated if `interpolate`.
+    Hot and cold curves are cut to the shortest length, with `window` the last hot points
+    may still match the next cold point (see `nearest_indexes_window`).
+    """
+    hot_power = np.asarray(hot_power, dtype=float)
+    cold_power = np.asarray(cold_power, dtype=float)
+    hot_voltage = np.asarray(hot_voltage, dtype=float)
+    cold_voltage = np.asarray(cold_voltage, dtype=float)
+    size = min(hot_voltage.shape[-1], cold_voltage.shape[-1])
+    hot_power, hot_voltage = hot_power[..., :size], hot_voltage[..., :size]
+
+    if window and not interpolate:
+        cold_index = nearest_indexes_window(cold_voltage, hot_voltage, window)
+        cold_matched = np.take_along_axis(cold_power, cold_index, axis=-1)
+    else:
+        cold_power, cold_voltage = cold_power[..., :size], cold_voltage[..., :size]
+        if interpolate:
+            cold_index = np.full(hot_voltage.shape, -1)
+            cold_matched = interpolate_curve(cold_voltage, cold_power, hot_voltage)
+        else:
+            cold_index = nearest_indexes(cold_voltage, hot_voltage)
+            cold_matched = np.take_along_axis(cold_power, cold_index, axis=-1)
+
+    return TnCurve(
+        voltage=hot_voltage,
+        y_factor=hot_power - cold_matched,
+        tn=get_noise_temperature(hot_power, cold_matched, th=th, tc=tc),
+        cold_index=cold_index,
+    )
+
+
+def fit_linear(x: np.ndarray, y: np.ndarray) -> LinearFit:
+    """
+    Least squares line y = slope * x + intercept along the last axis
+    with standard errors of coefficients, Pearson r and residual std.
+    Leading axes are independent fits.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    x, y = np.broadcast_arrays(x, y)
+    n = x.shape[-1]
+    mean_x = x.mean(axis=-1, keepdims=True)
+    mean_y = y.mean(axis=-1, keepdims=True)
+    dx = x - mean_x
+    dy = y - mean_y
+    sxx = np.sum(dx * dx, axis=-1)
+    syy = np.sum(dy * dy, axis=-1)
+    sxy = np.sum(dx * dy, axis=-1)
+    mean_x = mean_x[..., 0]
+    mean_y = mean_y[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = sxy / sxx
+        intercept = mean_y - slope * mean_x
+        residuals = syy - slope * sxy
+        variance = np.maximum(residuals, 0) / (n - 2) if n > 2 else np.nan * residuals
+        slope_error = np.sqrt(variance / sxx)
+        intercept_error = np.sqrt(variance * (1 / n + mean_x**2 / sxx))
+        r = sxy / np.sqrt(sxx * syy)
+    return LinearFit(
+        slope=slope,
+        intercept=intercept,
+        slope_error=slope_error,
+        intercept_error=intercept_error,
+        r=r,
+        residual_std=np.sqrt(variance),
+    )
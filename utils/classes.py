@@ -1,5 +1,10 @@
 import logging
-from typing import Union
+import socket
+import threading
+import time
+from typing import Any, Callable, Union, Dict, List, NamedTuple, Optional, Type
+
+import numpy as np
 
 from settings import ADAPTERS
 from utils.functions import import_class
@@ -7,6 +12,9 @@ from utils.functions import import_class
 
 logger = logging.getLogger(__name__)
 
+# IEEE 488.2 Standard Event Status Register, Operation Complete bit
+ESR_OPC = 1
+
 
 class Singleton(type):
     _instances = {}
@@ -41,7 +49,386 @@ class PrologixUsbMeta(type):
         return cls._instances[port]
 
 
+class TransactionStats:
+    """Thread safe latency and error counters of instrument transactions"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.count = 0
+            self.errors = 0
+            self.timeouts = 0
+            self.total_time = 0.0
+            self.min_time = None
+            self.max_time = 0.0
+            self.last_time = 0.0
+
+    def add(self, latency: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_time += latency
+            self.last_time = latency
+            self.max_time = max(self.max_time, latency)
+            if self.min_time is None or latency < self.min_time:
+                self.min_time = latency
+
+    def add_error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def add_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    @property
+    def mean_time(self) -> float:
+        if not self.count:
+            return 0.0
+        return self.total_time / self.count
+
+    def dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "mean_time": self.mean_time,
+            "min_time": self.min_time or 0.0,
+            "max_time": self.max_time,
+            "last_time": self.last_time,
+        }
+
+    def __str__(self):
+        return (
+            f"count {self.count}; errors {self.errors}; timeouts {self.timeouts}; "
+            f"mean {self.mean_time * 1e3:.2f} ms; max {self.max_time * 1e3:.2f} ms"
+        )
+
+
+class ScanTimer:
+    """
+    Per phase timings of scan threads.
+    Each `lap(phase)` adds time passed since previous lap to the phase:
+        timer.start()
+        block.set_bias_voltage(v)
+        timer.lap("set")
+        time.sleep(delay)
+        timer.lap("settle")
+        ...
+        timer.point()
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, TransactionStats] = {}
+        self.points = 0
+        self.started = None
+        self.finished = None
+        self.last_lap = None
+
+    def start(self) -> None:
+        self.phases = {}
+        self.points = 0
+        self.started = time.perf_counter()
+        self.finished = None
+        self.last_lap = self.started
+
+    def lap(self, phase: str) -> float:
+        """Add time passed since previous lap to the phase and return it"""
+        now = time.perf_counter()
+        if self.last_lap is None:
+            self.last_lap = now
+            return 0.0
+        if phase not in self.phases:
+            self.phases[phase] = TransactionStats()
+        duration = now - self.last_lap
+        self.phases[phase].add(duration)
+        self.last_lap = now
+        return duration
+
+    def point(self) -> None:
+        self.points += 1
+
+    def stop(self) -> None:
+        self.finished = time.perf_counter()
+
+    @property
+    def duration(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def points_per_second(self) -> float:
+        if not self.duration:
+            return 0.0
+        return self.points / self.duration
+
+    def dict(self) -> Dict:
+        return {
+            "points": self.points,
+            "duration": self.duration,
+            "points_per_second": self.points_per_second,
+            "phases": {
+                phase: {
+                    "count": stats.count,
+                    "total_time": stats.total_time,
+                    "mean_time": stats.mean_time,
+                    "max_time": stats.max_time,
+                }
+                for phase, stats in self.phases.items()
+            },
+        }
+
+    def __str__(self):
+        phases = "; ".join(
+            f"{phase} {stats.total_time:.2f} s" for phase, stats in self.phases.items()
+        )
+        return f"points {self.points}; duration {self.duration:.2f} s; {phases}"
+
+
+class SettleResult(NamedTuple):
+    """Outcome of `Settler.wait`, `value` is the last reading"""
+
+    settled: bool
+    time: float
+    reads: int
+    value: Any
+
+
+class Settler:
+    """
+    Waits for instrument readback after a set command instead of a fixed delay.
+    Readback is polled until it is within `tolerance` of the target,
+    or until `stable_reads` consecutive reads differ less than `tolerance`
+    (readback with constant offset), but no longer than `timeout` seconds.
+    Settle times and timeouts are accumulated in `stats`.
+    """
+
+    def __init__(
+        self,
+        tolerance: float,
+        stable_reads: int = 3,
+        timeout: float = 1.0,
+        poll_interval: float = 0.0,
+    ):
+        self.tolerance = tolerance
+        self.stable_reads = max(stable_reads, 2)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.stats = TransactionStats()
+
+    def wait(
+        self,
+        read: Callable[[], Any],
+        target: float,
+        key: Optional[Callable[[Any], float]] = None,
+    ) -> SettleResult:
+        """
+        Poll `read` until readback is settled near the `target`.
+        `key` extracts the compared number from a reading:
+            settler.wait(block.get_bias_point, 2e-3, key=lambda bias: bias.voltage)
+        """
+        start = time.perf_counter()
+        previous = None
+        stable = 1
+        reads = 0
+        while True:
+            value = read()
+            reads += 1
+            duration = time.perf_counter() - start
+            readback = value if value is None or key is None else key(value)
+            if readback is not None:
+                if abs(readback - target) <= self.tolerance:
+                    self.stats.add(duration)
+                    return SettleResult(True, duration, reads, value)
+                if previous is not None and abs(readback - previous) <= self.tolerance:
+                    stable += 1
+                else:
+                    stable = 1
+                if stable >= self.stable_reads:
+                    self.stats.add(duration)
+                    return SettleResult(True, duration, reads, value)
+                previous = readback
+            if duration >= self.timeout:
+                self.stats.add(duration)
+                self.stats.add_timeout()
+                logger.debug(
+                    f"[{self.__class__.__name__}.wait] Timeout, target {target}; readback {readback}"
+                )
+                return SettleResult(False, duration, reads, value)
+            if self.poll_interval:
+                time.sleep(self.poll_interval)
+
+
+class AdaptiveSweep:
+    """
+    Non-uniform sweep from `start` to `stop`.
+    First pass is uniform with `coarse_points`, every next pass puts midpoints
+    into intervals where the measured curve bends (gap edge, photon steps),
+    until the curvature loss of all intervals is below `tolerance`,
+    intervals are narrower than `2 * min_step` or `max_points` are swept:
+        sweep = AdaptiveSweep(0, 7e-3, coarse_points=50, max_points=300)
+        for voltage in sweep:
+            block.set_bias_voltage(voltage)
+            sweep.add(voltage, block.get_bias_current())
+    Several responses may be added per point (current, power),
+    the loss is the largest of them.
+    """
+
+    def __init__(
+        self,
+        start: float,
+        stop: float,
+        coarse_points: int = 50,
+        max_points: int = 300,
+        min_step: float = 0.0,
+        tolerance: float = 1e-4,
+    ):
+        self.start = start
+        self.stop = stop
+        self.max_points = max_points
+        self.coarse_points = max(min(coarse_points, max_points), 2)
+        self.min_step = min_step
+        self.tolerance = tolerance
+        self.grid: List[float] = []
+        self.values: Dict[float, tuple] = {}
+        self.passes = 0
+
+    def __iter__(self):
+        pending = list(np.linspace(self.start, self.stop, self.coarse_points))
+        while pending:
+            self.passes += 1
+            for value in pending:
+                if len(self.grid) >= self.max_points:
+                    return
+                self.grid.append(value)
+                yield value
+            pending = self.refine()
+
+    def add(self, value: float, *responses: float) -> None:
+        """Add measured responses at sweep point, points with missing responses are ignored"""
+        if not responses or any(r is None for r in responses):
+            return
+        self.values[value] = responses
+
+    def losses(self):
+        """Sorted measured points and curvature loss of intervals between them"""
+        points = np.array(sorted(self.values))
+        if len(points) < 3:
+            return points, np.zeros(max(len(points) - 1, 0))
+        responses = np.array([self.values[p] for p in points], dtype=float)
+        x = (points - points[0]) / (abs(self.stop - self.start) or 1)
+        span = np.ptp(responses, axis=0)
+        span[span == 0] = 1
+        y = (responses - responses.min(axis=0)) / span
+        dx = np.diff(x)[:, None]
+        dy = np.diff(y, axis=0)
+        # Area of triangles built by neighbour points, zero on straight segments
+        area = 0.5 * np.abs(dx[:-1] * dy[1:] - dx[1:] * dy[:-1]).max(axis=1)
+        loss = np.zeros(len(points) - 1)
+        loss[:-1] = area
+        loss[1:] = np.maximum(loss[1:], area)
+        return points, loss
+
+    def refine(self) -> List[float]:
+        budget = self.max_points - len(self.grid)
+        if budget <= 0:
+            return []
+        points, loss = self.losses()
+        if not len(loss):
+            return []
+        width = np.diff(points)
+        candidates = np.flatnonzero(
+            (loss > self.tolerance) & (width >= 2 * self.min_step)
+        )
+        candidates = candidates[np.argsort(loss[candidates])[::-1]][:budget]
+        midpoints = (points[candidates] + points[candidates + 1]) / 2
+        return sorted(midpoints.tolist(), reverse=self.stop < self.start)
+
+    def dict(self) -> Dict:
+        return {
+            "mode": "adaptive",
+            "start": self.start,
+            "stop": self.stop,
+            "coarse_points": self.coarse_points,
+            "max_points": self.max_points,
+            "points": len(self.grid),
+            "passes": self.passes,
+            "min_step": self.min_step,
+            "tolerance": self.tolerance,
+        }
+
+
+class StatusQuery:
+    """
+    Status snapshot of instrument read by one compound query.
+    Queries `cmds` are joined with `;` into one program message, answers
+    (`;` separated, values of every answer `,` separated) are parsed in order
+    into fields of `record` by their annotations:
+        class Status(NamedTuple):
+            voltage: float
+            current: float
+            output: bool
+
+        status_query = StatusQuery(Status, ["MEAS:VOLT?", "MEAS:CURR?", "OUTP?"])
+        status = instrument.query_status(status_query)
+    Values which can't be converted are None.
+    """
+
+    def __init__(self, record: Type[NamedTuple], cmds: List[str]):
+        self.record = record
+        self.cmds = cmds
+
+    @property
+    def cmd(self) -> str:
+        return ";".join(self.cmds)
+
+    @staticmethod
+    def convert(value: str, annotation) -> Any:
+        value = value.strip().strip("\"'")
+        try:
+            if annotation is bool:
+                return value.upper() in ("1", "ON")
+            return annotation(value)
+        except (TypeError, ValueError):
+            return None
+
+    def parse(self, answers: List[str]) -> Optional[NamedTuple]:
+        """Record from answers of `cmds`, None if number of values doesn't match"""
+        if len(answers) != len(self.cmds):
+            return None
+        values = [value for answer in answers for value in answer.strip().split(",")]
+        if len(values) != len(self.record._fields):
+            return None
+        return self.record(
+            *(
+                self.convert(value, self.record.__annotations__.get(field, str))
+                for field, value in zip(self.record._fields, values)
+            )
+        )
+
+
+def get_status_changes(
+    previous: Optional[NamedTuple], status: NamedTuple
+) -> Dict[str, Any]:
+    """Fields of `status` which differ from `previous` status, all fields if there is no previous"""
+    if previous is None:
+        return status._asdict()
+    return {
+        field: value
+        for field, value, previous_value in zip(status._fields, status, previous)
+        if value != previous_value
+    }
+
+
 class BaseInstrument:
+    # instrument answers `;` joined queries with `;` joined answers
+    compound_query_supported = True
+    # consecutive mismatched compound answers to stop using compound queries
+    compound_query_failures_max = 3
+
     def __init__(
         self,
         host: str,
@@ -55,6 +442,7 @@ class BaseInstrument:
         self.gpib = gpib
         self.adapter_name = adapter
         self.adapter: Union["InstrumentAdapterInterface", None] = adapter_instance
+        self.compound_query_failures = 0
 
         if self.adapter is None:
             self._set_adapter(adapter, *args, **kwargs)
@@ -72,11 +460,137 @@ class BaseInstrument:
             return self.adapter.query(cmd, eq_addr=self.gpib, **kwargs)
         return self.adapter.query(cmd, **kwargs)
 
+    def query_many(self, cmds: List[str], **kwargs) -> List[str]:
+        if self.gpib:
+            return self.adapter.query_many(cmds, eq_addr=self.gpib, **kwargs)
+        return self.adapter.query_many(cmds, **kwargs)
+
+    def query_statuses(self, queries: List[StatusQuery]) -> List[Optional[NamedTuple]]:
+        """
+        Status records of `queries` read by one `;` joined query.
+        Mismatched answer (e.g. empty after timeout) is queried command by command,
+        after `compound_query_failures_max` mismatches in a row
+        compound queries are not used anymore.
+        """
+        cmds = [cmd for query in queries for cmd in query.cmds]
+        if self.compound_query_supported:
+            answers = self.query(";".join(cmds)).strip().split(";")
+            if len(answers) == len(cmds):
+                self.compound_query_failures = 0
+                return self._parse_statuses(queries, answers)
+            self.compound_query_failures += 1
+            if self.compound_query_failures >= self.compound_query_failures_max:
+                logger.warning(
+                    f"[{self.__class__.__name__}.query_statuses] Compound query is not supported, using separate queries"
+                )
+                self.compound_query_supported = False
+        return self._parse_statuses(queries, self.query_many(cmds))
+
+    def query_status(self, query: StatusQuery) -> Optional[NamedTuple]:
+        return self.query_statuses([query])[0]
+
+    @staticmethod
+    def _parse_statuses(
+        queries: List[StatusQuery], answers: List[str]
+    ) -> List[Optional[NamedTuple]]:
+        statuses = []
+        for query in queries:
+            statuses.append(query.parse(answers[: len(query.cmds)]))
+            answers = answers[len(query.cmds) :]
+        return statuses
+
+    def read(self, **kwargs) -> str:
+        if self.gpib:
+            return self.adapter.read(eq_addr=self.gpib, **kwargs)
+        return self.adapter.read(**kwargs)
+
+    def query_block(self, cmd: str, **kwargs) -> bytes:
+        if self.gpib:
+            return self.adapter.query_block(cmd, eq_addr=self.gpib, **kwargs)
+        return self.adapter.query_block(cmd, **kwargs)
+
     def write(self, cmd: str) -> None:
         if self.gpib:
             return self.adapter.write(cmd, eq_addr=self.gpib)
         return self.adapter.write(cmd)
 
+    def get_status_byte(self) -> int:
+        return int(self.query("*STB?"))
+
+    def get_event_status(self) -> int:
+        """Standard Event Status Register, cleared by reading"""
+        return int(self.query("*ESR?"))
+
+    def clear_status(self) -> None:
+        self.write("*CLS")
+
+    def write_wait(self, cmd: str) -> None:
+        """Following commands are executed after `cmd` is finished (`cmd;*WAI`)"""
+        self.write(f"{cmd};*WAI")
+
+    def wait_complete(self, cmd: str = None, timeout: float = 10) -> bool:
+        """
+        Send `cmd;*OPC?` and block until answer, it is sent by instrument
+        when all pending operations (sweep, averaging, settling) are finished.
+        Adapter read timeouts are retried up to `timeout` seconds:
+            vna.wait_complete("INIT:IMM", timeout=30)
+        """
+        self.write(f"{cmd};*OPC?" if cmd else "*OPC?")
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            try:
+                answer = self.read()
+            except (socket.timeout, TimeoutError):
+                continue
+            if answer and answer.strip().endswith("1"):
+                return True
+        logger.warning(
+            f"[{self.__class__.__name__}.wait_complete] Operation is not completed within {timeout} s"
+        )
+        # late "1" must not be read as answer of the next query
+        self.clear_status()
+        self.drain()
+        return False
+
+    def drain(self, timeout: float = 1) -> None:
+        """Read and drop pending answers until nothing is received"""
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            try:
+                if not self.read():
+                    return
+            except (socket.timeout, TimeoutError, OSError):
+                return
+
+    def poll_complete(
+        self, cmd: str = None, timeout: float = 10, interval: float = 0.02
+    ) -> bool:
+        """
+        Send `cmd;*OPC` and poll Operation Complete bit of event status register.
+        Unlike `wait_complete` the connection is not blocked by the pending answer,
+        so GPIB bus stays available for other instruments.
+        """
+        self.clear_status()
+        self.write(f"{cmd};*OPC" if cmd else "*OPC")
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if self.get_event_status() & ESR_OPC:
+                return True
+            time.sleep(interval)
+        logger.warning(
+            f"[{self.__class__.__name__}.poll_complete] Operation is not completed within {timeout} s"
+        )
+        return False
+
+    def sync(self, cmd: str = None, timeout: float = 10) -> bool:
+        """
+        Execute `cmd` and wait until it is finished:
+        status register is polled for GPIB instruments, *OPC? is awaited otherwise
+        """
+        if self.gpib:
+            return self.poll_complete(cmd, timeout=timeout)
+        return self.wait_complete(cmd, timeout=timeout)
+
 
 class BaseInstrumentInterface:
     """Base Instrument Api interface"""
@@ -108,6 +622,12 @@ class InstrumentAdapterInterface:
     def query(self, *args, **kwargs):
         raise NotImplementedError
 
+    def query_many(self, cmds: List[str], **kwargs) -> List[str]:
+        return [self.query(cmd, **kwargs) for cmd in cmds]
+
+    def query_block(self, *args, **kwargs) -> bytes:
+        raise NotImplementedError
+
     def write(self, *args, **kwargs):
         raise NotImplementedError
 
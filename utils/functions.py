@@ -1,5 +1,5 @@
 import logging
-from typing import List, Tuple, Union
+from typing import Dict, List, Tuple, Union
 
 import numpy as np
 import requests
@@ -8,6 +8,7 @@ from requests import RequestException, HTTPError
 
 import settings
 from utils import constants
+from utils.analysis import fit_linear, get_tn_curve
 
 logger = logging.getLogger(__name__)
 
@@ -17,41 +18,31 @@ def linear(x: float, a: float, b: float):
 
 
 def linear_fit(x, y):
-    def mean(xs):
-        return sum(xs) / len(xs)
-
-    m_x = mean(x)
-    m_y = mean(y)
-
-    def std(xs, m):
-        normalizer = len(xs) - 1
-        return np.sqrt(sum((pow(x1 - m, 2) for x1 in xs)) / normalizer)
-
-    def pearson_r(xs, ys):
-        sum_xy = 0
-        sum_sq_v_x = 0
-        sum_sq_v_y = 0
-
-        for x1, y2 in zip(xs, ys):
-            var_x = x1 - m_x
-            var_y = y2 - m_y
-            sum_xy += var_x * var_y
-            sum_sq_v_x += pow(var_x, 2)
-            sum_sq_v_y += pow(var_y, 2)
-        return sum_xy / np.sqrt(sum_sq_v_x * sum_sq_v_y)
-
-    r = pearson_r(x, y)
-
-    b = r * (std(y, m_y) / std(x, m_x))
-    a = m_y - b * m_x
-
-    return b, a
+    """Least squares line, returns slope and intercept (see `utils.analysis.fit_linear`)"""
+    fit = fit_linear(x, y)
+    return float(fit.slope), float(fit.intercept)
 
 
 def to_db(vec: np.ndarray):
     return 20 * np.log10(np.abs(vec))
 
 
+def sort_columns(data: Dict, key: str, reverse: bool = False) -> Dict:
+    """
+    Sort all lists and columns of `data` with the same length as `data[key]`
+    by `data[key]` values, other items are left as is.
+    """
+    order = sorted(range(len(data[key])), key=data[key].__getitem__, reverse=reverse)
+    sorted_data = {}
+    for name, values in data.items():
+        if isinstance(values, list) and len(values) == len(order):
+            values = [values[i] for i in order]
+        elif hasattr(values, "take") and len(values) == len(order):
+            values = values.take(order)
+        sorted_data[name] = values
+    return sorted_data
+
+
 def import_class(path: str):
     module_name = ".".join(path.split(".")[:-1])
     class_name = path.split(".")[-1]
@@ -78,34 +69,21 @@ def get_voltage_tn(
     tc: float = 77,
     window: int = 10,
 ) -> Tuple[List, List, List]:
-    hot = np.array(hot_power)
-    cold = np.array(cold_power)
-    volt_cold = np.array(cold_voltage)
-    volt_hot = np.array(hot_voltage)
-
-    indexes = min(len(volt_cold), len(volt_hot))
-    left_offset = int(window // 2)
-    right_offset = int(left_offset + window % 2)
-
-    y_factor = []
-    t = []
-    volt = []
-    for i in range(indexes):
-        min_ind = i - left_offset if i - left_offset >= 0 else i
-        max_ind = i + right_offset if i + right_offset <= indexes else indexes + 1
-        volt_diff = np.abs(volt_cold[min_ind:max_ind] - volt_hot[i])
-        try:
-            min_volt_cold_ind = np.where(volt_diff == np.min(volt_diff))[0] + min_ind
-        except IndexError:
-            logger.warning(f"Unable to find nearest voltage to {volt_hot[i]}")
-            continue
-        y_db = hot[i] - cold[min_volt_cold_ind]
-        y_w = db_to_absolute(hot[i]) / db_to_absolute(cold[min_volt_cold_ind])
-        y_factor.append(y_db[0])
-        t.append(get_tn(y=y_w, th=th, tc=tc)[0])
-        volt.append(volt_hot[i])
-
-    return volt, y_factor, t
+    """
+    Y-factor and noise temperature at hot voltages,
+    cold point is the nearest by voltage within `window` scan points
+    (see `utils.analysis.get_tn_curve`)
+    """
+    curve = get_tn_curve(
+        hot_power=hot_power,
+        cold_power=cold_power,
+        hot_voltage=hot_voltage,
+        cold_voltage=cold_voltage,
+        th=th,
+        tc=tc,
+        window=window,
+    )
+    return curve.voltage.tolist(), curve.y_factor.tolist(), curve.tn.tolist()
 
 
 def t_if(i, v, rd, t=4):
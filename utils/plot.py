@@ -0,0 +1,42 @@
+"""
+Rendering options of pyqtgraph curves with many points.
+Curves are decimated to ~5 points per screen pixel by min/max (peak) of every chunk,
+so spikes of I-V, P-V and S-parameter curves are kept on zoomed out views.
+Curves with increasing x are clipped to the visible x range,
+symbols are hidden when curve has more than `SYMBOL_POINTS_MAX` points:
+    item = plot_widget.plot(x, y, pen=pen, symbol=get_symbol(x))
+    configure_curve(item, x)
+    ...
+    configure_curve(item, new_x)
+    item.setData(new_x, new_y)
+Decimation and clipping are set after the item is added to the plot,
+pyqtgraph can't clip items without view box.
+"""
+import numpy as np
+import pyqtgraph as pg
+
+
+SYMBOL_POINTS_MAX = 500
+SYMBOL = "o"
+
+
+def is_increasing(x: np.ndarray) -> bool:
+    """Clipping to view searches visible range and needs not decreasing x"""
+    return len(x) < 2 or bool(np.all(np.diff(x) >= 0))
+
+
+def get_symbol(x: np.ndarray, symbol_points_max: int = SYMBOL_POINTS_MAX):
+    """Symbol of curve with `x` points, None for large curves"""
+    return SYMBOL if len(x) <= symbol_points_max else None
+
+
+def configure_curve(
+    item: pg.PlotDataItem, x: np.ndarray, symbol_points_max: int = SYMBOL_POINTS_MAX
+) -> None:
+    """Set decimation, clipping and symbol of curve item for data with `x`"""
+    x = np.asarray(x)
+    item.setDownsampling(auto=True, method="peak")
+    item.setClipToView(is_increasing(x))
+    symbol = get_symbol(x, symbol_points_max)
+    if item.opts["symbol"] != symbol:
+        item.setSymbol(symbol)